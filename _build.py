@@ -3,11 +3,16 @@
     Exports to the build folder.
 """
 
+import importlib.util
 import json
 import os
+import py_compile
 import re
+import subprocess
 import sys
+import tempfile
 import zipapp
+import zipfile
 from datetime import datetime
 from pathlib import Path, WindowsPath
 from typing import Tuple
@@ -19,10 +24,11 @@ from packaging.version import Version
 from pygit2 import Repository
 from pytia.console import Console
 
-from pytia_bill_of_material.const import APP_NAME, APP_VERSION
+from pytia_bill_of_material.const import APP_NAME, APP_VERSION, CONFIG_SNAPSHOT
 
 console = Console()
 settings_path = Path("./pytia_bill_of_material/resources/settings.json").resolve()
+profiles_folder = Path("./profiles").resolve()
 branch_name = Repository(".").head.shorthand
 
 
@@ -121,6 +127,122 @@ class Build:
             f.write(catvbs)
         console.info(f"Saved new launcher as {str(self.build_launcher_path)!r}")
 
+    @staticmethod
+    def source_filter(path: Path) -> bool:
+        # Local bytecode caches are never shipped, the bytecode is compiled by the build.
+        return "__pycache__" not in path.parts and path.suffix != ".pyc"
+
+    def compile_bytecode(self):
+        console.info("Compiling bytecode ...")
+        if sys.version_info[:2] != self.get_required_version():
+            console.warning(
+                f"Skipped compiling bytecode: The build runs on python {sys.version_info.major}.{sys.version_info.minor}, "
+                "the app requires python {}.{}.".format(*self.get_required_version())
+            )
+            return
+
+        # Python can't write bytecode caches for modules inside a zip file. Without bytecode in
+        # the archive every launch compiles all modules again. The bytecode is stored next to the
+        # source (zipimport doesn't use __pycache__ folders) and uses unchecked hashes, because
+        # zip entries don't carry reliable modification times. The optimization level stays at 0,
+        # the launcher doesn't run python with -O.
+        with tempfile.TemporaryDirectory() as tmp, zipfile.ZipFile(self.build_app_path, "a") as archive:
+            for source in sorted(self.source_folder.rglob("*.py")):
+                arcname = source.relative_to(self.source_folder).with_suffix(".pyc").as_posix()
+                cfile = Path(tmp, arcname)
+                py_compile.compile(
+                    file=str(source),
+                    cfile=str(cfile),
+                    dfile=str(Path(self.release_app_path, source.relative_to(self.source_folder))),
+                    doraise=True,
+                    optimize=0,
+                    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+                )
+                archive.write(cfile, arcname)
+
+        self.verify_bytecode()
+
+    def verify_bytecode(self):
+        console.info("Verifying bytecode ...")
+        with zipfile.ZipFile(self.build_app_path, "r") as archive:
+            names = set(archive.namelist())
+            for name in sorted(n for n in names if n.endswith(".py")):
+                pyc_name = name[:-3] + ".pyc"
+                if pyc_name not in names:
+                    console.error(f"Failed building app: Bytecode of {name!r} is missing.")
+                    sys.exit()
+
+                # Header: magic (4 bytes), flags (4 bytes), source hash (8 bytes)
+                header = archive.read(pyc_name)[:16]
+                source_hash = importlib.util.source_hash(archive.read(name))
+                if header[:4] != importlib.util.MAGIC_NUMBER or header[8:16] != source_hash:
+                    console.error(f"Failed building app: Bytecode of {name!r} is outdated.")
+                    sys.exit()
+
+    def profile_imports(self):
+        console.info("Profiling import time ...")
+        profile_path = Path(profiles_folder, f"importtime_{APP_VERSION}.txt")
+        os.makedirs(profiles_folder, exist_ok=True)
+
+        # Imports the modules of the startup path from the archive, without launching the app.
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main, app.main_ui"],
+            env={**os.environ, "PYTHONPATH": str(self.build_app_path)},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            console.warning(f"Skipped import time profile: {result.stderr.strip().splitlines()[-1:]}")
+            return
+
+        with open(profile_path, "w") as f:
+            f.write(result.stderr)
+
+        total = self.get_import_time(profile_path)
+        console.info(f"Import time is {total / 1000:.0f}ms, profile saved as {str(profile_path)!r}")
+
+        previous = sorted(
+            (p for p in profiles_folder.glob("importtime_*.txt") if p != profile_path),
+            key=lambda p: p.stat().st_mtime,
+        )
+        if previous and (last := self.get_import_time(previous[-1])) and total > last * 1.2:
+            console.warning(
+                f"Import time has increased from {last / 1000:.0f}ms ({previous[-1].stem}) to {total / 1000:.0f}ms."
+            )
+
+    @staticmethod
+    def get_import_time(profile_path: Path) -> int:
+        # Sums up the self-time (microseconds) of all imports of an importtime profile.
+        total = 0
+        with open(profile_path, "r") as f:
+            for line in f:
+                if match := re.match(r"^import time:\s+(\d+)\s+\|", line):
+                    total += int(match.group(1))
+        return total
+
+    def bake_resources(self):
+        console.info("Baking resource snapshot ...")
+        # The resources module imports its siblings absolutely, like the app does at runtime.
+        if str(self.source_folder) not in sys.path:
+            sys.path.append(str(self.source_folder))
+        from resources import create_snapshot  # pylint: disable=C0415
+        from resources import resource  # pylint: disable=C0415
+
+        # Importing the resources creates the app's resource instance, which would save the
+        # appdata of the build machine at exit.
+        resource.discard_appdata()
+
+        try:
+            snapshot = create_snapshot()
+        except Exception as e:
+            console.error(f"Failed building app: Resource files are invalid: {e}")
+            sys.exit()
+
+        with zipfile.ZipFile(self.build_app_path, "a") as archive:
+            archive.writestr(f"resources/{CONFIG_SNAPSHOT}", snapshot)
+        console.info(f"Baked {len(snapshot)} bytes of resources into {str(self.build_app_path)!r}")
+
     def build(self):
         console.info(f"Building {APP_NAME} {APP_VERSION}")
         self.provide()
@@ -131,9 +253,12 @@ class Build:
             target=self.build_app_path,
             interpreter=None,
             main=None,
-            filter=None,
+            filter=self.source_filter,
             compressed=False,
         )
+        self.compile_bytecode()
+        self.bake_resources()
+        self.profile_imports()
         console.ok(f"Built app into {str(self.build_folder)!r}")
 
 
@@ -2,8 +2,19 @@
 # -*- coding: utf-8 -*-
 
 """
-    Application entry point.
+    Application entry point. Runs the command line interface if arguments are given
+    (see `python -m pytia_bill_of_material --help`), otherwise the app.
 """
-from main import main
 
-main()
+import sys
+
+# The guard is required: Worker processes of the command line interface import this module.
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cli import cli
+
+        sys.exit(cli())
+    else:
+        from main import main
+
+        main()
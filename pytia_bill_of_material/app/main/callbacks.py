@@ -24,7 +24,6 @@ from pytia.log import log
 from pytia_ui_tools.handlers.workspace_handler import Workspace
 from pytia_ui_tools.helper.values import add_current_value_to_combobox_list
 from resources import resource
-from worker.main_task import MainTask
 
 
 class Callbacks:
@@ -73,6 +72,7 @@ class Callbacks:
         self._bind_checkbox_callbacks()
         self._bind_tree_callbacks()
         self._bind_widget_callbacks()
+        self._bind_menu_callbacks()
         log.info("Callbacks initialized.")
 
     def _bind_widget_callbacks(self) -> None:
@@ -83,6 +83,10 @@ class Callbacks:
                 lambda _: add_current_value_to_combobox_list(self.layout.input_project),
             )
 
+    def _bind_menu_callbacks(self) -> None:
+        """Binds all callbacks to the main windows menu."""
+        self.layout.tools_menu.entryconfig(Layout.MENU_EXPORT_QUEUE, command=self.on_menu_export_queue)
+
     def _bind_button_callbacks(self) -> None:
         """Binds all callbacks to the main windows buttons."""
         self.layout.button_export.configure(command=self.on_btn_export)
@@ -120,6 +124,10 @@ class Callbacks:
         """
         log.info("Callback for button 'Export'.")
         self.set_ui.working()
+        # The worker modules (openpyxl, pycatia wrappers, ...) aren't imported at startup. They're
+        # usually already loaded by the warm-up at this point (see `warm_up_imports`).
+        from worker.main_task import MainTask  # pylint: disable=C0415
+
         main_task = MainTask(
             main_ui=self.root,
             layout=self.layout,
@@ -131,6 +139,34 @@ class Callbacks:
         )
         self.root.after(100, main_task.run)
 
+    def on_menu_export_queue(self) -> None:
+        """
+        Event handler for the export queue menu entry. Asks the user to select the products to \
+            export, and exports them one after another with the current settings.
+        """
+        log.info("Callback for menu 'Export Product Queue'.")
+        filenames = filedialog.askopenfilenames(
+            filetypes=[("CATIA Product", "*.CATProduct")],
+            initialdir=self.doc_helper.path.parent,
+            title=resource.settings.title,
+        )
+        if not filenames:
+            return
+
+        from worker.export_queue import ExportQueueTask  # pylint: disable=C0415
+
+        queue_task = ExportQueueTask(
+            main_ui=self.root,
+            layout=self.layout,
+            ui_setter=self.set_ui,
+            doc_helper=self.doc_helper,
+            variables=self.vars,
+            frames=self.frames,
+            workspace=self.workspace,
+            paths=list(dict.fromkeys(Path(f) for f in filenames)),
+        )
+        self.root.after(100, queue_task.run)
+
     def on_btn_exit(self) -> None:
         """Callback function for the exit button. Closes the app."""
         log.info("Callback for button 'Exit'.")
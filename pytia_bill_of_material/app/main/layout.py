@@ -29,7 +29,6 @@ from ttkbootstrap import Label
 from ttkbootstrap import Menu
 from ttkbootstrap import Progressbar
 from ttkbootstrap import Treeview
-from worker.prepare import PrepareTask
 
 
 class Layout:
@@ -37,6 +36,7 @@ class Layout:
 
     MARGIN_X = 10
     MARGIN_Y = 10
+    MENU_EXPORT_QUEUE = "Export Product Queue..."
 
     def __init__(self, root: Tk, frames: Frames, variables: Variables) -> None:
         """
@@ -61,11 +61,16 @@ class Layout:
             self._appearance_menu.add_command(label=style)
 
         self._tools_menu = Menu(menubar, tearoff=False)
-        self._tools_menu.add_command(label="Set BOM Format", command=PrepareTask.set_catia_bom_format)
+        self._tools_menu.add_command(label="Set BOM Format", command=self._set_catia_bom_format)
         self._tools_menu.add_command(
             label="Set external BOM",
             command=lambda: set_external_bom_file(root, variables),
         )
+        self._tools_menu.add_checkbutton(label="Force BOM Refresh (Ignore Cache)", variable=variables.refresh_bom)
+        self._tools_menu.add_separator()
+        self._tools_menu.add_command(label=Layout.MENU_EXPORT_QUEUE, state=DISABLED)
+        self._tools_menu.add_separator()
+        self._tools_menu.add_checkbutton(label="Skip Unchanged Files (Delta Sync)", variable=variables.delta_sync)
 
         menubar.add_cascade(label="Help", command=show_help)
         menubar.add_cascade(label="Appearance", menu=self._appearance_menu)
@@ -845,6 +850,10 @@ class Layout:
         self._progress_bar.grid(row=0, column=0, padx=(1, 5), pady=(1, 1), sticky="nsew")
         self._progress_bar.grid_remove()
 
+        self._label_eta = Label(frames.footer, textvariable=variables.eta, font=("Segoe UI", 7))
+        self._label_eta.grid(row=1, column=0, padx=(1, 5), pady=(1, 0), sticky="w")
+        self._label_eta.grid_remove()
+
         # endregion
 
         # region button save
@@ -912,6 +921,18 @@ class Layout:
                     )
                     filter_element._enabled.set(False)
 
+    @staticmethod
+    def _set_catia_bom_format() -> None:
+        """Sets the CATIA bom format. The worker is imported late, it's not required at startup."""
+        from worker.prepare import PrepareTask  # pylint: disable=C0415
+
+        PrepareTask.set_catia_bom_format()
+
+    @property
+    def tools_menu(self) -> Menu:
+        """Returns the tools menu."""
+        return self._tools_menu
+
     @property
     def input_project(self) -> Combobox:
         """Returns the project combobox."""
@@ -1061,6 +1082,10 @@ class Layout:
     def progress_bar(self) -> Progressbar:
         return self._progress_bar
 
+    @property
+    def label_eta(self) -> Label:
+        return self._label_eta
+
     @property
     def tree_report_failed_items(self) -> Treeview:
         return self._tree_report_failed_items
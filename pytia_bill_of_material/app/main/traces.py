@@ -73,6 +73,7 @@ class Traces:
         self.vars.show_report.trace_add("write", self.trace_show_report)
 
         self.vars.zip_bundle.trace_add("write", self.trace_zip_bundle)
+        self.vars.delta_sync.trace_add("write", self.trace_delta_sync)
         self.vars.bundle_by_prop.trace_add("write", self.trace_bundle_by_prop)
         self.vars.bundle_by_prop_txt.trace_add("write", self.trace_bundle_by_prop_txt)
 
@@ -361,6 +362,10 @@ class Traces:
         """Trace callback for the `zip_bundle` BooleanVar"""
         resource.appdata.zip_bundle = self.vars.zip_bundle.get()
 
+    def trace_delta_sync(self, *_) -> None:
+        """Trace callback for the `delta_sync` BooleanVar"""
+        resource.appdata.delta_sync = self.vars.delta_sync.get()
+
     def trace_bundle_by_prop(self, *_) -> None:
         """Trace callback for the `bundle_by_prop` BooleanVar"""
         resource.appdata.bundle_by_prop = self.vars.bundle_by_prop.get()
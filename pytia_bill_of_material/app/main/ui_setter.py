@@ -67,6 +67,7 @@ class UISetter:
         """
 
         self.layout.progress_bar.grid_remove()
+        self.layout.label_eta.grid_remove()
         self.frames.log.grid_remove()
 
         if not self.vars.show_report.get():
@@ -212,6 +213,7 @@ class UISetter:
         self.layout.input_ignore_prefixed_txt.configure(state=tk.DISABLED)
 
         self.layout.button_export.configure(state=tk.DISABLED)
+        self.layout.tools_menu.entryconfig(Layout.MENU_EXPORT_QUEUE, state=tk.DISABLED)
 
         self.root.config(cursor="arrow")
 
@@ -226,6 +228,7 @@ class UISetter:
         self.frames.export.grid_remove()
         self.frames.filters.grid_remove()
         self.layout.progress_bar.grid()
+        self.layout.label_eta.grid()
         self.frames.log.grid()
 
         self.root.config(cursor="wait")
@@ -243,5 +246,7 @@ class UISetter:
             and not re.match(r"^\s+$", self.vars.project.get())
         ):
             self.layout.button_export.configure(state=tk.NORMAL)
+            self.layout.tools_menu.entryconfig(Layout.MENU_EXPORT_QUEUE, state=tk.NORMAL)
         else:
             self.layout.button_export.configure(state=tk.DISABLED)
+            self.layout.tools_menu.entryconfig(Layout.MENU_EXPORT_QUEUE, state=tk.DISABLED)
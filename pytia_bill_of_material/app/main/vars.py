@@ -34,10 +34,12 @@ class Variables:
     bundle_export_path: StringVar
 
     external_bom_path: StringVar
+    refresh_bom: BooleanVar
 
     # Export variables
     bundle: BooleanVar
     zip_bundle: BooleanVar
+    delta_sync: BooleanVar
     bundle_by_prop: BooleanVar
     bundle_by_prop_value: StringVar
     bundle_by_prop_txt: StringVar
@@ -55,6 +57,7 @@ class Variables:
 
     # Progress variables
     progress: DoubleVar
+    eta: StringVar
 
     # Trigger variables
     show_report: BooleanVar
@@ -80,9 +83,11 @@ class Variables:
         self.bundle_export_path = StringVar(master=root, name="bundle_export_path")
 
         self.external_bom_path = StringVar(master=root, name="external_bom_path", value="")
+        self.refresh_bom = BooleanVar(master=root, name="refresh_bom", value=False)
 
         self.bundle = BooleanVar(master=root, name="bundle", value=False)
         self.zip_bundle = BooleanVar(master=root, name="zip_bundle", value=resource.appdata.zip_bundle)
+        self.delta_sync = BooleanVar(master=root, name="delta_sync", value=resource.appdata.delta_sync)
         self.bundle_by_prop = BooleanVar(master=root, name="bundle_by_prop", value=resource.appdata.bundle_by_prop)
         self.bundle_by_prop_txt = StringVar(
             master=root,
@@ -107,5 +112,6 @@ class Variables:
         self.ignore_source_unknown = BooleanVar(master=root, name="ignore_source_unknown")
 
         self.progress = DoubleVar(master=root, name="progress", value=0)
+        self.eta = StringVar(master=root, name="eta", value="")
 
         self.show_report = BooleanVar(master=root, name="show_report", value=False)
@@ -20,6 +20,7 @@ from const import APP_VERSION
 from const import LOG
 from const import LOGS
 from helper.lazy_loaders import LazyDocumentHelper
+from helper.lazy_loaders import warm_up_imports
 from helper.messages import show_help
 from pytia.exceptions import PytiaBodyEmptyError
 from pytia.exceptions import PytiaDifferentDocumentError
@@ -46,6 +47,9 @@ class MainUI(tk.Tk):
 
     def __init__(self) -> None:
         ttk.tk.Tk.__init__(self)
+        # The resident app creates a new window for each launch. The style is a singleton, it
+        # must be bound to the new window.
+        ttk.Style.instance = None
         self.style = ttk.Style(theme=resource.appdata.theme)
 
         # CLASS VARS ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -99,6 +103,7 @@ class MainUI(tk.Tk):
 
     def run(self) -> None:
         """Run the app."""
+        resource.preload()
         self.after(100, self._run)
         self.mainloop()
 
@@ -107,6 +112,7 @@ class MainUI(tk.Tk):
 
         # Setup doc helper
         self.doc_helper = LazyDocumentHelper()
+        warm_up_imports()
 
         # Setup the workspace
         self.workspace = Workspace(
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Command line interface for the app. Processes external bill of material exports without
+    CATIA and without the UI:
+
+    `python -m pytia_bill_of_material process EXPORT [EXPORT ...] --search-folder FOLDER`
+
+    The exports are spread across a process pool. The result of each file is written as json
+    report, the exit code reflects the worst result (see `ExitCode`).
+
+    `python -m pytia_bill_of_material watch FOLDER --search-folder FOLDER`
+
+    Watches the folder and processes new exports as they arrive (see `service.WatchService`).
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+from typing import Sequence
+
+from const import APP_NAME
+from const import APP_VERSION
+from const import KEEP
+from const import LOG_WATCH_METRICS
+from const import LOGS
+from const import ExitCode
+from dependencies import deps
+from models.batch import BatchOptions
+from models.batch import BatchResult
+
+
+def cli(argv: Sequence[str] | None = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv (Sequence[str] | None, optional): The arguments. Defaults to None (sys.argv).
+
+    Returns:
+        int: The exit code.
+    """
+    args = _parser().parse_args(argv)
+
+    if missing := deps.get_missing_packages():
+        names = ", ".join(p.name for p in missing)
+        print(f"Missing dependencies: {names}. Launch the app once to install them.", file=sys.stderr)
+        return ExitCode.DEPENDENCIES
+
+    return process(args) if args.command == "process" else watch(args)
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Returns the argument parser."""
+    parser = argparse.ArgumentParser(prog="pytia_bill_of_material", description=f"{APP_NAME} {APP_VERSION}")
+    parser.add_argument("--version", action="version", version=APP_VERSION)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Options of the pipeline, shared by all commands.
+    pipeline = argparse.ArgumentParser(add_help=False)
+    pipeline.add_argument(
+        "-s",
+        "--search-folder",
+        action="append",
+        type=Path,
+        required=True,
+        help="Folder that contains the CATIA files of the exports (recursive, can be given multiple times).",
+    )
+    pipeline.add_argument("-j", "--jobs", type=int, help="Number of worker processes. Defaults to the CPUs.")
+    pipeline.add_argument("-l", "--language", choices=["auto", "en", "de"], default="auto")
+    pipeline.add_argument("-p", "--project", default=KEEP, help="Overwrites the project number.")
+    pipeline.add_argument("--ignore-prefix", help="Ignores items with this prefix (separated by ';').")
+    pipeline.add_argument("--ignore-unknown-source", action="store_true", help="Ignores items without source.")
+    pipeline.add_argument(
+        "--skip-filter",
+        action="append",
+        default=[],
+        help="Name of a filter (filters.json) to skip (can be given multiple times).",
+    )
+    pipeline.add_argument("--verify-only", action="store_true", help="Doesn't save the bill of material.")
+    pipeline.add_argument("-v", "--verbose", action="store_true", help="Logs debug messages to stderr.")
+    pipeline.add_argument("-q", "--quiet", action="store_true", help="Logs only errors to stderr.")
+
+    process_parser = commands.add_parser(
+        "process",
+        parents=[pipeline],
+        help="Process, verify and save external bill of material exports (xls or xlsx).",
+        description=(
+            "Processes, verifies and saves external bill of material exports without CATIA. "
+            f"Exit codes: {', '.join(f'{c.value}={c.name}' for c in ExitCode)}."
+        ),
+    )
+    process_parser.add_argument("exports", nargs="+", type=Path, help="The exported bill of material files.")
+    process_parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="Folder for the processed bill of material files. Defaults to the folder of each export.",
+    )
+    process_parser.add_argument("-r", "--report", type=Path, help="Path of the json report. Defaults to stdout.")
+
+    watch_parser = commands.add_parser(
+        "watch",
+        parents=[pipeline],
+        help="Watch a folder and process new exports as they arrive.",
+        description=(
+            "Watches the folder and processes new or changed exports. The processed bill of material and "
+            "the json report (<export>.report.json) are written next to the export."
+        ),
+    )
+    watch_parser.add_argument("folder", type=Path, help="The folder to watch.")
+    watch_parser.add_argument(
+        "--pattern",
+        action="append",
+        help="File name pattern of the exports (can be given multiple times). Defaults to '*.xls'.",
+    )
+    watch_parser.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="Seconds an export must not change before it's processed. Defaults to 2.",
+    )
+    watch_parser.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds.")
+    watch_parser.add_argument("--polling", action="store_true", help="Polls instead of using change notifications.")
+    watch_parser.add_argument(
+        "--metrics",
+        type=Path,
+        default=Path(LOGS, LOG_WATCH_METRICS),
+        help="Path of the metrics log (json lines).",
+    )
+    return parser
+
+
+def _options(args: argparse.Namespace, index: bool = True) -> BatchOptions:
+    """
+    Sets up the logging and returns the options of the pipeline.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        index (bool, optional): Whether to index the search folders once. Otherwise they are \
+            indexed for each export (files may be added while the watch service runs). \
+            Defaults to True.
+    """
+    from utils.path_index import index_folders  # pylint: disable=C0415
+    from worker.batch import setup_logging  # pylint: disable=C0415
+
+    level = logging.DEBUG if args.verbose else logging.ERROR if args.quiet else logging.INFO
+    setup_logging(level)
+    return BatchOptions(
+        paths=index_folders(args.search_folder) if index else None,
+        search_folders=args.search_folder,
+        output=getattr(args, "output", None),
+        language=args.language,
+        project=args.project,
+        ignore_prefix_txt=args.ignore_prefix,
+        ignore_source_unknown=args.ignore_unknown_source,
+        skip_filters=args.skip_filter,
+        save=not args.verify_only,
+        log_level=level,
+    )
+
+
+def process(args: argparse.Namespace) -> int:
+    """
+    Runs the `process` command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit code.
+    """
+    from pytia.log import log  # pylint: disable=C0415
+    from utils.excel import ExcelSession  # pylint: disable=C0415
+    from worker.batch import batch_report  # pylint: disable=C0415
+    from worker.batch import error_result  # pylint: disable=C0415
+    from worker.batch import get_xlsx  # pylint: disable=C0415
+    from worker.batch import init_worker  # pylint: disable=C0415
+    from worker.batch import process_file  # pylint: disable=C0415
+
+    start_time = time.perf_counter()
+    started = datetime.now().isoformat(timespec="seconds")
+    options = _options(args)
+    log.info(f"Running {APP_NAME} {APP_VERSION} (command line), PID={os.getpid()}")
+    if options.output:
+        os.makedirs(options.output, exist_ok=True)
+
+    results: Dict[Path, BatchResult] = {}
+    with tempfile.TemporaryDirectory(prefix="pytia_bill_of_material_") as tempdir:
+        # The xls conversion needs the Excel application, it's done one by one before the
+        # exports are handed over to the worker processes. Excel is started only once for all.
+        xlsx_files: Dict[Path, Path] = {}
+        with ExitStack() as stack:
+            if any(export.suffix.lower() == ".xls" for export in args.exports):
+                try:
+                    stack.enter_context(ExcelSession())
+                except Exception as e:  # pylint: disable=broad-except
+                    # Each conversion tries again and fails with its own error.
+                    log.warning(f"Failed starting the Excel session: {e}")
+            for index, export in enumerate(args.exports):
+                try:
+                    xlsx_files[export] = get_xlsx(export, Path(tempdir, f"{index}_{export.stem}.xlsx"))
+                except Exception as e:  # pylint: disable=broad-except
+                    log.error(f"Failed reading {str(export)!r}: {e}")
+                    results[export] = error_result(export, e)
+
+        jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(xlsx_files)))
+        if jobs == 1:
+            init_worker(options, worker=False)
+            for export, xlsx in xlsx_files.items():
+                results[export] = process_file(export, xlsx)
+        else:
+            log.info(f"Processing {len(xlsx_files)} export(s) with {jobs} worker processes.")
+            with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(options,)) as pool:
+                futures = {export: pool.submit(process_file, export, xlsx) for export, xlsx in xlsx_files.items()}
+                for export, future in futures.items():
+                    try:
+                        results[export] = future.result()
+                    except Exception as e:  # pylint: disable=broad-except
+                        # The worker process itself has failed (e.g. it has been terminated).
+                        log.error(f"Failed processing {str(export)!r}: {e}")
+                        results[export] = error_result(export, e)
+
+    report = batch_report(
+        [results[export] for export in args.exports],
+        started=started,
+        duration_s=time.perf_counter() - start_time,
+    )
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(text, encoding="utf8")
+        log.info(f"Saved report to {str(args.report)!r}.")
+    else:
+        print(text)
+
+    exit_code = ExitCode(report["exit_code"])
+    log.info(f"Finished with exit code {exit_code.value} ({exit_code.name}).")
+    return exit_code
+
+
+def watch(args: argparse.Namespace) -> int:
+    """
+    Runs the `watch` command until it's cancelled with Ctrl+C.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit code.
+    """
+    from pytia.log import log  # pylint: disable=C0415
+    from service import WatchMetrics  # pylint: disable=C0415
+    from service import WatchService  # pylint: disable=C0415
+
+    if not args.folder.is_dir():
+        print(f"The folder {str(args.folder)!r} doesn't exist.", file=sys.stderr)
+        return ExitCode.USAGE
+
+    options = _options(args, index=False)
+    log.info(f"Running {APP_NAME} {APP_VERSION} (watch service), PID={os.getpid()}")
+    service = WatchService(
+        folder=args.folder,
+        options=options,
+        metrics=WatchMetrics(args.metrics),
+        patterns=args.pattern,
+        jobs=args.jobs,
+        settle=args.settle,
+        interval=args.interval,
+        polling=args.polling,
+    )
+    service.run()
+    return ExitCode.OK
@@ -4,6 +4,7 @@
 
 import os
 from enum import Enum
+from enum import IntEnum
 from pathlib import Path
 
 __version__ = "0.13.2"
@@ -22,12 +23,22 @@ TEMP_TEMPLATES = Path(TEMP, PYTIA_BILL_OF_MATERIAL, "templates")
 APPDATA = Path(str(os.environ.get("APPDATA")), PYTIA, PYTIA_BILL_OF_MATERIAL)
 LOGS = f"{APPDATA}\\logs"
 LOG = "app.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+LOG_TRACE = "trace_{name}.log.gz"
+LOG_WATCH_METRICS = "watch_metrics.log"
 PID = os.getpid()
 PID_FILE = f"{TEMP}\\{PYTIA_BILL_OF_MATERIAL}.pid"
+RESIDENT_FILE = Path(TEMP, f"{PYTIA_BILL_OF_MATERIAL}.resident")
 VENV = f"\\.env\\{APP_VERSION}"
 VENV_PYTHON = Path(VENV, "Scripts\\python.exe")
 VENV_PYTHONW = Path(VENV, "Scripts\\pythonw.exe")
 PY_VERSION = Path(APPDATA, "pyversion.txt")
+PATH_INDEX = Path(APPDATA, "index")
+BOM_CACHE = Path(APPDATA, "bom_cache")
+BOM_CACHE_SIZE = 3
+WATCH_WRITTEN_SIZE = 1024
+WHEEL_CACHE = Path(APPDATA, "wheels")
 EXCEL_EXE = "EXCEL.EXE"
 EXPLORER = os.path.join(str(os.getenv("WINDIR")), "explorer.exe")
 
@@ -47,9 +58,12 @@ CONFIG_USERS = "users.json"
 CONFIG_DOCKET = "docket.json"
 CONFIG_DOCUMENTATION = "documentation.json"
 CONFIG_PROPERTIES = "properties.json"
+CONFIG_SNAPSHOT = "resources.marshal"
 
 PROP_DRAWING_PATH = "pytia.drawing_path"
 
+DELTA_MANIFEST = ".pytia_manifest.json"
+
 TEMPLATE_DOCKET = "docket.CATDrawing"
 TEMPLATE_DOCUMENTATION = "documentation.CATDrawing"
 
@@ -64,6 +78,8 @@ STPS = "steps"
 STLS = "stls"
 JPGS = "jpgs"
 
+CAD_SUFFIXES = (".catpart", ".catproduct")
+
 X000D = "_x000D_\n"
 KEEP = "Keep"
 
@@ -95,10 +111,35 @@ class Status(Enum):
     SKIPPED = "skipped"
 
 
+class TaskThread(Enum):
+    MAIN = "main"
+    WORKER = "worker"
+    STA = "sta"
+
+
+class StageResource(Enum):
+    CATIA = "catia"
+    EXCEL = "excel"
+    DISK = "disk"
+    CPU = "cpu"
+
+
+class LogEvent(Enum):
+    ITEM = "item(s)"
+    IGNORED = "ignored"
+    WARNING = "warning(s)"
+    FAILED = "failure(s)"
+
+
+class ExitCode(IntEnum):
+    OK = 0
+    FAILED = 1
+    USAGE = 2
+    ERROR = 3
+    DEPENDENCIES = 4
+
+
 class BuiltInFilter(Enum):
     NOT_FOUND = "Not Found"
     NAME_CONVENTION = "Name Convention"
 
-
-os.makedirs(TEMP_EXPORT, exist_ok=True)
-os.makedirs(TEMP_TEMPLATES, exist_ok=True)
@@ -11,18 +11,28 @@
         This module must work on its own without any other dependencies!
 """
 
+import hashlib
 import importlib.resources
 import json
+import os
 import re
 import subprocess
 import sys
+import sysconfig
 import tkinter as tk
 import tkinter.messagebox as tkmsg
+import urllib.request
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from dataclasses import dataclass
+from http.client import HTTPConnection
+from http.client import HTTPException
 from http.client import HTTPSConnection
 from importlib import metadata
-from socket import gaierror
+from pathlib import Path
 from tkinter import ttk
+from typing import Dict
 from typing import List
 from urllib.parse import urlparse
 
@@ -30,6 +40,7 @@ from const import CONFIG_DEPS
 from const import VENV_PYTHON
 from const import VENV_PYTHONW
 from const import WEB_PIP
+from const import WHEEL_CACHE
 from resources import resource
 
 
@@ -94,19 +105,113 @@ class Dependencies:
     @staticmethod
     def web_resource_available(address: str) -> bool:
         """Returns wether a web resource is available or not."""
-        domain = urlparse(address).netloc
-        path = urlparse(address).path or "/"
-        conn = HTTPSConnection(domain, timeout=5)
+        return Dependencies.web_resources_available([address])[address]
 
+    @staticmethod
+    def web_resources_available(addresses: List[str], max_per_host: int = 4) -> Dict[str, bool]:
+        """
+        Returns wether the web resources are available or not. All resources are checked at the \
+            same time, with at most `max_per_host` connections per host. The resources of the \
+            same connection are checked one after another.
+
+        Args:
+            addresses (List[str]): The addresses (http or https) of the resources.
+            max_per_host (int, optional): The max number of connections per host. Defaults to 4.
+
+        Returns:
+            Dict[str, bool]: The availability by address.
+        """
+        hosts: Dict[tuple, List[str]] = {}
+        for address in dict.fromkeys(addresses):
+            url = urlparse(address)
+            hosts.setdefault((url.scheme, url.netloc), []).append(address)
+
+        def _check(scheme: str, netloc: str, connection_addresses: List[str]) -> Dict[str, bool]:
+            connection_type = HTTPConnection if scheme == "http" else HTTPSConnection
+            conn = connection_type(netloc, timeout=5)
+            available = {}
+            try:
+                for address in connection_addresses:
+                    url = urlparse(address)
+                    try:
+                        conn.request("HEAD", (url.path or "/") + (f"?{url.query}" if url.query else ""))
+                        response = conn.getresponse()
+                        response.read()
+                        available[address] = response.status in [200, 301, 302, 307, 308]
+                    except (OSError, HTTPException):
+                        # The connection is opened again by the next request.
+                        conn.close()
+                        available[address] = False
+            finally:
+                conn.close()
+            return available
+
+        # The addresses of a host are spread over its connections.
+        connections = [
+            (*host, host_addresses[i :: max_per_host])
+            for host, host_addresses in hosts.items()
+            for i in range(min(len(host_addresses), max_per_host))
+        ]
+
+        result: Dict[str, bool] = {}
+        if connections:
+            with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+                futures = [executor.submit(_check, *connection) for connection in connections]
+                for future in futures:
+                    result.update(future.result())
+        return {address: result[address] for address in dict.fromkeys(addresses)}
+
+    @staticmethod
+    def download_wheels(wheels: Dict[str, str], folder: Path = WHEEL_CACHE) -> Dict[str, Future]:
+        """
+        Downloads the wheel files into the local wheel cache, all at the same time. Wheels that \
+            are already in the cache aren't downloaded again.
+
+        Args:
+            wheels (Dict[str, str]): The wheel addresses by package name.
+            folder (Path, optional): The wheel cache folder. Defaults to WHEEL_CACHE.
+
+        Returns:
+            Dict[str, Future]: The download of each package. The result of the future is the \
+                path of the wheel file, the future raises if the download failed.
+        """
+        os.makedirs(folder, exist_ok=True)
+
+        def _download(address: str) -> Path:
+            path = Path(folder, Path(urlparse(address).path).name)
+            if path.is_file() and path.stat().st_size > 0:
+                return path
+            tmp_path = path.with_name(f"{path.name}.part")
+            with urllib.request.urlopen(address, timeout=30) as response, open(tmp_path, "wb") as f:
+                while chunk := response.read(1024 * 1024):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+            return path
+
+        executor = ThreadPoolExecutor(max_workers=max(len(wheels), 1))
+        futures = {name: executor.submit(_download, address) for name, address in wheels.items()}
+        executor.shutdown(wait=False)
+        return futures
+
+    @staticmethod
+    def get_fingerprint() -> Dict[str, str] | None:
+        """
+        Returns the fingerprint of the environment: The modification time of the site-packages \
+            folder (changes whenever a package is installed, updated or removed) and the hash of \
+            the dependencies.json.
+
+        Returns:
+            Dict[str, str] | None: The fingerprint, or None if the site-packages folder \
+                doesn't exist.
+        """
+        site_packages = sysconfig.get_path("purelib")
         try:
-            conn.request("HEAD", path)
-            response = conn.getresponse()
-            return True if response.status in [200, 301, 302, 307, 308] else False
-        except gaierror:
-            print("not available")
-            return False
-        finally:
-            conn.close()
+            mtime_ns = os.stat(site_packages).st_mtime_ns
+        except OSError:
+            return None
+        with importlib.resources.open_binary("resources", CONFIG_DEPS) as f:
+            deps_hash = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        return {"site_packages": site_packages, "mtime_ns": str(mtime_ns), "dependencies": deps_hash}
 
     @classmethod
     def get_missing_packages(cls) -> List[PackageInfo]:
@@ -122,11 +227,12 @@ class Dependencies:
         return missing_packages
 
     @classmethod
-    def get_pip_commands(cls) -> dict:
+    def get_pip_commands(cls, missing_packages: List[PackageInfo]) -> dict:
+        available = cls.web_resources_available([p.wheel for p in missing_packages if p.wheel is not None])
         pip_commands = {}
-        for missing_package in cls.get_missing_packages():
+        for missing_package in missing_packages:
             if missing_package.wheel is not None:
-                if cls.web_resource_available(missing_package.wheel):
+                if available[missing_package.wheel]:
                     pip_commands[missing_package.name] = missing_package.wheel
                 else:
                     tkmsg.showerror(
@@ -143,15 +249,22 @@ class Dependencies:
         return pip_commands
 
     def install_dependencies(self) -> None:
-        """Installs missing dependencies."""
+        """
+        Installs missing dependencies. The check is skipped if the environment hasn't changed \
+            since the last successful check (see `get_fingerprint`).
+        """
+        fingerprint = self.get_fingerprint()
+        if fingerprint is not None and fingerprint == resource.appdata.deps_fingerprint:
+            return
 
         # If nothing's missing, return and start the app.
-        if self.get_missing_packages() == []:
+        if (missing_packages := self.get_missing_packages()) == []:
+            resource.appdata.deps_fingerprint = fingerprint or {}
             return
 
         Environment.warn_if_not_virtual()
 
-        installer = VisualInstaller()
+        installer = VisualInstaller(missing_packages)
         installer.install()
 
         # Check if all missing packages have been installed.
@@ -180,9 +293,10 @@ class Dependencies:
 class VisualInstaller(tk.Tk):
     """UI class for dependency installation."""
 
-    def __init__(self):
+    def __init__(self, missing_packages: List[PackageInfo]):
         super().__init__()
 
+        self.missing_packages = missing_packages
         self.message = tk.StringVar(name="message", value="Connecting to remote ...")
         self.progress = tk.IntVar(value=0, name="progress")
 
@@ -217,22 +331,36 @@ class VisualInstaller(tk.Tk):
             )
             sys.exit()
 
-        pip_commands = Dependencies.get_pip_commands()
+        pip_commands = Dependencies.get_pip_commands(self.missing_packages)
+        wheels = {p.name: pip_commands[p.name] for p in self.missing_packages if p.wheel is not None}
+
+        # Download all wheels at once, then install everything with a single pip call. If a
+        # download fails pip gets the link instead and downloads the wheel itself. The window is
+        # updated in short intervals while waiting for the downloads.
+        downloads = Dependencies.download_wheels(wheels)
+        while not all(download.done() for download in downloads.values()):
+            done = sum(download.done() for download in downloads.values())
+            self.message.set(f"Downloading package {done+1} of {len(downloads)} ...")
+            self.progress.set(int(100 * done / len(downloads)))
+            self.update()
+            wait(downloads.values(), timeout=0.1)
+        for name, download in downloads.items():
+            if download.exception() is None:
+                pip_commands[name] = f'"{download.result()}"'
 
         self.progress.set(1)
         self.progress_bar.configure(mode="indeterminate")
         self.progress_bar.start()
 
-        for index, key in enumerate(pip_commands.keys()):
-            python_exe = sys.executable
-            if str(VENV_PYTHONW) in python_exe:
-                python_exe = python_exe.replace(str(VENV_PYTHONW), str(VENV_PYTHON))
-            command = f"start /wait {python_exe} -m pip install {pip_commands[key]} --no-cache-dir"
-            self.message.set(f"Installing package {index+1} of {len(pip_commands)}: {key}")
-            self.update_idletasks()
-            with subprocess.Popen(command, shell=True) as process:
-                while process.poll() is None:
-                    self.update()
+        python_exe = sys.executable
+        if str(VENV_PYTHONW) in python_exe:
+            python_exe = python_exe.replace(str(VENV_PYTHONW), str(VENV_PYTHON))
+        command = f"start /wait {python_exe} -m pip install {' '.join(pip_commands.values())} --no-cache-dir"
+        self.message.set(f"Installing {len(pip_commands)} package(s) ...")
+        self.update_idletasks()
+        with subprocess.Popen(command, shell=True) as process:
+            while process.poll() is None:
+                self.update()
         self.progress_bar.stop()
         self.destroy()
 
@@ -3,7 +3,9 @@
 """
 
 import functools
+import importlib
 import os
+import threading
 import time
 from pathlib import Path
 from typing import List
@@ -15,13 +17,47 @@ from pytia.log import log
 from resources import resource
 from utils.language import get_ui_language
 
+# Modules that aren't required to show the main window, but for the export. Those are imported
+# in the background after the main window is ready.
+WARM_UP_MODULES = (
+    "openpyxl",
+    "pytia_ui_tools.utils.qr",
+    "worker.main_task",
+)
+
+
+def warm_up_imports() -> threading.Thread:
+    """
+    Imports all modules required for the export (see `WARM_UP_MODULES`) in a background thread.
+
+    Warning: Call this only after the main thread has imported the pytia framework (after the \
+        LazyDocumentHelper is instantiated). Otherwise COM is initialized in the warm-up thread.
+
+    Returns:
+        threading.Thread: The warm-up thread.
+    """
+
+    def _warm_up() -> None:
+        start_time = time.perf_counter()
+        for module in WARM_UP_MODULES:
+            try:
+                importlib.import_module(module)
+            except Exception as e:  # pylint: disable=broad-except
+                # The error is raised again when the module is imported on export.
+                log.debug(f"Failed warming up module {module!r}: {e}")
+        log.debug(f"Warmed up modules in {(time.perf_counter()-start_time):.4f}s")
+
+    thread = threading.Thread(target=_warm_up, name="warm-up-imports", daemon=True)
+    thread.start()
+    return thread
+
 
 class LazyDocumentHelper:
     """
     Helper class for late imports of any kind of methods related to handle document operations.
 
-    Important: This class loads the current document only once (on instantiation). If the
-    document changes all operations will be made on the original document.
+    Important: This class loads the current document only on instantiation and when `load` is
+    called. If the document changes all operations will be made on the loaded document.
 
     Use the ensure_doc_not_changed method if you're not sure if the part hasn't changed.
     """
@@ -31,14 +67,42 @@ class LazyDocumentHelper:
         # Otherwise the CATIA-not-running-exception will not be caught.
         # Also: The UI will load a little bit faster.
 
-        start_time = time.perf_counter()
         # pylint: disable=C0415
         from pytia.framework import framework
-        from pytia.wrapper.documents.product_documents import PyProductDocument
 
         # pylint: enable=C0415
 
         self.framework = framework
+        self.load()
+
+    def load(self, path: Path | None = None) -> None:
+        """
+        Loads the document: The current document, or the document at the given path. The \
+            document is opened if it isn't open, and activated. Call this to export another \
+            document in the same session, or after the document has been closed and re-opened: \
+            The reference to a closed document isn't valid anymore.
+
+        Args:
+            path (Path | None, optional): The path of the document to load. Defaults to None \
+                (the current document).
+
+        Raises:
+            PytiaDocumentNotSavedError: Raised when the document is unsaved and unsaved \
+                documents aren't allowed.
+        """
+        start_time = time.perf_counter()
+        # pylint: disable=C0415
+        from pytia.wrapper.documents.product_documents import PyProductDocument
+
+        # pylint: enable=C0415
+
+        if path is not None:
+            if path.name in self.get_all_open_documents():
+                self.framework.catia.documents.item(path.name).activate()
+            else:
+                log.info(f"Opening document {path.name!r}.")
+                self.framework.catia.documents.open(path)
+
         self.document = PyProductDocument(strict_naming=False)
         self.document.current()
         self.document.product.part_number = self.document.document.name.split(".CATProduct")[0]
@@ -188,6 +252,18 @@ class LazyDocumentHelper:
             open_documents.append(self.framework.catia.documents.item(i).name)
         return open_documents
 
+    def has_unsaved_documents(self) -> bool:
+        """
+        Returns True if any open document has unsaved changes. Those changes aren't reflected \
+            by the files, caches that rely on the files (see `PathIndex`, `BomCache`) must not \
+            be used.
+        """
+        documents = self.framework.catia.documents
+        for i in range(1, documents.count + 1):
+            if not documents.item(i).saved:
+                return True
+        return False
+
     def close_all_documents(self) -> None:
         for doc in self.get_all_open_documents():
             try:
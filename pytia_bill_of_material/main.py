@@ -14,12 +14,22 @@ from const import LOGS
 from const import PID
 from const import PID_FILE
 from dependencies import deps
+from resident import REPLY_OK
+from resident import ResidentServer
+from resident import hand_over
 from resources import resource
 
 
 def main() -> None:
     """Application entry point."""
 
+    # In resident mode a previous launch may still be running. If so, it opens the window and
+    # this process is done.
+    resident = resource.settings.resident
+    reply = hand_over() if resident.enabled else None
+    if reply == REPLY_OK:
+        return
+
     # For the apps auto-install-feature, all required dependencies must be
     # imported after they have been checked.
     # So: First check if all required dependencies are installed.
@@ -28,20 +38,39 @@ def main() -> None:
 
     from app.main_ui import MainUI  # pylint: disable=C0415
     from pytia.log import log  # pylint: disable=C0415
+    from utils.log_queue import start_queue_logging  # pylint: disable=C0415
 
-    with open(PID_FILE, "w") as f:
-        f.write(str(PID))
-    atexit.register(lambda: os.remove(PID_FILE))
+    # The pid file belongs to the first process. A process that runs next to a busy resident
+    # app must neither overwrite nor remove it.
+    if reply is None:
+        with open(PID_FILE, "w") as f:
+            f.write(str(PID))
+        atexit.register(lambda: os.remove(PID_FILE))
 
     os.makedirs(LOGS, exist_ok=True)
     if resource.settings.debug:
         log.set_level_debug()
     log.add_stream_handler()
     log.add_file_handler(folder=LOGS, filename=LOG)
+    start_queue_logging(log.logger)
     log.info(f"Running PYTIA Bill of Material {APP_VERSION}, PID={PID}")
 
-    gui = MainUI()
-    gui.run()
+    # Only the first process becomes the resident app. If the resident app is busy (its window
+    # is open) this process runs on its own.
+    server = (
+        ResidentServer(idle_timeout=resident.idle_timeout_min * 60, max_memory_mb=resident.max_memory_mb)
+        if resident.enabled and reply is None
+        else None
+    )
+
+    while True:
+        gui = MainUI()
+        gui.run()
+
+        if server is None or not server.wait_for_launch():
+            break
+        log.info("Resident app launched again.")
+        resource.new_session()
 
 
 if __name__ == "__main__":
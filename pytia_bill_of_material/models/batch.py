@@ -0,0 +1,54 @@
+"""
+    BATCH data models.
+"""
+
+# pylint: disable=C0116
+
+import logging
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Literal
+
+from const import KEEP
+from const import ExitCode
+from models.paths import Paths
+
+
+@dataclass(kw_only=True, slots=True)
+class BatchOptions:
+    # The paths of the items. If None, the search folders are indexed for each export.
+    paths: Paths | None = None
+    search_folders: List[Path] = field(default_factory=list)
+    output: Path | None = None
+    language: Literal["auto", "en", "de"] = "auto"
+    project: str = KEEP
+    ignore_prefix_txt: str | None = None
+    ignore_source_unknown: bool = False
+    skip_filters: List[str] = field(default_factory=list)
+    save: bool = True
+    log_level: int = logging.INFO
+
+
+@dataclass(kw_only=True, slots=True)
+class BatchFailedItem:
+    partnumber: str
+    parent: str
+    path: str | None
+    details: Dict[str, str]
+
+
+@dataclass(kw_only=True, slots=True)
+class BatchResult:
+    input: str
+    status: str
+    exit_code: int = ExitCode.OK.value
+    error: str | None = None
+    language: str | None = None
+    duration_s: float = 0.0
+    assemblies: int = 0
+    items: int = 0
+    failed_items: List[BatchFailedItem] = field(default_factory=list)
+    output: List[str] = field(default_factory=list)
@@ -0,0 +1,66 @@
+"""
+    EXPORT QUEUE data models.
+"""
+
+# pylint: disable=C0116
+
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import List
+
+from const import Status
+from models.move import MoveStats
+from models.report import Report
+
+
+@dataclass(kw_only=True, slots=True)
+class QueueItem:
+    path: Path
+    status: Status = Status.SKIPPED
+    all_moved: bool = True
+    cancelled: bool = False
+    error: str | None = None
+    move_stats: MoveStats = field(default_factory=MoveStats)
+    report: Report | None = None
+    seconds: float = 0.0
+
+    @property
+    def result(self) -> str:
+        """The result of the export as text."""
+        if self.error is not None:
+            return f"error ({self.error})"
+        if self.cancelled:
+            return "cancelled"
+        if self.status == Status.OK and not self.all_moved:
+            return "ok, not all files moved"
+        return self.status.value
+
+
+@dataclass(kw_only=True, slots=True)
+class QueueSummary:
+    items: List[QueueItem] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> List[QueueItem]:
+        return [i for i in self.items if i.error is None and i.status == Status.OK]
+
+    @property
+    def failed(self) -> List[QueueItem]:
+        return [i for i in self.items if i.error is None and i.status == Status.FAILED]
+
+    @property
+    def move_stats(self) -> MoveStats:
+        return sum((i.move_stats for i in self.items), MoveStats())
+
+    @property
+    def text(self) -> str:
+        """The combined summary of all exports."""
+        lines = [
+            f"Exported {len(self.ok)} of {len(self.items)} product(s) in {self.seconds:.0f}s, "
+            f"{len(self.failed)} with errors in the bill of material.",
+            "",
+        ]
+        lines.extend(f"{i.path.stem}: {i.result}" for i in self.items)
+        return "\n".join(lines)
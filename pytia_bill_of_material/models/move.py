@@ -0,0 +1,65 @@
+"""
+    MOVE data models.
+"""
+
+# pylint: disable=C0116
+
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
+from pathlib import Path
+
+
+@dataclass(kw_only=True, slots=True)
+class MoveItem:
+    source: Path
+    target: Path
+    size: int = 0
+    root: Path | None = None
+    hash: str | None = None
+    exists: bool = False
+
+
+@dataclass(kw_only=True, slots=True)
+class MoveStats:
+    files: int = 0
+    bytes: int = 0
+    renamed: int = 0
+    copied: int = 0
+    chunked: int = 0
+    failed: int = 0
+    folders: int = 0
+    new: int = 0
+    replaced: int = 0
+    skipped: int = 0
+    saved_bytes: int = 0
+    seconds: float = field(default=0.0)
+
+    def __add__(self, other: "MoveStats") -> "MoveStats":
+        return MoveStats(**{f.name: getattr(self, f.name) + getattr(other, f.name) for f in fields(self)})
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def summary(self) -> str:
+        """The delta summary of the move operation."""
+        return (
+            f"{self.new} file(s) copied, {self.skipped} skipped, {self.replaced} replaced, "
+            f"{self.saved_bytes / 1e6:.2f} MB saved."
+        )
+
+
+@dataclass(kw_only=True, slots=True)
+class CopyStats:
+    bytes: int = 0
+    resumed: int = 0
+    retries: int = 0
+    seconds: float = field(default=0.0)
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
@@ -8,8 +8,18 @@ from dataclasses import dataclass
 from dataclasses import field
 from pathlib import Path
 from typing import Dict
+from typing import List
 
 
 @dataclass(kw_only=True, slots=True)
 class Paths:
     items: Dict[str, Path] = field(default_factory=dict)
+    children: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass(kw_only=True, slots=True)
+class TreeStats:
+    nodes: int = 0
+    references: int = 0
+    reused: int = 0
+    failed: int = 0
@@ -5,7 +5,12 @@
 # pylint: disable=C0116
 
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Callable
+from typing import List
+
+from const import StageResource
+from const import TaskThread
 
 
 @dataclass
@@ -13,3 +18,14 @@ class RunnerModel:
     func: Callable
     kwargs: dict
     name: str
+    thread: TaskThread = TaskThread.MAIN
+
+
+@dataclass
+class StageModel:
+    name: str
+    func: Callable
+    resource: StageResource
+    depends: List[str] = field(default_factory=list)
+    thread: TaskThread = TaskThread.WORKER
+    cancellable: bool = True
@@ -0,0 +1,22 @@
+from typing import Protocol
+
+
+class ProductsProtocol(Protocol):
+    @property
+    def count(self) -> int: ...
+
+    def item(self, index: int) -> "ProductProtocol": ...
+
+
+class ProductProtocol(Protocol):
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def part_number(self) -> str: ...
+
+    @property
+    def full_name(self) -> str: ...
+
+    @property
+    def products(self) -> ProductsProtocol: ...
@@ -0,0 +1,9 @@
+from pathlib import Path
+from typing import Protocol
+from typing import Set
+
+
+class WatcherProtocol(Protocol):
+    def changes(self, timeout: float) -> Set[Path]: ...
+
+    def close(self) -> None: ...
@@ -0,0 +1,189 @@
+"""
+    Resident mode: Keeps the app running after its window has been closed. Later launches
+    hand over to the resident app through a local socket, which saves the startup of a new
+    interpreter (imports, resources, dependency check, CATIA connection).
+
+    .. warning::
+        Do not import third party modules here.
+        This module must work on its own without any other dependencies!
+"""
+
+import ctypes
+import json
+import os
+import queue
+import secrets
+import socket
+import sys
+import threading
+from pathlib import Path
+
+from const import PID
+from const import RESIDENT_FILE
+
+HAND_OVER_TIMEOUT = 2.0
+REPLY_OK = "ok"
+REPLY_BUSY = "busy"
+
+
+def hand_over(file: Path = RESIDENT_FILE) -> str | None:
+    """
+    Hands the launch over to the resident app.
+
+    Args:
+        file (Path, optional): The file in which the resident app has stored its address. \
+            Defaults to RESIDENT_FILE.
+
+    Returns:
+        str | None: REPLY_OK if the resident app opens a new window, REPLY_BUSY if the window \
+            of the resident app is still open, None if there's no resident app.
+    """
+    try:
+        with open(file, "r", encoding="utf8") as f:
+            info = json.load(f)
+        with socket.create_connection(("127.0.0.1", info["port"]), timeout=HAND_OVER_TIMEOUT) as conn:
+            conn.sendall(json.dumps({"token": info["token"], "command": "launch"}).encode("utf8") + b"\n")
+            with conn.makefile("r", encoding="utf8") as reply:
+                return reply.readline().strip() or None
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def memory_usage_mb() -> float:
+    """
+    Returns the memory usage of the current process in MB: The current working set on Windows. \
+        Other platforms (only used for testing) return the peak resident set size, which is \
+        never lower than the current memory usage.
+    """
+    if sys.platform == "win32":
+
+        class ProcessMemoryCounters(ctypes.Structure):  # pylint: disable=C0115
+            _fields_ = [
+                ("cb", ctypes.c_ulong),
+                ("PageFaultCount", ctypes.c_ulong),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(  # type: ignore
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb  # type: ignore
+        )
+        return counters.WorkingSetSize / 2**20
+
+    import resource as posix_resource  # pylint: disable=C0415
+
+    # Peak resident set size, in KB on Linux.
+    return posix_resource.getrusage(posix_resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+class ResidentServer:
+    """
+    Accepts the launches of later app starts. A launch is only accepted while no window of the
+    app is open, otherwise the launching process runs the app on its own.
+
+    The server listens on a random local port, the port and a secret token are stored in the
+    resident file. Only processes that can read this file (in the users temp folder) can hand
+    over to the resident app.
+    """
+
+    def __init__(self, idle_timeout: float, max_memory_mb: float, file: Path = RESIDENT_FILE) -> None:
+        """
+        Inits the server and starts listening. The first window is considered open.
+
+        Args:
+            idle_timeout (float): The time in seconds after which the resident app exits, if \
+                there was no launch.
+            max_memory_mb (float): The resident app exits after a window has been closed, if \
+                its memory usage exceeds this value.
+            file (Path, optional): The file in which the address is stored. Defaults to \
+                RESIDENT_FILE.
+        """
+        self.idle_timeout = idle_timeout
+        self.max_memory_mb = max_memory_mb
+        self.file = file
+
+        self._token = secrets.token_hex(16)
+        self._launches: queue.SimpleQueue[dict] = queue.SimpleQueue()
+        self._busy = threading.Event()
+        self._busy.set()
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen()
+
+        with open(self.file, "w", encoding="utf8") as f:
+            json.dump({"pid": PID, "port": self._socket.getsockname()[1], "token": self._token}, f)
+
+        self._thread = threading.Thread(target=self._serve, name="resident-server", daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        """Accepts launches until the server is closed."""
+        while True:
+            try:
+                conn, _ = self._socket.accept()
+            except OSError:
+                return
+
+            with conn:
+                try:
+                    conn.settimeout(HAND_OVER_TIMEOUT)
+                    with conn.makefile("r", encoding="utf8") as f:
+                        request = json.loads(f.readline())
+                    if not secrets.compare_digest(str(request.get("token")), self._token):
+                        continue
+                    if request.get("command") != "launch":
+                        continue
+
+                    if self._busy.is_set():
+                        conn.sendall(f"{REPLY_BUSY}\n".encode("utf8"))
+                    else:
+                        self._busy.set()
+                        self._launches.put(request)
+                        conn.sendall(f"{REPLY_OK}\n".encode("utf8"))
+                except (OSError, ValueError, AttributeError):
+                    continue
+
+    def wait_for_launch(self) -> bool:
+        """
+        Blocks until the next launch. Call this after the window of the app has been closed.
+
+        Returns:
+            bool: True if a new window shall be opened, False if the app shall exit (idle \
+                timeout or memory cap exceeded). The server is closed in the latter case.
+        """
+        if memory_usage_mb() > self.max_memory_mb:
+            self.close()
+            return False
+
+        self._busy.clear()
+        try:
+            self._launches.get(timeout=self.idle_timeout)
+            return True
+        except queue.Empty:
+            self.close()
+            # A launch may have been accepted right before the server has been closed.
+            return not self._launches.empty()
+
+    def close(self) -> None:
+        """Stops accepting launches."""
+        self._busy.set()
+        try:
+            # Closing the socket doesn't wake up a pending accept on every platform.
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+        self._thread.join(timeout=HAND_OVER_TIMEOUT)
+        try:
+            os.remove(self.file)
+        except OSError:
+            pass
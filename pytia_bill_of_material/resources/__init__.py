@@ -8,8 +8,11 @@
 import atexit
 import importlib.resources
 import json
+import marshal
 import os
 import re
+import sys
+import threading
 import tkinter.messagebox as tkmsg
 from dataclasses import asdict
 from dataclasses import dataclass
@@ -17,10 +20,13 @@ from dataclasses import field
 from dataclasses import fields
 from pathlib import Path
 from tkinter import BooleanVar
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Literal
 from typing import Optional
+from typing import Tuple
 
 from const import APP_VERSION
 from const import APPDATA
@@ -37,11 +43,29 @@ from const import CONFIG_KEYWORDS
 from const import CONFIG_PROPS
 from const import CONFIG_PROPS_DEFAULT
 from const import CONFIG_SETTINGS
+from const import CONFIG_SNAPSHOT
 from const import CONFIG_USERS
 from const import LOGON
 from const import STYLES
 from resources.utils import expand_env_vars
 
+# All config files that are baked into the resource snapshot of the app build.
+SNAPSHOT_FILES: Tuple[str, ...] = (
+    CONFIG_SETTINGS,
+    CONFIG_KEYWORDS,
+    CONFIG_PROPS,
+    CONFIG_PROPS_DEFAULT,
+    CONFIG_BOM,
+    CONFIG_BOM_DEFAULT,
+    CONFIG_FILTERS,
+    CONFIG_FILTERS_DEFAULT,
+    CONFIG_INFOS,
+    CONFIG_INFOS_DEFAULT,
+    CONFIG_USERS,
+    CONFIG_DOCKET,
+    CONFIG_DOCUMENTATION,
+)
+
 
 @dataclass(slots=True, kw_only=True, frozen=True)
 class SettingsExport:
@@ -101,6 +125,35 @@ class SettingsMails:
     admin: str
 
 
+@dataclass(slots=True, kw_only=True, frozen=True)
+class SettingsCopy:
+    """Dataclass for the chunked copy of large files (settings.json)."""
+
+    chunk_size_mb: int = 8
+    min_size_mb: int = 64
+    retries: int = 5
+    backoff: float = 1.0
+    backoff_factor: float = 2.0
+    max_backoff: float = 30.0
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class SettingsLogging:
+    """Dataclass for the logging of hot paths (settings.json)."""
+
+    summary: bool = True
+    trace: bool = False
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class SettingsResident:
+    """Dataclass for the resident mode (settings.json)."""
+
+    enabled: bool = False
+    idle_timeout_min: float = 60.0
+    max_memory_mb: int = 1024
+
+
 @dataclass(slots=True, kw_only=True)
 class Settings:  # pylint: disable=R0902
     """Dataclass for settings (settings.json)."""
@@ -113,6 +166,9 @@ class Settings:  # pylint: disable=R0902
     paths: SettingsPaths
     urls: SettingsUrls
     mails: SettingsMails
+    copy: SettingsCopy = field(default_factory=dict)  # type: ignore
+    logging: SettingsLogging = field(default_factory=dict)  # type: ignore
+    resident: SettingsResident = field(default_factory=dict)  # type: ignore
 
     def __post_init__(self) -> None:
         self.export = SettingsExport(**dict(self.export))  # type: ignore
@@ -121,6 +177,9 @@ class Settings:  # pylint: disable=R0902
         self.paths = SettingsPaths(**dict(self.paths))  # type: ignore
         self.urls = SettingsUrls(**dict(self.urls))  # type: ignore
         self.mails = SettingsMails(**dict(self.mails))  # type: ignore
+        self.copy = SettingsCopy(**dict(self.copy))  # type: ignore
+        self.logging = SettingsLogging(**dict(self.logging))  # type: ignore
+        self.resident = SettingsResident(**dict(self.resident))  # type: ignore
 
 
 @dataclass(slots=True, kw_only=True, frozen=True)
@@ -191,7 +250,28 @@ class FilterElement:
     condition: Dict[str, str] | bool
     description: str
 
-    _enabled: BooleanVar | None = None
+    _enabled: BooleanVar | bool | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Returns wether the filter is enabled. The state is set by the filter checkbox of the UI \
+            (BooleanVar) or by the command line interface (bool).
+
+        Raises:
+            ValueError: Raised when the state hasn't been set up.
+        """
+        if self._enabled is None:
+            raise ValueError(f"Filter element {self.property_name} is not setup correctly: '_enabled' is None.")
+        return self._enabled if isinstance(self._enabled, bool) else self._enabled.get()
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        """Sets the state. The variable of the filter checkbox is kept, if the UI has set it up."""
+        if isinstance(self._enabled, BooleanVar):
+            self._enabled.set(value)
+        else:
+            self._enabled = value
 
 
 @dataclass(slots=True, kw_only=True)
@@ -312,6 +392,9 @@ class AppData:
     bundle_by_prop: bool = True
     bundle_by_prop_txt: str = ""
     bundle_by_prop_value: str = ""
+    delta_sync: bool = False
+    task_durations: Dict[str, float] = field(default_factory=dict)
+    deps_fingerprint: Dict[str, str] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
         self.version = APP_VERSION  # Always store the latest version in the appdata json
@@ -321,23 +404,82 @@ class AppData:
 class Resources:  # pylint: disable=R0902
     """Class for handling resource files."""
 
-    def __init__(self) -> None:
+    def __init__(self, snapshot: bool = True) -> None:
+        """
+        Inits the resources.
+
+        Args:
+            snapshot (bool, optional): Whether to read the config files from the resource \
+                snapshot of the app build (if there is one). The json files are read if the \
+                snapshot is missing or outdated, or if the debug mode is enabled. Defaults to True.
+        """
         self._language_applied = False
+        self._language: Literal["en", "de"]
         self._applied_keywords: AppliedKeywords
 
+        # Only the settings and the appdata are required at startup, all other config files
+        # are read on first access (or in the background, see `preload`).
+        self._lock = threading.RLock()
+        self._loaders: Dict[str, Callable[[], None]] = {
+            "_props": self._read_props,
+            "_keywords": self._read_keywords,
+            "_bom": self._read_bom,
+            "_filters": self._read_filters,
+            "_users": self._read_users,
+            "_docket": self._read_docket,
+            "_docu": self._read_docu,
+            "_infos": self._read_infos,
+        }
+
+        self._snapshot = self._read_snapshot() if snapshot else None
         self._read_settings()
-        self._read_props()
-        self._read_keywords()
-        self._read_bom()
-        self._read_filters()
-        self._read_users()
-        self._read_docket()
-        self._read_docu()
-        self._read_infos()
+        if self._snapshot is not None and self._settings.debug:
+            self._snapshot = None
+            self._read_settings()
         self._read_appdata()
 
         atexit.register(self._write_appdata)
 
+    def _load(self, attr: str) -> Any:
+        """Returns the config stored in the attribute. Reads the config file on first access."""
+        if attr not in self.__dict__:
+            with self._lock:
+                if attr not in self.__dict__:
+                    self._loaders[attr]()
+        return self.__dict__[attr]
+
+    def preload(self) -> None:
+        """Reads all config files, that haven't been accessed yet, in a background thread."""
+
+        def _preload() -> None:
+            for attr in self._loaders:
+                try:
+                    self._load(attr)
+                except Exception:  # pylint: disable=broad-except
+                    # The error is raised again on first access from the main thread.
+                    pass
+
+        threading.Thread(target=_preload, name="resources-preload", daemon=True).start()
+
+    def new_session(self) -> None:
+        """
+        Prepares the resources for a new window of the resident app: Counts the usage and drops \
+            the language specific configs (bom and filters), they are read again on next access.
+        """
+        self.reset_language()
+        self._appdata.counter += 1
+
+    def reset_language(self) -> None:
+        """Drops the language specific configs (bom and filters), they are read again on next access."""
+        with self._lock:
+            self.__dict__.pop("_bom", None)
+            self.__dict__.pop("_filters", None)
+            self._language_applied = False
+
+    def discard_appdata(self) -> None:
+        """Doesn't save the appdata at exit. Used by worker processes, only the main process saves it."""
+        atexit.unregister(self._write_appdata)
+
     @property
     def settings(self) -> Settings:
         """settings.json"""
@@ -346,12 +488,19 @@ class Resources:  # pylint: disable=R0902
     @property
     def props(self) -> Props:
         """properties.json"""
-        return self._props
+        return self._load("_props")
 
     @property
     def keywords(self) -> Keywords:
         """keywords.json"""
-        return self._keywords
+        return self._load("_keywords")
+
+    @property
+    def language(self) -> Literal["en", "de"]:
+        """The applied language (the CATIA UI language)."""
+        if not self._language_applied:
+            raise Exception("Language has not been applied to filters.json.")
+        return self._language
 
     @property
     def applied_keywords(self) -> AppliedKeywords:
@@ -365,94 +514,100 @@ class Resources:  # pylint: disable=R0902
         """filters.json"""
         if not self._language_applied:
             raise Exception("Language has not been applied to filters.json.")
-        return self._filters
+        return self._load("_filters")
 
     @property
     def bom(self) -> BOM:
         """bom.json"""
         if not self._language_applied:
             raise Exception("Language has not been applied to filters.json.")
-        return self._bom
+        return self._load("_bom")
 
     @property
     def users(self) -> List[User]:
         """users.json"""
-        return self._users
+        return self._load("_users")
 
     @property
     def docket(self) -> dict:
         """docket.json"""
-        return self._docket
+        return self._load("_docket")
 
     @property
     def documentation(self) -> dict:
         """documentation.json"""
-        return self._docu
+        return self._load("_docu")
 
     @property
     def infos(self) -> List[Info]:
         """infos.json"""
-        return self._infos
+        return self._load("_infos")
 
     @property
     def appdata(self) -> AppData:
         """Property for the appdata config file."""
         return self._appdata
 
+    @staticmethod
+    def _read_snapshot() -> Dict[str, bytes] | None:
+        """Reads the resource snapshot from the resources folder, if the app has been built with one."""
+        if not importlib.resources.is_resource("resources", CONFIG_SNAPSHOT):
+            return None
+        with importlib.resources.open_binary("resources", CONFIG_SNAPSHOT) as f:
+            return load_snapshot(f.read())
+
+    def _read_json(self, *names: str) -> Any:
+        """
+        Returns the content of the first config file of the given names that exists. The content \
+            is taken from the resource snapshot, if available.
+
+        Raises:
+            FileNotFoundError: Raised when none of the config files exists.
+        """
+        for name in names:
+            if self._snapshot is not None:
+                if name in self._snapshot:
+                    return marshal.loads(self._snapshot[name])
+            elif importlib.resources.is_resource("resources", name):
+                with importlib.resources.open_binary("resources", name) as f:
+                    return json.load(f)
+        raise FileNotFoundError(f"Config file {names[0]!r} not found.")
+
     def _read_settings(self) -> None:
         """Reads the settings json from the resources folder."""
-        with importlib.resources.open_binary("resources", CONFIG_SETTINGS) as f:
-            self._settings = Settings(**json.load(f))
+        self._settings = Settings(**self._read_json(CONFIG_SETTINGS))
 
     def _read_props(self) -> None:
         """Reads the props json from the resources folder."""
-        props_resource = (
-            CONFIG_PROPS if importlib.resources.is_resource("resources", CONFIG_PROPS) else CONFIG_PROPS_DEFAULT
-        )
-        with importlib.resources.open_binary("resources", props_resource) as f:
-            self._props = Props(**json.load(f))
+        self._props = Props(**self._read_json(CONFIG_PROPS, CONFIG_PROPS_DEFAULT))
 
     def _read_keywords(self) -> None:
         """Reads the keywords json from the resources folder."""
-        with importlib.resources.open_binary("resources", CONFIG_KEYWORDS) as f:
-            self._keywords = Keywords(**json.load(f))
+        self._keywords = Keywords(**self._read_json(CONFIG_KEYWORDS))
 
     def _read_docket(self) -> None:
         """Reads the docket json from the resources folder."""
-        with importlib.resources.open_binary("resources", CONFIG_DOCKET) as f:
-            self._docket = json.load(f)
+        self._docket = self._read_json(CONFIG_DOCKET)
 
     def _read_docu(self) -> None:
         """Reads the documentation json from the resources folder."""
-        with importlib.resources.open_binary("resources", CONFIG_DOCUMENTATION) as f:
-            self._docu = json.load(f)
+        self._docu = self._read_json(CONFIG_DOCUMENTATION)
 
     def _read_bom(self) -> None:
         """Reads the export json from the resources folder."""
-        bom_resource = CONFIG_BOM if importlib.resources.is_resource("resources", CONFIG_BOM) else CONFIG_BOM_DEFAULT
-        with importlib.resources.open_binary("resources", bom_resource) as f:
-            self._bom = BOM(**json.load(f))
+        self._bom = BOM(**self._read_json(CONFIG_BOM, CONFIG_BOM_DEFAULT))
 
     def _read_filters(self) -> None:
         """Reads the filters json from the resources folder."""
-        filters_resource = (
-            CONFIG_FILTERS if importlib.resources.is_resource("resources", CONFIG_FILTERS) else CONFIG_FILTERS_DEFAULT
-        )
-        with importlib.resources.open_binary("resources", filters_resource) as f:
-            self._filters = [FilterElement(**i) for i in json.load(f)]
+        self._filters = [FilterElement(**i) for i in self._read_json(CONFIG_FILTERS, CONFIG_FILTERS_DEFAULT)]
 
     def _read_users(self) -> None:
         """Reads the users json from the resources folder."""
-        with importlib.resources.open_binary("resources", CONFIG_USERS) as f:
-            self._users = [User(**i) for i in json.load(f)]
+        self._users = [User(**i) for i in self._read_json(CONFIG_USERS)]
 
     def _read_infos(self) -> None:
         """Reads the information json from the resources folder."""
-        infos_resource = (
-            CONFIG_INFOS if importlib.resources.is_resource("resources", CONFIG_INFOS) else CONFIG_INFOS_DEFAULT
-        )
-        with importlib.resources.open_binary("resources", infos_resource) as f:
-            self._infos = [Info(**i) for i in json.load(f)]
+        self._infos = [Info(**i) for i in self._read_json(CONFIG_INFOS, CONFIG_INFOS_DEFAULT)]
 
     def _read_appdata(self) -> None:
         """Reads the json config file from the appdata folder."""
@@ -491,7 +646,7 @@ class Resources:  # pylint: disable=R0902
         if logon is None:
             logon = LOGON
 
-        for user in self._users:
+        for user in self.users:
             if user.logon == logon:
                 return True
         return False
@@ -525,7 +680,7 @@ class Resources:  # pylint: disable=R0902
             language (Literal[&quot;en&quot;, &quot;de&quot;]): The language from which the \
                 keywords will be applied to the bom.json config file.
         """
-        keywords = asdict(self._keywords.en if language == "en" else self._keywords.de)
+        keywords = asdict(self.keywords.en if language == "en" else self.keywords.de)
 
         def _apply_to_object(_item):
             for object_fields in fields(_item):
@@ -544,9 +699,10 @@ class Resources:  # pylint: disable=R0902
                         header_name = object_item.split(":")[0] + ":" if ":" in object_item else ""
                         setattr(_item, object_fields.name, header_name + keywords[key])
 
-        _apply_to_object(self._bom.header_items)
-        _apply_to_object(self._bom.sort)
-        _apply_to_object(self._bom.required_header_items)
+        bom = self._load("_bom")
+        _apply_to_object(bom.header_items)
+        _apply_to_object(bom.sort)
+        _apply_to_object(bom.required_header_items)
 
     def _apply_keywords_to_filters(self, language: Literal["en", "de"]) -> None:
         """
@@ -574,8 +730,8 @@ class Resources:  # pylint: disable=R0902
             language (Literal[&quot;en&quot;, &quot;de&quot;]): The language from which the \
                 keywords will be applied to the filters.json config file.
         """
-        keywords = asdict(self._keywords.en if language == "en" else self._keywords.de)
-        for item in self._filters:
+        keywords = asdict(self.keywords.en if language == "en" else self.keywords.de)
+        for item in self._load("_filters"):
             # translate the `property_name` value.
             if item.property_name.startswith("$") and (key := item.property_name.split("$")[1]) in keywords:
                 item.property_name = keywords[key]
@@ -605,8 +761,9 @@ class Resources:  # pylint: disable=R0902
         self._apply_keywords_to_bom(language)  # type: ignore
         self._apply_keywords_to_filters(language)  # type: ignore
         self._applied_keywords = AppliedKeywords(
-            **asdict(resource._keywords.en if language == "en" else resource._keywords.de)
+            **asdict(self.keywords.en if language == "en" else self.keywords.de)
         )
+        self._language = language  # type: ignore
         self._language_applied = True
 
     def get_info_msg_by_counter(self) -> List[str]:
@@ -617,9 +774,9 @@ class Resources:  # pylint: disable=R0902
             List[str]: A list of all messages that should be shown at the counter value.
         """
         values = []
-        for index, value in enumerate(self._infos):
+        for index, value in enumerate(self.infos):
             if value.counter == self._appdata.counter:
-                values.append(self._infos[index].msg)
+                values.append(self.infos[index].msg)
         return values
 
     def get_user_by_logon(self, logon: str) -> User:
@@ -635,9 +792,9 @@ class Resources:  # pylint: disable=R0902
         Returns:
             User: The user from the dataclass list that matches the provided logon name.
         """
-        for index, value in enumerate(self._users):
+        for index, value in enumerate(self.users):
             if value.logon == logon:
-                return self._users[index]
+                return self.users[index]
         raise ValueError
 
     def user_exists(self, logon: str) -> bool:
@@ -650,7 +807,7 @@ class Resources:  # pylint: disable=R0902
         Returns:
             bool: The user from the dataclass list that matches the provided logon name.
         """
-        for user in self._users:
+        for user in self.users:
             if user.logon == logon:
                 return True
         return False
@@ -665,9 +822,9 @@ class Resources:  # pylint: disable=R0902
         Returns:
             FilterElement: The filter element from the dataclass list that matches the provided name.
         """
-        for index, value in enumerate(self._filters):
+        for index, value in enumerate(self._load("_filters")):
             if value.name == name:
-                return self._filters[index]
+                return self._load("_filters")[index]
         return None
 
     def get_filter_element_by_property_name(self, name: str) -> Optional[FilterElement]:
@@ -680,10 +837,55 @@ class Resources:  # pylint: disable=R0902
         Returns:
             FilterElement: The filter element from the dataclass list that matches the provided name.
         """
-        for index, value in enumerate(self._filters):
+        for index, value in enumerate(self._load("_filters")):
             if value.property_name == name:
-                return self._filters[index]
+                return self._load("_filters")[index]
+        return None
+
+
+def create_snapshot() -> bytes:
+    """
+    Creates the resource snapshot for the app build. All config files of the resources folder \
+        are validated against their dataclasses at build time, but the snapshot contains only \
+        the parsed json content of each file: It saves reading and parsing the json files at \
+        runtime, the dataclasses are still built on each launch (on first access of a config).
+
+    Returns:
+        bytes: The marshalled snapshot.
+    """
+    validator = Resources(snapshot=False)
+    # The appdata of the build machine must not be written by the validator.
+    validator.discard_appdata()
+    for attr in validator._loaders:  # pylint: disable=W0212
+        validator._load(attr)  # pylint: disable=W0212
+
+    files: Dict[str, bytes] = {}
+    for name in SNAPSHOT_FILES:
+        if importlib.resources.is_resource("resources", name):
+            with importlib.resources.open_binary("resources", name) as f:
+                files[name] = marshal.dumps(json.load(f))
+    return marshal.dumps((tuple(sys.version_info[:2]), APP_VERSION, files))
+
+
+def load_snapshot(data: bytes) -> Dict[str, bytes] | None:
+    """
+    Loads the resource snapshot. The marshal format depends on the python version, therefore \
+        the snapshot is only used if it has been created with the same python and app version.
+
+    Args:
+        data (bytes): The marshalled snapshot.
+
+    Returns:
+        Dict[str, bytes] | None: The marshalled content of each config file by its name, or None \
+            if the snapshot is unusable.
+    """
+    try:
+        python, version, files = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if tuple(python) != tuple(sys.version_info[:2]) or version != APP_VERSION:
         return None
+    return files
 
 
 resource = Resources()
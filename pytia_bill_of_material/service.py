@@ -0,0 +1,321 @@
+"""
+    Watch service: Watches a folder for new bill of material exports (e.g. dropped by the PLM
+    system) and processes them with the command line pipeline (see `worker.batch`). The results
+    are written next to the exports.
+"""
+
+import glob
+import json
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import replace
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import List
+
+from const import LOG_BACKUPS
+from const import LOG_MAX_BYTES
+from const import WATCH_WRITTEN_SIZE
+from models.batch import BatchOptions
+from models.batch import BatchResult
+from pytia.log import log
+from utils.watcher import Debouncer
+from utils.watcher import create_watcher
+from utils.watcher import matches
+from worker.batch import batch_report
+from worker.batch import error_result
+from worker.batch import get_xlsx
+from worker.batch import init_worker
+from worker.batch import process_file
+
+REPORT_SUFFIX = ".report.json"
+
+
+@dataclass(kw_only=True, slots=True)
+class _Job:
+    source: Path
+    xlsx: Path
+    detected: float
+    started: str
+    future: Future
+
+
+class WatchMetrics:
+    """
+    Writes the throughput and latency metrics of the watch service as json lines to a log file. \
+        Each processed export is written as `file` record, a `summary` record is written every \
+        `interval` seconds (if exports have been processed) and when the service stops.
+
+    The latency is the time from the detection of an export until its result is written \
+        (including the settle time), the wait time is the part of the latency in which the \
+        export wasn't processed (settle time, xls conversion, queue).
+    """
+
+    def __init__(self, path: Path, interval: float = 60.0) -> None:
+        """
+        Inits the metrics.
+
+        Args:
+            path (Path): The path of the metrics log file.
+            interval (float, optional): The interval of the summary records in seconds. \
+                Defaults to 60.0.
+        """
+        self.interval = interval
+        self._started = time.monotonic()
+        self._last_summary = self._started
+        self._latencies: List[float] = []
+        self._window = 0
+        self._failed = 0
+
+        os.makedirs(path.parent, exist_ok=True)
+        self._handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf8")
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        self._logger = logging.getLogger(f"{__name__}.metrics.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(self._handler)
+
+    def record(self, result: BatchResult, detected: float, finished: float) -> None:
+        """Writes the record of a processed export."""
+        latency = finished - detected
+        self._latencies.append(latency)
+        self._window += 1
+        self._failed += result.status != "ok"
+        self._write(
+            record="file",
+            file=result.input,
+            status=result.status,
+            latency_s=round(latency, 3),
+            processing_s=result.duration_s,
+            wait_s=round(max(latency - result.duration_s, 0.0), 3),
+        )
+
+    def tick(self, now: float) -> None:
+        """Writes the summary record if the interval has elapsed."""
+        if now - self._last_summary >= self.interval and self._window:
+            self.summary(now)
+
+    def summary(self, now: float) -> dict:
+        """Writes and returns the summary record."""
+        window_s = max(now - self._last_summary, 1e-9)
+        latencies = sorted(self._latencies)
+        summary = {
+            "record": "summary",
+            "files": len(latencies),
+            "failed": self._failed,
+            "uptime_s": round(now - self._started, 1),
+            "throughput_per_min": round(self._window / window_s * 60, 2),
+            "latency_avg_s": round(statistics.fmean(latencies), 3) if latencies else None,
+            "latency_p95_s": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+            "latency_max_s": round(latencies[-1], 3) if latencies else None,
+        }
+        self._write(**summary)
+        log.info(
+            f"Watch service: {summary['files']} export(s) processed ({summary['failed']} not OK), "
+            f"{summary['throughput_per_min']} per minute, average latency {summary['latency_avg_s']}s."
+        )
+        self._last_summary = now
+        self._window = 0
+        return summary
+
+    def close(self) -> None:
+        """Writes the final summary and closes the log file."""
+        self.summary(time.monotonic())
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
+
+    def _write(self, **record) -> None:
+        self._logger.info(json.dumps({"time": datetime.now().isoformat(timespec="seconds"), **record}))
+
+
+class WatchService:
+    """
+    Watches the folder and processes new or changed exports in a worker pool. The processed \
+        bill of material and the json report (`<export>.report.json`) are written next to the \
+        export. Exports whose report is newer than the export itself are skipped, so the \
+        service can be restarted without processing everything again.
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        options: BatchOptions,
+        metrics: WatchMetrics,
+        patterns: List[str] | None = None,
+        jobs: int | None = None,
+        settle: float = 2.0,
+        interval: float = 1.0,
+        polling: bool = False,
+    ) -> None:
+        """
+        Inits the service.
+
+        Args:
+            folder (Path): The folder to watch.
+            options (BatchOptions): The options of the pipeline. The output folder is ignored, \
+                results are written next to the exports. Give the search folders without the \
+                paths, so CAD files added while the service runs are found.
+            metrics (WatchMetrics): The metrics of the service.
+            patterns (List[str] | None, optional): The file name patterns of the exports. \
+                Defaults to `*.xls`.
+            jobs (int | None, optional): The number of worker processes. Defaults to the CPUs.
+            settle (float, optional): The time in seconds an export must not change before \
+                it's processed. Defaults to 2.0.
+            interval (float, optional): The polling interval in seconds. Defaults to 1.0.
+            polling (bool, optional): Always uses polling instead of change notifications. \
+                Defaults to False.
+        """
+        self.folder = folder
+        self.options = replace(options, output=None)
+        self.metrics = metrics
+        self.patterns = patterns or ["*.xls"]
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.settle = settle
+        self.interval = interval
+        self.polling = polling
+
+        self._jobs: Dict[Path, _Job] = {}
+        # The files written by the service: Those aren't exports, even if they match the patterns.
+        # Only the latest ones are kept (in the order they are written), the watcher reports the
+        # changes of a written file within its next interval.
+        self._written: Dict[Path, None] = {}
+        self._counter = 0
+
+    @staticmethod
+    def report_path(source: Path) -> Path:
+        """Returns the path of the report of the export."""
+        return Path(source.parent, source.name + REPORT_SUFFIX)
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """
+        Runs the service until the stop event is set (or until the user cancels it with Ctrl+C).
+
+        Args:
+            stop (threading.Event | None, optional): The stop event. Defaults to None.
+        """
+        stop = stop or threading.Event()
+        watcher = create_watcher(self.folder, self.patterns, interval=self.interval, polling=self.polling)
+        debouncer = Debouncer(settle=self.settle)
+        log.info(
+            f"Watch service started: {', '.join(self.patterns)} in {str(self.folder)!r}, "
+            f"{self.jobs} worker process(es)."
+        )
+
+        with tempfile.TemporaryDirectory(prefix="pytia_bill_of_material_") as tempdir, ProcessPoolExecutor(
+            max_workers=self.jobs, initializer=init_worker, initargs=(self.options,)
+        ) as pool:
+            try:
+                while not stop.is_set():
+                    changed = watcher.changes(timeout=self.interval)
+                    now = time.monotonic()
+                    debouncer.add({p for p in changed if self._is_new_export(p)}, now)
+                    for path, detected in debouncer.ready(now):
+                        # Checked again: The export may have been processed in the meantime.
+                        if self._is_new_export(path):
+                            self._submit(pool, path, detected, Path(tempdir))
+                    self._collect()
+                    self.metrics.tick(now)
+            except KeyboardInterrupt:
+                log.info("Watch service cancelled by the user.")
+            finally:
+                watcher.close()
+                log.info(f"Stopping watch service, waiting for {len(self._jobs)} export(s).")
+                self._collect(wait=True)
+
+        self.metrics.close()
+        log.info("Watch service stopped.")
+
+    def _is_new_export(self, path: Path) -> bool:
+        """Returns wether the file is an export that must be processed."""
+        if path in self._jobs or path in self._written or not matches(path.name, self.patterns):
+            return False
+        if self._is_output(path):
+            return False
+        try:
+            return os.stat(self.report_path(path)).st_mtime_ns < os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            # No report yet, or the export has been deleted (the debouncer drops those).
+            return True
+        except OSError:
+            return False
+
+    def _is_output(self, path: Path) -> bool:
+        """
+        Returns wether the file is a bill of material file of an export next to it: \
+            `<export>.xlsx` or `<export> (<Summary|Made|Bought>).xlsx`, see `SaveBomTask`. \
+            Those are written by the worker processes and may show up before the result is \
+            collected (or before the export itself, after a restart).
+        """
+        if path.suffix.lower() != ".xlsx":
+            return False
+        base = path.stem[: path.stem.rfind(" (")] if path.stem.endswith(")") and " (" in path.stem else path.stem
+        return any(
+            sibling != path and matches(sibling.name, self.patterns)
+            for sibling in path.parent.glob(f"{glob.escape(base)}.*")
+        )
+
+    def _submit(self, pool: ProcessPoolExecutor, source: Path, detected: float, tempdir: Path) -> None:
+        """Converts the export (if necessary) and submits it to the pool."""
+        self._counter += 1
+        future: Future = Future()
+        xlsx = source
+        try:
+            xlsx = get_xlsx(source, Path(tempdir, f"{self._counter}_{source.stem}.xlsx"))
+            future = pool.submit(process_file, source, xlsx)
+        except Exception as e:  # pylint: disable=broad-except
+            log.error(f"Failed reading {str(source)!r}: {e}")
+            future.set_result(error_result(source, e))
+
+        log.info(f"Queued export {source.name!r}.")
+        self._jobs[source] = _Job(
+            source=source,
+            xlsx=xlsx,
+            detected=detected,
+            started=datetime.now().isoformat(timespec="seconds"),
+            future=future,
+        )
+
+    def _collect(self, wait: bool = False) -> None:
+        """Writes the results of all finished exports."""
+        for source, job in list(self._jobs.items()):
+            if not wait and not job.future.done():
+                continue
+
+            try:
+                result: BatchResult = job.future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                # The worker process itself has failed (e.g. it has been terminated).
+                log.error(f"Failed processing {str(source)!r}: {e}")
+                result = error_result(source, e)
+
+            report = batch_report([result], started=job.started, duration_s=result.duration_s)
+            try:
+                self.report_path(source).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf8")
+            except OSError as e:
+                log.error(f"Failed writing the report of {str(source)!r}: {e}")
+
+            self._add_written([*(Path(p) for p in result.output), self.report_path(source)])
+            if job.xlsx != source:
+                job.xlsx.unlink(missing_ok=True)
+
+            self.metrics.record(result, detected=job.detected, finished=time.monotonic())
+            log.info(f"Finished export {source.name!r}: {result.status.upper()}.")
+            del self._jobs[source]
+
+    def _add_written(self, paths: Iterable[Path]) -> None:
+        """Adds the files written by the service. Drops the oldest ones above WATCH_WRITTEN_SIZE."""
+        for path in paths:
+            self._written.pop(path, None)
+            self._written[path] = None
+        for path in list(self._written)[: max(len(self._written) - WATCH_WRITTEN_SIZE, 0)]:
+            del self._written[path]
@@ -4,20 +4,24 @@
 """
 
 import importlib.resources
+import json
 import os
+import shutil
 import zipfile
 from pathlib import Path
+from typing import Dict
 from typing import List
 from typing import Optional
 
-from const import PYTIA_BILL_OF_MATERIAL
-from const import TEMP
+from const import APP_VERSION
 from const import TEMP_TEMPLATES
 from const import TEMPLATE_DOCKET
 from const import TEMPLATE_DOCUMENTATION
-from pytia_ui_tools.utils.files import file_utility
+from pytia.log import log
 from resources import resource
 
+TEMPLATE_MANIFEST = "templates.json"
+
 
 class Templates:
     """
@@ -26,42 +30,95 @@ class Templates:
 
     def __init__(self) -> None:
         """
-        Inits the class. Extracts the templates files from the zipped app and copies them into
-        the temp-folder (TEMP\\pytia_bill_of_material\\templates\\). Deletes templates from the
-        temp-folder at application exit.
+        Inits the class. Extracts the templates files from the zipped app into a versioned cache
+        folder (TEMP\\pytia_bill_of_material\\templates\\VERSION\\). Cached templates are only
+        extracted again if they differ from the zip members (CRC and size). Cache folders of
+        other versions are removed.
 
         Warning: If the app mode is set to DEBUG, all templates will be used from the apps
         templates folder, not from the zipped app.
         """
-        self.tempfolder = Path(TEMP, PYTIA_BILL_OF_MATERIAL)
+        self.tempfolder = Path(TEMP_TEMPLATES, APP_VERSION)
 
-        temp_docket_path = Path(TEMP_TEMPLATES, TEMPLATE_DOCKET)
-        temp_docu_path = Path(TEMP_TEMPLATES, TEMPLATE_DOCUMENTATION)
+        temp_docket_path = Path(self.tempfolder, TEMPLATE_DOCKET)
+        temp_docu_path = Path(self.tempfolder, TEMPLATE_DOCUMENTATION)
 
         if not resource.settings.debug:
-            self._make_tempfolder(existing_templates=[temp_docket_path, temp_docu_path])
-            self._extract(filename=TEMPLATE_DOCKET, temp_path=temp_docket_path)
-            self._extract(filename=TEMPLATE_DOCUMENTATION, temp_path=temp_docu_path)
+            self._remove_stale()
+            self._extract(filenames=[TEMPLATE_DOCKET, TEMPLATE_DOCUMENTATION])
 
         self._docket_path = self._get_path(filename=TEMPLATE_DOCKET, temp_path=temp_docket_path)
         self._docu_path = self._get_path(filename=TEMPLATE_DOCUMENTATION, temp_path=temp_docu_path)
 
-    def _make_tempfolder(self, existing_templates: List[Path]) -> None:
-        """Creates the temp-folder for the templates. Deletes existing templates."""
-        for temp_template in existing_templates:
-            if os.path.exists(temp_template):
-                os.remove(temp_template)
-        os.makedirs(self.tempfolder, exist_ok=True)
+    def _remove_stale(self) -> None:
+        """Removes the cached templates of other app versions."""
+        if not os.path.isdir(TEMP_TEMPLATES):
+            return
+        for item in Path(TEMP_TEMPLATES).iterdir():
+            if item.name == APP_VERSION:
+                continue
+            # Templates of other versions may still be opened by another instance of the app.
+            if item.is_dir():
+                shutil.rmtree(item, ignore_errors=True)
+            else:
+                try:
+                    os.remove(item)
+                except OSError:
+                    pass
+
+    def _extract(self, filenames: List[str]) -> None:
+        """
+        Extracts the templates from the zipped app, if the cached templates are outdated. The
+        manifest in the cache folder stores the archive's size and modification time, and the
+        CRC and size of each extracted template.
+        """
+        archive_path = Path(resource.settings.paths.release, resource.settings.files.app)
+        manifest_path = Path(self.tempfolder, TEMPLATE_MANIFEST)
+        try:
+            stat = os.stat(archive_path)
+        except OSError:
+            return
+        archive = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
 
-    def _extract(self, filename: str, temp_path: Path) -> None:
-        """Extracts the templates from the zipped app."""
+        manifest: Dict[str, dict] = {}
         try:
-            with zipfile.ZipFile(Path(resource.settings.paths.release, resource.settings.files.app), "r") as zfile:
-                zfile.extract(member=f"templates/{filename}", path=self.tempfolder)
-            file_utility.add_delete(path=temp_path, skip_silent=True, at_exit=True)
-        except:
+            with open(manifest_path, "r", encoding="utf8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
             pass
 
+        def _cached(filename: str, info: dict) -> bool:
+            path = Path(self.tempfolder, filename)
+            return manifest.get(filename) == info and path.is_file() and path.stat().st_size == info["size"]
+
+        # The archive hasn't changed since the last start: Nothing to read from the zip.
+        if manifest.get("archive") == archive and all(
+            filename in manifest and _cached(filename, manifest[filename]) for filename in filenames
+        ):
+            return
+
+        try:
+            os.makedirs(self.tempfolder, exist_ok=True)
+            with zipfile.ZipFile(archive_path, "r") as zfile:
+                for filename in filenames:
+                    member = zfile.getinfo(f"templates/{filename}")
+                    info = {"crc": member.CRC, "size": member.file_size}
+                    if _cached(filename, info):
+                        continue
+
+                    log.debug(f"Extracting template {filename!r} into {str(self.tempfolder)!r}.")
+                    tmp_path = Path(self.tempfolder, f"{filename}.tmp")
+                    with zfile.open(member) as source, open(tmp_path, "wb") as target:
+                        shutil.copyfileobj(source, target)
+                    os.replace(tmp_path, Path(self.tempfolder, filename))
+                    manifest[filename] = info
+
+            manifest["archive"] = archive
+            with open(manifest_path, "w", encoding="utf8") as f:
+                json.dump(manifest, f)
+        except Exception as e:  # pylint: disable=broad-except
+            log.warning(f"Failed extracting templates: {e}")
+
     def _get_path(self, filename: str, temp_path: Path) -> Path | None:
         """Returns the path to the CATDrawing template. Depends on the apps mode."""
         if resource.settings.debug:
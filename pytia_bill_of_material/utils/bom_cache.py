@@ -0,0 +1,111 @@
+"""
+    BOM cache submodule. Caches the bill of material export of CATIA per product.
+"""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Dict
+from typing import List
+
+from const import APP_VERSION
+from const import BOM_CACHE
+from const import BOM_CACHE_SIZE
+from models.paths import Paths
+from pytia.log import log
+
+
+class BomCache:
+    """
+    Caches the converted bill of material (xlsx) of a product.
+
+    A cached file is identified by a fingerprint of all files of the product tree (paths, sizes
+    and modification times), the bill of material format and the CATIA UI language with its
+    keywords, which name the columns of the export. Each product has its own cache
+    folder, which holds at most `size` files. The least recently used file is evicted first.
+    """
+
+    def __init__(self, product_path: Path, folder: Path = BOM_CACHE, size: int = BOM_CACHE_SIZE) -> None:
+        """
+        Inits the cache.
+
+        Args:
+            product_path (Path): The path of the root product.
+            folder (Path, optional): The root folder of the cache. Defaults to BOM_CACHE.
+            size (int, optional): The max number of cached files per product. Defaults to \
+                BOM_CACHE_SIZE.
+        """
+        key = hashlib.blake2b(str(product_path).lower().encode("utf8"), digest_size=8).hexdigest()
+        self.folder = Path(folder, f"{product_path.stem}.{key}")
+        self.size = max(size, 1)
+
+    @staticmethod
+    def fingerprint(
+        paths: Paths,
+        header_items: List[str],
+        language: str,
+        keywords: Dict[str, str],
+    ) -> str | None:
+        """
+        Returns the fingerprint of the product tree, the bill of material format and the language.
+
+        Args:
+            paths (Paths): The paths of all items of the product tree.
+            header_items (List[str]): The header items of the bill of material.
+            language (str): The CATIA UI language, the export of CATIA depends on it.
+            keywords (Dict[str, str]): The applied keywords of the language.
+
+        Returns:
+            str | None: The fingerprint, or None if a file of the tree doesn't exist.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(APP_VERSION.encode("utf8"))
+        digest.update("\n".join(header_items).encode("utf8"))
+        digest.update(f"\n{language}".encode("utf8"))
+        digest.update("".join(f"\n{key}={value}" for key, value in sorted(keywords.items())).encode("utf8"))
+        for partnumber, path in sorted(paths.items.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            digest.update(f"\n{partnumber}|{path}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf8"))
+        return digest.hexdigest()
+
+    def get(self, fingerprint: str) -> Path | None:
+        """
+        Returns the cached file of the fingerprint, or None if there's none.
+
+        Args:
+            fingerprint (str): The fingerprint of the product tree.
+
+        Returns:
+            Path | None: The cached file.
+        """
+        path = Path(self.folder, f"{fingerprint}.xlsx")
+        if not path.is_file():
+            return None
+        # The modification time marks the last use.
+        os.utime(path)
+        return path
+
+    def put(self, fingerprint: str, xlsx: Path) -> None:
+        """
+        Stores a copy of the file in the cache. Evicts the least recently used files.
+
+        Args:
+            fingerprint (str): The fingerprint of the product tree.
+            xlsx (Path): The converted bill of material.
+        """
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            tmp_path = Path(self.folder, f"{fingerprint}.xlsx.tmp")
+            shutil.copyfile(xlsx, tmp_path)
+            os.replace(tmp_path, Path(self.folder, f"{fingerprint}.xlsx"))
+
+            cached = sorted(self.folder.glob("*.xlsx"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+            for path in cached[self.size :]:
+                log.debug(f"Evicted {path.name!r} from the bill of material cache.")
+                os.remove(path)
+        except OSError as e:
+            log.warning(f"Failed caching the bill of material: {e}")
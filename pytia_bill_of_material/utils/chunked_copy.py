@@ -0,0 +1,213 @@
+"""
+    Chunked copy submodule. Copies large files in chunks, resumes interrupted copies.
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import BinaryIO
+from typing import Callable
+
+from models.move import CopyStats
+from pytia.log import log
+
+PARTIAL_SUFFIX = ".partial"
+SOURCE_SUFFIX = ".partial.json"
+
+
+class ChunkedCopy:
+    """
+    Copies a file in chunks to its target.
+
+    The file is written to a temporary name (see `PARTIAL_SUFFIX`) next to the target and renamed
+    to the target name once all chunks have been written. Thus the target never is a half-written
+    file. If the copy fails (e.g. a short network hiccup), it's retried with an exponential
+    backoff. A retry resumes from the last verified chunk of the temporary file, instead of
+    starting the copy over. This also applies to temporary files left behind by a previous run:
+    The temporary file is kept if the copy fails after all retries, or if the app crashes.
+
+    The size and modification time of the source are stored next to the temporary file (see
+    `SOURCE_SUFFIX`). A temporary file is only resumed if the source hasn't changed since.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 8 * 1024 * 1024,
+        min_size: int = 64 * 1024 * 1024,
+        retries: int = 5,
+        backoff: float = 1.0,
+        backoff_factor: float = 2.0,
+        max_backoff: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Inits the copy engine.
+
+        Args:
+            chunk_size (int, optional): The size of a chunk in bytes. Defaults to 8 MB.
+            min_size (int, optional): Files smaller than this (in bytes) aren't worth the chunked \
+                copy. Defaults to 64 MB.
+            retries (int, optional): How often a failed copy is retried. Defaults to 5.
+            backoff (float, optional): The wait time in seconds before the first retry. \
+                Defaults to 1.0.
+            backoff_factor (float, optional): The factor by which the wait time increases with \
+                each retry. Defaults to 2.0.
+            max_backoff (float, optional): The max wait time in seconds between two retries. \
+                Defaults to 30.0.
+            sleep (Callable[[float], None], optional): The function that waits between retries. \
+                Defaults to time.sleep.
+        """
+        self.chunk_size = max(chunk_size, 1)
+        self.min_size = min_size
+        self.retries = max(retries, 0)
+        self.backoff = backoff
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+
+    def applies(self, size: int) -> bool:
+        """Returns wether a file of the given size should be copied in chunks."""
+        return size >= self.min_size
+
+    def copy(
+        self,
+        source: Path,
+        target: Path,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> CopyStats:
+        """
+        Copies the source file to the target.
+
+        Args:
+            source (Path): The file to copy.
+            target (Path): The target path of the file (including the filename).
+            progress (Callable[[int, int], None] | None, optional): Called with the number of \
+                copied bytes and the total number of bytes after each chunk. Defaults to None.
+
+        Raises:
+            OSError: The copy failed after all retries. The temporary file is kept, the next \
+                copy of the file resumes from it.
+
+        Returns:
+            CopyStats: The statistics of the copy.
+        """
+        partial = target.with_name(target.name + PARTIAL_SUFFIX)
+        sidecar = target.with_name(target.name + SOURCE_SUFFIX)
+        size = os.path.getsize(source)
+        stats = CopyStats(bytes=size)
+        start_time = time.perf_counter()
+        wait_time = self.backoff
+
+        for attempt in range(self.retries + 1):
+            try:
+                offset = self._resume_offset(source, partial, sidecar)
+                stats.resumed += offset
+                self._copy_chunks(source, partial, offset, size, progress)
+                shutil.copystat(source, partial)
+                os.replace(partial, target)
+                self._remove(sidecar)
+                break
+            except OSError as e:
+                if attempt == self.retries:
+                    log.error(f"Failed copying {str(source)!r} after {attempt} retries, kept the temporary file: {e}")
+                    raise
+                log.warning(
+                    f"Copying {str(source)!r} failed ({e}), retry {attempt + 1} of {self.retries} "
+                    f"in {wait_time:.1f}s."
+                )
+                stats.retries += 1
+                self.sleep(wait_time)
+                wait_time = min(wait_time * self.backoff_factor, self.max_backoff)
+
+        stats.seconds = time.perf_counter() - start_time
+        log.info(
+            f"Copied {str(source.name)!r} ({size / 1e6:.2f} MB) in {stats.seconds:.2f}s "
+            f"({stats.throughput / 1e6:.2f} MB/s, {stats.retries} retries, "
+            f"{stats.resumed / 1e6:.2f} MB resumed)."
+        )
+        return stats
+
+    def _resume_offset(self, source: Path, partial: Path, sidecar: Path) -> int:
+        """
+        Returns the offset from which the copy can be resumed. The temporary file is discarded,
+        if the source has changed since it has been written (see `SOURCE_SUFFIX`). Otherwise
+        the last complete chunk of the temporary file is compared with the source, everything
+        after this chunk is discarded. If the chunk doesn't match, the copy starts over.
+        """
+        stat = os.stat(source)
+        origin = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        try:
+            partial_size = os.path.getsize(partial)
+        except FileNotFoundError:
+            self._write_sidecar(sidecar, origin)
+            return 0
+
+        if self._read_sidecar(sidecar) != origin:
+            log.warning(f"Discarded the outdated temporary file {str(partial)!r}: The source has changed.")
+            self._write_sidecar(sidecar, origin)
+            partial_size = 0
+
+        offset = min(partial_size, stat.st_size) // self.chunk_size * self.chunk_size
+        if offset > 0:
+            with open(source, "rb") as src, open(partial, "rb") as dst:
+                src.seek(offset - self.chunk_size)
+                dst.seek(offset - self.chunk_size)
+                if src.read(self.chunk_size) != dst.read(self.chunk_size):
+                    log.warning(f"Discarded the corrupted temporary file {str(partial)!r}.")
+                    offset = 0
+
+        with open(partial, "r+b") as dst:
+            dst.truncate(offset)
+        return offset
+
+    def _copy_chunks(
+        self,
+        source: Path,
+        partial: Path,
+        offset: int,
+        size: int,
+        progress: Callable[[int, int], None] | None,
+    ) -> None:
+        """Copies all chunks from the offset onwards to the temporary file."""
+        with open(source, "rb") as src, self._open_target(partial) as dst:
+            src.seek(offset)
+            dst.seek(offset)
+            while chunk := src.read(self.chunk_size):
+                self._write_chunk(dst, chunk)
+                offset += len(chunk)
+                if progress is not None:
+                    progress(offset, size)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+    def _open_target(self, partial: Path) -> BinaryIO:
+        """Opens the temporary file for writing, without truncating it."""
+        return open(partial, "r+b" if partial.exists() else "wb")
+
+    def _write_chunk(self, dst: BinaryIO, chunk: bytes) -> None:
+        """Writes a single chunk to the temporary file."""
+        dst.write(chunk)
+
+    @staticmethod
+    def _read_sidecar(sidecar: Path) -> dict | None:
+        """Returns the size and modification time of the source of the temporary file."""
+        try:
+            with open(sidecar, "r", encoding="utf8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_sidecar(sidecar: Path, origin: dict) -> None:
+        """Stores the size and modification time of the source of the temporary file."""
+        with open(sidecar, "w", encoding="utf8") as f:
+            json.dump(origin, f)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,111 @@
+"""
+    Delta submodule. Detects files that are identical at their target.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+from const import DELTA_MANIFEST
+from pytia.log import log
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_hash(path: Path) -> str:
+    """
+    Returns a fast hash (blake2b) of the file content.
+
+    Args:
+        path (Path): The file to hash.
+
+    Returns:
+        str: The hex digest of the file content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TargetManifest:
+    """
+    The manifest of a target folder. Caches the size, the modification time and the hash of
+    every file that has been released into the folder. The hash of a file at the target must
+    only be computed again, if its size or modification time has changed since the last release.
+
+    The manifest is stored as json file in the target folder (see `DELTA_MANIFEST`).
+    """
+
+    VERSION = 1
+
+    def __init__(self, folder: Path) -> None:
+        """
+        Inits the manifest. Reads the manifest file from the folder, if it exists.
+
+        Args:
+            folder (Path): The target folder.
+        """
+        self.folder = folder
+        self.path = Path(folder, DELTA_MANIFEST)
+        self.entries: Dict[str, dict] = {}
+        self._changed = False
+
+        if self.path.is_file():
+            try:
+                with open(self.path, "r", encoding="utf8") as f:
+                    content = json.load(f)
+                if content.get("version") == self.VERSION:
+                    self.entries = content["files"]
+            except Exception as e:  # pylint: disable=broad-except
+                log.warning(f"Ignored corrupted manifest {str(self.path)!r}: {e}")
+
+    def _key(self, target: Path) -> str:
+        return target.relative_to(self.folder).as_posix()
+
+    def target_hash(self, target: Path, stat: os.stat_result) -> str:
+        """
+        Returns the hash of the target file. Uses the cached hash if the size and the modification
+        time of the file haven't changed.
+
+        Args:
+            target (Path): The file at the target.
+            stat (os.stat_result): The current stat of the target file.
+
+        Returns:
+            str: The hash of the target file.
+        """
+        entry = self.entries.get(key := self._key(target))
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["hash"]
+
+        value = file_hash(target)
+        self.entries[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": value}
+        self._changed = True
+        return value
+
+    def update(self, target: Path, value: str) -> None:
+        """
+        Updates the entry of a file, that has just been released to the target.
+
+        Args:
+            target (Path): The file at the target.
+            value (str): The hash of the file.
+        """
+        stat = os.stat(target)
+        self.entries[self._key(target)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": value}
+        self._changed = True
+
+    def save(self) -> None:
+        """Writes the manifest to the target folder, if it has changed."""
+        if not self._changed:
+            return
+        try:
+            with open(self.path, "w", encoding="utf8") as f:
+                json.dump({"version": self.VERSION, "files": self.entries}, f)
+            self._changed = False
+        except OSError as e:
+            log.warning(f"Failed writing manifest {str(self.path)!r}: {e}")
@@ -2,8 +2,11 @@
     Excel utility: Functions for handling Excel files.
 """
 
+import os
+from pathlib import Path
 from typing import List
 
+from const import EXCEL_EXE
 from helper.resource import ResourceCommons
 from models.bom import BOMAssemblyItem
 from openpyxl.styles import Alignment
@@ -11,14 +14,19 @@ from openpyxl.styles import Font
 from openpyxl.styles import PatternFill
 from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 from openpyxl.worksheet.worksheet import Worksheet
+from pytia.exceptions import PytiaConvertError
 from pytia.exceptions import PytiaDispatchError
 from pytia.exceptions import PytiaNotInstalledError
 from pytia.log import log
 from resources import resource
+from utils.system import application_is_running
 from win32com.client import CDispatch
 from win32com.client import Dispatch
 from win32com.server.exception import COMException
 
+# The Excel application of the active `ExcelSession`, see `convert_xls_to_xlsx`.
+_session: CDispatch | None = None
+
 
 def get_excel() -> CDispatch:
     """
@@ -41,6 +49,90 @@ def get_excel() -> CDispatch:
         raise PytiaDispatchError(f"Failed connecting to Excel: {e}") from e
 
 
+class ExcelSession:
+    """
+    Keeps the connection to the Excel application for several conversions (see \
+        `convert_xls_to_xlsx`), instead of starting and quitting Excel for each of them. \
+        Excel is quit when the session is closed, if it hasn't been running before. Nested \
+        sessions use the connection of the outer session.
+
+    Example:
+    ```
+        with ExcelSession():
+            for xls in files:
+                convert_xls_to_xlsx(xls_path=xls)
+    ```
+    """
+
+    def __init__(self) -> None:
+        self._owner = False
+        self._keep_running = True
+
+    def __enter__(self) -> "ExcelSession":
+        global _session  # pylint: disable=W0603
+        if _session is None:
+            self._owner = True
+            self._keep_running = application_is_running(EXCEL_EXE)
+            _session = get_excel()
+            log.debug("Started Excel session.")
+        return self
+
+    def __exit__(self, *_) -> None:
+        global _session  # pylint: disable=W0603
+        if not self._owner or _session is None:
+            return
+        try:
+            if not self._keep_running:
+                _session.Application.Quit()
+        finally:
+            # Delete the object, otherwise the excel process remains in the task manager.
+            _session = None
+            self._owner = False
+            log.debug("Closed Excel session.")
+
+
+def convert_xls_to_xlsx(xls_path: Path, xlsx_path: Path | None = None) -> Path:
+    """
+    Converts the xls file format to the xlsx format. This is done by using the installed Excel
+    application, or the application of the active `ExcelSession`.
+
+    Args:
+        xls_path (Path): The path to the file to convert.
+        xlsx_path (Path | None, optional): The path of the converted file. Defaults to the path \
+            of the xls file with the xlsx extension.
+
+    Raises:
+        FileNotFoundError: Raised when the input path does not exist.
+        PytiaConvertError: Raised when the file cannot be converted (EXCEL save method fails).
+
+    Returns:
+        Path: The path to the converted xlsx file.
+    """
+    log.info("Converting bill of material format from 'xls' to 'xlsx'.")
+    xlsx_path = xlsx_path or Path(str(xls_path) + "x")
+
+    if not os.path.isfile(xls_path):
+        raise FileNotFoundError(f"Cannot open xls file at {xls_path}: Not found.")
+
+    if os.path.exists(xlsx_path):
+        os.remove(xlsx_path)
+
+    keep_running = _session is not None or application_is_running(EXCEL_EXE)
+
+    excel_dispatch = _session or get_excel()
+    workbook = excel_dispatch.Workbooks.Open(str(xls_path))
+    try:
+        workbook.SaveAs(str(xlsx_path), FileFormat=51)  # 51: Format of xlsx extension
+        log.info(f"Converted bill of material to {str(xlsx_path)!r}.")
+        return xlsx_path
+    except Exception as e:
+        raise PytiaConvertError(f"Failed to convert xls to xlsx: {e}") from e
+    finally:
+        workbook.Close() if keep_running else excel_dispatch.Application.Quit()
+        # Delete the object, otherwise the excel process remains in the task manager.
+        del excel_dispatch
+
+
 def create_header(worksheet: Worksheet, header_items: list) -> None:
     """
     Creates a header row in the given worksheet.
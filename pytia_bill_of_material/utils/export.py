@@ -2,7 +2,12 @@
     Export submodule. Holds utility functions for handling data exports.
 """
 
+import time
+from datetime import datetime
 from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Literal
 from typing import Tuple
@@ -10,6 +15,7 @@ from typing import Tuple
 from const import LOGON
 from const import PROP_DRAWING_PATH
 from pycatia import catia
+from pycatia.drafting_interfaces.drawing_document import DrawingDocument
 from pycatia.enumeration.enumeration_types import cat_capture_format
 from pycatia.enumeration.enumeration_types import cat_specs_and_geom_window_layout
 from pycatia.in_interfaces.specs_and_geom_window import SpecsAndGeomWindow
@@ -26,12 +32,279 @@ from resources import resource
 from resources.utils import expand_env_vars
 
 
+class DocketRenderer:
+    """
+    Renders dockets from a template drawing, which is kept open for a whole export run.
+
+    The template is loaded from disk only once. For each item only the text elements, views and
+    images are swapped, the pdf is exported and the template is reset to its initial state.
+
+    Example:
+    ```
+        with DocketRenderer(template=templates.docket_path, config=docket_config) as renderer:
+            for item in items:
+                ...  # open the document of the item
+                renderer.render(document=document, filename=item.name, folder=folder, quantity=1)
+    ```
+    """
+
+    BACKGROUND_VIEW = "bg"
+
+    # CATIA standard properties, that aren't stored in the user defined properties.
+    STANDARD_PROPERTIES = {
+        "partnumber": "part_number",
+        "revision": "revision",
+        "definition": "definition",
+        "nomenclature": "nomenclature",
+        "source": "source",
+        "description": "description_reference",
+    }
+
+    def __init__(self, template: Path, config: DocketConfig, hide_unknown_properties: bool = True) -> None:
+        """
+        Inits the renderer. The template is opened on `open()` or when entering the context.
+
+        Args:
+            template (Path): The path to the template CATDrawing file.
+            config (DocketConfig): The docket configuration object.
+            hide_unknown_properties (bool, optional): Whether to clear text elements of \
+                properties that don't exist on the document. Defaults to True.
+        """
+        self.template = template
+        self.config = config
+        self.hide_unknown_properties = hide_unknown_properties
+
+        self._document: Any = None
+        self._sheet: Any = None
+        self._texts: Dict[str, Any] = {}
+        self._initial_texts: Dict[str, str] = {}
+        self._added_views: List[str] = []
+        self._added_pictures = 0
+
+        self.rendered = 0
+
+    def __enter__(self) -> "DocketRenderer":
+        self.open()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        """Returns wether the template drawing is loaded."""
+        return self._document is not None
+
+    def open(self) -> None:
+        """
+        Loads the template drawing and indexes all text elements of the config by their name.
+        The template file itself is never modified, the drawing is created from the template.
+        """
+        if self.is_open:
+            return
+
+        start_time = time.perf_counter()
+        document = catia().documents.new_from(str(self.template))
+        self._document = DrawingDocument(document.com_object)
+        self._sheet = self._document.sheets.active_sheet
+
+        configured_names = {text.name for text in self.config.texts}
+        for i_view in range(1, self._sheet.views.count + 1):
+            view = self._sheet.views.item(i_view)
+            for i_text in range(1, view.texts.count + 1):
+                text = view.texts.item(i_text)
+                if text.name in configured_names:
+                    self._texts[text.name] = text
+                    self._initial_texts[text.name] = text.text
+
+        log.debug(
+            f"Loaded docket template {self.template.name!r} with {len(self._texts)} text "
+            f"element(s) in {(time.perf_counter()-start_time):.4f}s."
+        )
+
+    def close(self) -> None:
+        """Closes the template drawing without saving it."""
+        if not self.is_open:
+            return
+
+        try:
+            self._document.close()
+        except Exception as e:  # pylint: disable=broad-except
+            log.warning(f"Failed closing the docket template {self.template.name!r}: {e}")
+
+        log.debug(f"Closed docket template {self.template.name!r} after {self.rendered} docket(s).")
+        self._document = None
+        self._sheet = None
+        self._texts = {}
+        self._initial_texts = {}
+
+    def render(
+        self,
+        document: PyProductDocument | PyPartDocument,
+        filename: str,
+        folder: Path,
+        **kwargs,
+    ) -> None:
+        """
+        Fills the template with the data of the document, exports it as pdf and resets the
+        template afterwards.
+
+        Args:
+            document (PyPartDocument | PyProductDocument): The document from which to create the \
+                docket.
+            filename (str): The filename of the docket pdf.
+            folder (Path): The folder into which the pdf will be exported.
+
+            kwargs: Keyword arguments will be added to the docket for text elements which names \
+                are prefixed with `arg.`.
+        """
+        if not self.is_open:
+            self.open()
+            # Loading the template activates the drawing window. The item document must stay
+            # the active one, other exports (e.g. jpg) work on the active window.
+            document.document.activate()
+
+        if ".pdf" not in filename:
+            filename += ".pdf"
+
+        try:
+            self._set_texts(document=document, **kwargs)
+            self._add_views(document=document)
+            self._add_images(**kwargs)
+            self._document.export_data(Path(folder, filename), "pdf", overwrite=True)
+            self.rendered += 1
+        finally:
+            self.reset()
+
+    def reset(self) -> None:
+        """Restores the initial text values and removes all views and images added by `render`."""
+        for name, value in self._initial_texts.items():
+            if self._texts[name].text != value:
+                self._texts[name].text = value
+
+        views = self._sheet.views
+        for name in reversed(self._added_views):
+            for i_view in range(views.count, 0, -1):
+                if views.item(i_view).name == name:
+                    views.remove(i_view)
+                    break
+        self._added_views = []
+
+        pictures = self._background_view.pictures
+        for _ in range(self._added_pictures):
+            pictures.remove(pictures.count)
+        self._added_pictures = 0
+
+    @property
+    def _background_view(self) -> Any:
+        # View 1: Foreground (Working view), View 2: Background
+        return self._sheet.views.item(2)
+
+    def _set_texts(self, document: PyProductDocument | PyPartDocument, **kwargs) -> None:
+        """Writes the values of the config text elements into the indexed text elements."""
+        for text_config in self.config.texts:
+            if (text := self._texts.get(text_config.name)) is None:
+                continue
+
+            prefix = text_config.name.split(".")[0]
+            value: str | None = None
+            if prefix == "text":
+                value = text_config.value
+            elif prefix == "arg":
+                value = str(kwargs[text_config.value]) if text_config.value in kwargs else None
+            elif prefix == "object":
+                value = datetime.now().strftime(text_config.value)
+            elif prefix == "property":
+                value = self._get_property(document, text_config.value)
+
+            if value is None:
+                if not self.hide_unknown_properties:
+                    continue
+                value = ""
+            if text.text != value:
+                text.text = value
+
+    def _get_property(self, document: PyProductDocument | PyPartDocument, name: str) -> str | None:
+        """Returns the value of a standard or user defined property. None if it doesn't exist."""
+        if name in self.STANDARD_PROPERTIES:
+            return str(getattr(document.product, self.STANDARD_PROPERTIES[name]))
+        if document.properties.exists(name):
+            return str(document.properties.get_by_name(name).value)
+        return None
+
+    def _add_views(self, document: PyProductDocument | PyPartDocument) -> None:
+        """Adds the configured views of the document and fits them into their max size."""
+        for view_config in self.config.views:
+            view = self._sheet.views.add(view_config.name)
+            self._added_views.append(view_config.name)
+
+            view.x = view_config.x
+            view.y = view_config.y
+            view.generative_behavior.document = document.product
+            view.generative_behavior.define_front_view(*view_config.definition)
+            view.generative_behavior.update()
+
+            x_min, x_max, y_min, y_max = view.size()
+            width, height = x_max - x_min, y_max - y_min
+            if width > 0 and height > 0:
+                view.scale = view.scale * min(view_config.max_width / width, view_config.max_height / height)
+
+    def _add_images(self, **kwargs) -> None:
+        """Adds the configured images, the path of an image is taken from the kwargs."""
+        for image_config in self.config.images:
+            if (path := kwargs.get(image_config.path_argument)) is None:
+                continue
+            picture = self._background_view.pictures.add(str(path), image_config.x, image_config.y)
+            picture.width = image_config.width
+            picture.height = image_config.height
+            self._added_pictures += 1
+
+
+def _get_docket_users(document: PyProductDocument | PyPartDocument) -> Dict[str, str]:
+    """
+    Returns the creator, modifier and publisher of the document for the docket. Usernames are
+    translated, if set in the settings.json.
+    """
+    # Translate creator username
+    if document.properties.exists(resource.props.creator):
+        if (
+            resource.user_exists(creator_logon := document.properties.get_by_name(resource.props.creator).value)
+            and resource.settings.export.apply_username_in_docket
+        ):
+            creator = resource.get_user_by_logon(creator_logon).name
+        else:
+            creator = creator_logon
+    else:
+        creator = "Unknown"
+
+    # Translate modifier username
+    if document.properties.exists(resource.props.modifier):
+        if (
+            resource.user_exists(modifier_logon := document.properties.get_by_name(resource.props.modifier).value)
+            and resource.settings.export.apply_username_in_docket
+        ):
+            modifier = resource.get_user_by_logon(modifier_logon).name
+        else:
+            modifier = modifier_logon
+    else:
+        modifier = "Unknown"
+
+    # Translate publisher username
+    if resource.user_exists(LOGON) and resource.settings.export.apply_username_in_docket:
+        publisher = resource.get_user_by_logon(LOGON).name
+    else:
+        publisher = LOGON
+
+    return {"creator": creator, "modifier": modifier, "publisher": publisher}
+
+
 def export_docket(
     docket_template: Path | None,
     filename: str,
     folder: Path,
     document: PyProductDocument | PyPartDocument,
     config: DocketConfig,
+    renderer: DocketRenderer | None = None,
     **kwargs,
 ) -> None:
     """
@@ -45,6 +318,9 @@ def export_docket(
         document (PyPartDocument | PyProductDocument): The part or product document from which \
             to create the docket
         config (DocketConfig): The docket configuration object.
+        renderer (DocketRenderer | None, optional): The renderer which holds the opened template. \
+            Must be set up with the given docket template. If None, the template will be loaded \
+            from disk for this docket. Defaults to None.
 
         kwargs: Keyword arguments will be added to the docket for text elements which names are \
             prefixed with `arg.`. Example: To add the quantity to the docket text \
@@ -52,6 +328,7 @@ def export_docket(
 
     Raises:
         PytiaFileOperationError: Raised if the given folder isn't valid.
+        ValueError: Raised if the renderer holds another template than the given one.
     """
     if ".pdf" not in filename:
         filename += ".pdf"
@@ -59,53 +336,32 @@ def export_docket(
     if docket_template is None:
         raise PytiaFileOperationError("Cannot export docket, given folder is None.")
 
-    # Translate creator username
-    if document.properties.exists(resource.props.creator):
-        if (
-            resource.user_exists(creator_logon := document.properties.get_by_name(resource.props.creator).value)
-            and resource.settings.export.apply_username_in_docket
-        ):
-            creator = resource.get_user_by_logon(creator_logon).name
-        else:
-            creator = creator_logon
-    else:
-        creator = "Unknown"
-
-    # Translate modifier username
-    if document.properties.exists(resource.props.modifier):
-        if (
-            resource.user_exists(modifier_logon := document.properties.get_by_name(resource.props.modifier).value)
-            and resource.settings.export.apply_username_in_docket
-        ):
-            modifier = resource.get_user_by_logon(modifier_logon).name
-        else:
-            modifier = modifier_logon
-    else:
-        modifier = "Unknown"
+    if renderer is not None and Path(renderer.template) != Path(docket_template):
+        raise ValueError(
+            f"Cannot export docket, the renderer holds the template {renderer.template.name!r} "
+            f"instead of {docket_template.name!r}."
+        )
 
-    # Translate publisher username
-    if resource.user_exists(LOGON) and resource.settings.export.apply_username_in_docket:
-        publisher = resource.get_user_by_logon(LOGON).name
-    else:
-        publisher = LOGON
+    users = _get_docket_users(document)
 
     # FIXME: Move this safety function to pytia.
     try:
-        docket = create_docket_from_template(
-            template=docket_template,
-            document=document,
-            config=config,
-            hide_unknown_properties=True,
-            creator=creator,
-            modifier=modifier,
-            publisher=publisher,
-            **kwargs,
-        )
-        export_docket_as_pdf(
-            docket=docket,
-            name=filename,
-            folder=folder,
-        )
+        if renderer is not None:
+            renderer.render(document=document, filename=filename, folder=folder, **users, **kwargs)
+        else:
+            docket = create_docket_from_template(
+                template=docket_template,
+                document=document,
+                config=config,
+                hide_unknown_properties=True,
+                **users,
+                **kwargs,
+            )
+            export_docket_as_pdf(
+                docket=docket,
+                name=filename,
+                folder=folder,
+            )
     except ZeroDivisionError as e:
         log.error(f"Failed to create docket: Body is invisible. Verbose: {e}")
 
@@ -229,6 +485,216 @@ def export_stl(
     _export_stp_stl(filetype="stl", filename=filename, folder=folder, document=document)
 
 
+class JpgCaptureSession:
+    """
+    Captures JPG images of the active document for a whole export run.
+
+    The initial viewer state (full screen, background color, specs and geometry layout) is read
+    from the window that is active when the session starts (the user's window), and restored
+    when the session is closed. Every exported item opens its own window, so the viewer setup (full screen,
+    background color, hidden specification tree) is applied to each new window, but it's
+    never restored per item: The item windows are closed right after their export. Settings
+    that are already applied aren't written again. The 3D viewpoint of a window is reused for
+    all views of all items that are captured in it.
+
+    Example:
+    ```
+        with JpgCaptureSession(bg=(1, 1, 1)) as session:
+            for item in items:
+                ...  # open the document of the item
+                session.capture(filename=item.name, folder=folder, views=views)
+    ```
+    """
+
+    def __init__(
+        self,
+        bg: Tuple[float, float, float] | None = None,
+        reframe_each_view: bool = False,
+        window_getter: Callable[[], Any] | None = None,
+        layout_setter: Callable[[Any, str], None] | None = None,
+        layout_getter: Callable[[Any], str] | None = None,
+    ) -> None:
+        """
+        Inits the session. Doesn't change anything on the viewer until the first capture.
+
+        Args:
+            bg (tuple): Changes the background to the given RGB-color. \
+                Value range is from 0-1. Doesn't change the background if value is None. \
+                Defaults to None.
+            reframe_each_view (bool): Whether to reframe ('fit all in') after every view, or \
+                only once for the first view of an item. CATIA fits all in by the bounding \
+                sphere of the geometry, which doesn't depend on the sight direction. Defaults \
+                to False.
+            window_getter (Callable, optional): Returns the window in which to capture. \
+                Defaults to the active window of the CATIA application.
+            layout_setter (Callable, optional): Sets the specs and geometry layout of the given \
+                window by the name of the layout. Defaults to the CATIA SpecsAndGeomWindow.
+            layout_getter (Callable, optional): Returns the name of the specs and geometry \
+                layout of the given window. Defaults to the CATIA SpecsAndGeomWindow.
+        """
+        self.bg = bg
+        self.reframe_each_view = reframe_each_view
+        self._get_window = window_getter or (lambda: catia().active_window)
+        self._set_layout = layout_setter or _set_specs_and_geom_layout
+        self._get_layout = layout_getter or _get_specs_and_geom_layout
+
+        self._start_window: Any = None
+        self._window: Any = None
+        self._viewer: Any = None
+        self._viewpoint: Any = None
+
+        self._initial_full_screen: bool | None = None
+        self._initial_bg_color: Tuple[float, float, float] | None = None
+        self._initial_layout: str | None = None
+
+        self.captured = 0
+
+    def __enter__(self) -> "JpgCaptureSession":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Reads the initial viewer state from the active window. If no window is open, the \
+            initial state is read from the window of the first capture.
+        """
+        try:
+            window = self._get_window()
+            self._read_initial_state(window)
+            self._start_window = window
+        except Exception as e:  # pylint: disable=broad-except
+            log.debug(f"No active window to read the initial viewer state from: {e}")
+
+    def capture(
+        self,
+        filename: str,
+        folder: Path,
+        views: List[Tuple[float, float, float]],
+    ) -> None:
+        """
+        Exports the open document as JPG.
+
+        Args:
+            filename (str): The filename of the jpg file.
+            folder (Path): The folder into which the data will be exported.
+            views (tuple): The views from which to export the jpg. Value range is from 0-1.
+        """
+        self._ensure_window()
+
+        for index, view in enumerate(views):
+            export_path = Path(
+                folder,
+                filename + f"{' (View ' + str(index+1) + ')' if len(views) > 1 else ''}.jpg",
+            )
+            log.debug(f"Exporting view {index} of {filename} to {export_path}...")
+
+            self._viewpoint.put_sight_direction(view)  # type: ignore
+            self._viewer.update()
+            if index == 0 or self.reframe_each_view:
+                self._viewer.reframe()  # Equivalent to "fit all in"
+            self._viewer.capture_to_file(cat_capture_format.index("catCaptureFormatJPEG"), str(export_path))
+            self.captured += 1
+
+    def close(self) -> None:
+        """
+        Restores the initial viewer state: On the window that was active when the session \
+            started, on the window of the last capture and on the currently active window (the \
+            full screen mode applies to the whole application). Windows that have been closed \
+            in the meantime are skipped.
+        """
+        if self.captured or self._window is not None:
+            windows = [self._start_window, self._window]
+            try:
+                windows.append(self._get_window())
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+            restored: List[Any] = []
+            for window in windows:
+                if window is None or any(_same_window(window, w) for w in restored):
+                    continue
+                try:
+                    self._restore(window)
+                    restored.append(window)
+                except Exception as e:  # pylint: disable=broad-except
+                    if _same_window(window, self._start_window):
+                        log.warning(f"Failed restoring the viewer state: {e}")
+                    else:
+                        log.debug(f"Skipped restoring the viewer state of a closed window: {e}")
+
+        log.debug(f"Closed JPG capture session after {self.captured} capture(s).")
+        self._start_window = None
+        self._window = None
+        self._viewer = None
+        self._viewpoint = None
+
+    def _restore(self, window: Any) -> None:
+        """Restores the initial viewer state of the window."""
+        viewer = window.active_viewer
+        if self._initial_full_screen is not None and viewer.full_screen != self._initial_full_screen:
+            viewer.full_screen = self._initial_full_screen
+        if self._initial_bg_color is not None and tuple(viewer.get_background_color()) != tuple(
+            self._initial_bg_color
+        ):
+            viewer.put_background_color(self._initial_bg_color)  # type: ignore
+        self._set_layout(window, self._initial_layout or "catWindowSpecsAndGeom")
+
+    def _read_initial_state(self, window: Any) -> None:
+        """Reads the initial viewer state from the window."""
+        viewer = window.active_viewer
+        self._initial_full_screen = viewer.full_screen
+        self._initial_bg_color = viewer.get_background_color()
+        try:
+            self._initial_layout = self._get_layout(window)
+        except Exception as e:  # pylint: disable=broad-except
+            log.debug(f"Failed reading the specs and geometry layout: {e}")
+
+    def _ensure_window(self) -> None:
+        """
+        Applies the viewer setup to the current window, if the window has changed since the last
+        capture. The initial state is read from this window only if the session has no initial
+        state yet (see `start`).
+        """
+        window = self._get_window()
+        # The window is compared by its COM object: A document may be opened again in a new
+        # window with the same name, the viewer of the closed window isn't valid anymore.
+        if self._window is not None and _same_window(window, self._window):
+            return
+
+        if self._initial_full_screen is None:
+            self._read_initial_state(window)
+        viewer = window.active_viewer
+
+        if not viewer.full_screen:
+            viewer.full_screen = True
+        if self.bg is not None and tuple(viewer.get_background_color()) != tuple(self.bg):
+            viewer.put_background_color(self.bg)
+        self._set_layout(window, "catWindowGeomOnly")
+
+        self._window = window
+        self._viewer = viewer
+        self._viewpoint = viewer.create_viewer_3d().viewpoint_3d
+
+
+def _same_window(a: Any, b: Any) -> bool:
+    """Returns wether both window wrappers refer to the same CATIA window."""
+    return a is b or (a is not None and b is not None and a.com_object == b.com_object)
+
+
+def _get_specs_and_geom_layout(window: Any) -> str:
+    """Returns the name of the specs and geometry layout of the given window."""
+    return cat_specs_and_geom_window_layout[SpecsAndGeomWindow(window.com_object).layout]
+
+
+def _set_specs_and_geom_layout(window: Any, layout: str) -> None:
+    """Sets the specs and geometry layout (e.g. hides the tree) of the given window."""
+    specs_and_geom = SpecsAndGeomWindow(window.com_object)
+    specs_and_geom.layout = cat_specs_and_geom_window_layout.index(layout)
+
+
 def export_jpg(
     filename: str,
     folder: Path,
@@ -236,7 +702,8 @@ def export_jpg(
     bg: Tuple[float, float, float] | None = None,
 ) -> None:
     """
-    Exports the open document as JPG.
+    Exports the open document as JPG. Use the `JpgCaptureSession` for exporting multiple
+    documents, this function applies and restores the viewer setup for every call.
 
     Args:
         filename (str): The filename of the jpg file.
@@ -246,37 +713,5 @@ def export_jpg(
             Value range is from 0-1, Resets the background after export. \
             Doesn't change the background if value is None. Defaults to None.
     """
-    active_window = catia().active_window
-    active_viewer = active_window.active_viewer
-
-    # Save the current screen state
-    current_fs = active_viewer.full_screen
-    active_viewer.full_screen = True
-
-    # Save current background color
-    current_bg_color = active_viewer.get_background_color()
-    if bg is not None:
-        active_viewer.put_background_color(bg)
-
-    # Hide the tree
-    specs_and_geom = SpecsAndGeomWindow(active_window.com_object)
-    specs_and_geom.layout = cat_specs_and_geom_window_layout.index("catWindowGeomOnly")
-
-    view_point_3D = active_viewer.create_viewer_3d().viewpoint_3d
-    for index, view in enumerate(views):
-        export_path = Path(
-            folder,
-            filename + f"{' (View ' + str(index+1) + ')' if len(views) > 1 else ''}.jpg",
-        )
-        log.debug(f"Exporting view {index} of {filename} to {export_path}...")
-
-        view_point_3D.put_sight_direction(view)  # type: ignore
-        active_viewer.update()
-        active_viewer.reframe()  # Equivalent to "fit all in"
-        # active_viewer.zoom_in()
-        active_viewer.capture_to_file(cat_capture_format.index("catCaptureFormatJPEG"), str(export_path))
-
-    # Reset background and show tree
-    active_viewer.full_screen = current_fs
-    active_viewer.put_background_color(current_bg_color)  # type: ignore
-    specs_and_geom.layout = cat_specs_and_geom_window_layout.index("catWindowSpecsAndGeom")
+    with JpgCaptureSession(bg=bg, reframe_each_view=True) as session:
+        session.capture(filename=filename, folder=folder, views=views)
@@ -4,18 +4,35 @@
 
 import atexit
 import logging
+import queue
+import re
+import threading
+import time
 from tkinter import END
 from tkinter import Text
 from tkinter import Tk
+from typing import List
 
 from pytia.log import log
 from ttkbootstrap import Style
 
+FLUSH_INTERVAL = 100
+MAX_LINES = 5000
+LEVEL_TAGS = ["DEBUG", "INFO", "WARNING", "ERROR", "EXCEPTION"]
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
 
 class WidgetLogHandler(logging.Handler):
     """
     Handles logging to Text widgets. Highlights log levels.
 
+    Records are queued and written to the widget in batches by the Tk thread, which polls the
+    queue with `after()`. Records of other threads (e.g. a runner's worker thread) must not
+    touch the widget. If the Tk thread is busy (e.g. a CATIA task on the main thread), the
+    queue is flushed on emit, at most once per flush interval. Only the new lines are tagged,
+    the tags are taken from the record. The widget holds at most `max_lines` lines, the oldest
+    lines are removed first.
+
     Example:
     ```
         log_format = logging.Formatter(f"%(asctime)s  %(levelname)s  %(message)s")
@@ -26,18 +43,24 @@ class WidgetLogHandler(logging.Handler):
     ```
     """
 
-    def __init__(self, root: Tk, widget: Text, style: Style):
+    def __init__(self, root: Tk, widget: Text, style: Style, max_lines: int = MAX_LINES):
         """
         Inits the WidgetLogHandler.
 
         Args:
             root (Tk): The root tkinter window.
             widget (Text): The widget to which the handler is attached.
+            style (Style): The style from which the tag colors are taken.
+            max_lines (int, optional): The max number of lines in the widget. Defaults to \
+                MAX_LINES.
         """
         logging.Handler.__init__(self)
 
         self._root = root
         self._widget = widget
+        self._max_lines = max_lines
+        self._pending: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self._last_flush = time.perf_counter()
 
         self._widget.tag_config("DATE", foreground="grey")
         self._widget.tag_config("TIME", foreground="grey")
@@ -52,26 +75,70 @@ class WidgetLogHandler(logging.Handler):
         )
 
         atexit.register(lambda: log.logger.removeHandler(self))
+        # The resident app outlives the window, records must not be written to destroyed widgets.
+        self._widget.bind("<Destroy>", lambda _: log.logger.removeHandler(self), add="+")
+        self._root.after(FLUSH_INTERVAL, self._flush)
 
     def emit(self, record) -> None:
         """
-        Prints a new log record to the widget.
+        Queues a new log record. Flushes the queue if the Tk thread hasn't done it in time.
         """
-        msg = self.format(record).replace("\n", " ")
+        # The message is resolved now, on the logging thread (see `LazyMessage`).
+        record.msg = record.getMessage()
+        record.args = None
+        self._pending.put(record)
+        if (
+            threading.current_thread() is threading.main_thread()
+            and time.perf_counter() - self._last_flush > FLUSH_INTERVAL / 1000
+        ):
+            self._write_pending()
+
+    def _flush(self) -> None:
+        """Writes all queued records to the widget. Re-schedules itself."""
+        self._write_pending()
+        self._root.after(FLUSH_INTERVAL, self._flush)
+
+    def _write_pending(self) -> None:
+        """Writes all queued records to the widget, in a single batch."""
+        self._last_flush = time.perf_counter()
+        records: List[logging.LogRecord] = []
+        while not self._pending.empty():
+            records.append(self._pending.get())
+        if not records:
+            return
+
+        chunks: list = []
+        for record in records:
+            chunks.extend(self._segments(record))
+
         self._widget.configure(state="normal")
-        self._widget.insert(END, msg + "\n")
+        self._widget.insert(END, *chunks)
+        lines = int(self._widget.index("end-1c").split(".")[0]) - 1
+        if lines > self._max_lines:
+            self._widget.delete("1.0", f"{lines - self._max_lines + 1}.0")
         self._widget.configure(state="disabled")
         self._widget.yview(END)
-
-        self.search(keyword=r"(\d{4}-\d{2}-\d{2})", tag="DATE", regex=True)
-        self.search("DEBUG")
-        self.search("INFO")
-        self.search("WARNING")
-        self.search("ERROR")
-        self.search("EXCEPTION")
-
         self._root.update_idletasks()
 
+    def _segments(self, record: logging.LogRecord) -> list:
+        """
+        Returns the formatted record as alternating text and tags, as required by `Text.insert`.
+        The leading date and the level name are tagged.
+        """
+        msg = self.format(record).replace("\n", " ") + "\n"
+        segments: list = []
+
+        if date := DATE_PATTERN.match(msg):
+            segments.extend([date.group(0), "DATE"])
+            msg = msg[date.end() :]
+
+        level = record.levelname
+        if level in LEVEL_TAGS and (index := msg.find(level)) >= 0:
+            segments.extend([msg[:index], (), level, level, msg[index + len(level) :], ()])
+        else:
+            segments.extend([msg, ()])
+        return segments
+
     def search(self, keyword: str, tag: str | None = None, regex: bool = False) -> None:
         """
         Search for keywords and highlight them in the widget.
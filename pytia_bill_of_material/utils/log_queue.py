@@ -0,0 +1,82 @@
+"""
+    Log queue submodule. Moves the slow log handlers (stream and file) to a background thread.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from logging.handlers import RotatingFileHandler
+from typing import Callable
+
+from const import LOG_BACKUPS
+from const import LOG_MAX_BYTES
+
+
+class LazyMessage:
+    """
+    A log message that is only formatted if the record is emitted. Use this for messages in hot
+    paths (e.g. for each row of the bill of material), which are usually below the log level.
+
+    Example:
+    ```
+        log.debug(LazyMessage(lambda: f"Working on row {row} of {worksheet.max_row}."))
+    ```
+    """
+
+    __slots__ = ("_func",)
+
+    def __init__(self, func: Callable[[], str]) -> None:
+        """
+        Inits the message.
+
+        Args:
+            func (Callable[[], str]): Returns the message. Called at most once per handler.
+        """
+        self._func = func
+
+    def __str__(self) -> str:
+        return self._func()
+
+
+def start_queue_logging(logger: logging.Logger) -> QueueListener:
+    """
+    Moves all handlers of the logger to a background thread. The logger only keeps a queue
+    handler, which formats the record on the calling thread and hands it over to the listener.
+    Plain file handlers are replaced by rotating file handlers. The listener is stopped at exit,
+    after all queued records have been handled.
+
+    Args:
+        logger (logging.Logger): The logger whose handlers to move.
+
+    Returns:
+        QueueListener: The started listener.
+    """
+    handlers = []
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        if type(handler) is logging.FileHandler:  # pylint: disable=C0123
+            rotating_handler = RotatingFileHandler(
+                handler.baseFilename,
+                maxBytes=LOG_MAX_BYTES,
+                backupCount=LOG_BACKUPS,
+                encoding=handler.encoding,
+            )
+            rotating_handler.setLevel(handler.level)
+            rotating_handler.setFormatter(handler.formatter)
+            handler.close()
+            handler = rotating_handler
+        handlers.append(handler)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))  # type: ignore
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)  # type: ignore
+    listener.start()
+
+    def _stop() -> None:
+        if listener._thread is not None:  # pylint: disable=W0212
+            listener.stop()
+
+    atexit.register(_stop)
+    return listener
@@ -0,0 +1,128 @@
+"""
+    Log summary submodule. Aggregates the per-item log events of hot paths.
+"""
+
+import gzip
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+from typing import TextIO
+
+from const import LOG_TRACE
+from const import LOGS
+from const import LogEvent
+from pytia.log import log
+from resources import resource
+
+
+class LogSummary:
+    """
+    Counts the log events of a block (e.g. an assembly of the bill of material) and logs one
+    summary line per block, instead of one line per event.
+
+    In detail mode the events are logged one by one, as before. Warnings and failures are always
+    logged right away, so they aren't hidden in the summary. If the trace is enabled, all
+    events are written to a compressed trace file in the log folder, regardless of the mode.
+    The messages are only formatted if they are logged or traced (see `LazyMessage`).
+
+    Example:
+    ```
+        with LogSummary("process_bom") as summary:
+            summary.begin("Assembly")
+            summary.count(LogEvent.ITEM, LazyMessage(lambda: f"Added item {partnumber!r}."))
+    ```
+    """
+
+    def __init__(self, name: str, summary: bool | None = None, trace_folder: Path | None = None) -> None:
+        """
+        Inits the summary.
+
+        Args:
+            name (str): The name of the summary, used for the trace file name.
+            summary (bool | None, optional): Whether to log summaries or each event. Defaults \
+                to None (the `logging.summary` value of the settings.json).
+            trace_folder (Path | None, optional): The folder of the trace file. Defaults to None \
+                (the log folder, if `logging.trace` of the settings.json is enabled).
+        """
+        self.summary = resource.settings.logging.summary if summary is None else summary
+        if trace_folder is None and resource.settings.logging.trace:
+            trace_folder = Path(LOGS)
+
+        self._lock = threading.Lock()
+        self._block: str | None = None
+        self._counts: Dict[LogEvent, int] = {}
+        self._trace: TextIO | None = None
+        if trace_folder is not None:
+            try:
+                os.makedirs(trace_folder, exist_ok=True)
+                self._trace = gzip.open(Path(trace_folder, LOG_TRACE.format(name=name)), "wt", encoding="utf8")
+            except OSError as e:
+                log.warning(f"Failed opening the trace file: {e}")
+
+    def __enter__(self) -> "LogSummary":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def begin(self, block: str) -> None:
+        """Ends the current block and begins a new one."""
+        self.end()
+        with self._lock:
+            self._block = block
+            self._counts = {event: 0 for event in LogEvent}
+        self.detail(f"Begin {block!r}.", level=logging.INFO)
+
+    def count(self, event: LogEvent, message: object = None, level: int = logging.INFO) -> None:
+        """
+        Counts the event of the current block.
+
+        Args:
+            event (LogEvent): The event to count.
+            message (object, optional): The detail message of the event. Defaults to None.
+            level (int, optional): The log level of the message. Messages with level WARNING \
+                and above are logged in summary mode, too. Defaults to logging.INFO.
+        """
+        with self._lock:
+            if self._block is not None:
+                self._counts[event] += 1
+        if message is not None:
+            self.detail(message, level=level)
+
+    def detail(self, message: object, level: int = logging.DEBUG) -> None:
+        """
+        Logs the message in detail mode, or in any mode if the level is WARNING or above. Writes
+        it to the trace file, if enabled.
+        """
+        if not self.summary or level >= logging.WARNING:
+            getattr(log, logging.getLevelName(level).lower())(message)
+        if self._trace is not None:
+            with self._lock:
+                self._trace.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}  {logging.getLevelName(level)}  {message}\n")
+
+    def end(self) -> None:
+        """Ends the current block. Logs its summary in summary mode."""
+        with self._lock:
+            block, counts, self._block = self._block, self._counts, None
+        if block is None:
+            return
+
+        text = ", ".join(f"{counts[event]} {event.value}" for event in LogEvent)
+        if self._trace is not None:
+            with self._lock:
+                self._trace.write(f"Summary of {block!r}: {text}.\n")
+        if self.summary:
+            if counts[LogEvent.WARNING] or counts[LogEvent.FAILED]:
+                log.warning(f"{block}: {text}.")
+            else:
+                log.info(f"{block}: {text}.")
+
+    def close(self) -> None:
+        """Ends the current block and closes the trace file."""
+        self.end()
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
@@ -0,0 +1,270 @@
+"""
+    Mover submodule. Moves exported files to their target folders.
+"""
+
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from models.move import MoveItem
+from models.move import MoveStats
+from pytia.log import log
+from utils.chunked_copy import ChunkedCopy
+from utils.delta import TargetManifest
+from utils.delta import file_hash
+
+MAX_WORKERS = 8
+
+
+class FileMover:
+    """
+    Moves files from a manifest to their targets.
+
+    Every target folder is created only once. Files on the same volume as their target are
+    renamed (`os.replace`), all other files are copied by a bounded thread pool. Large files are
+    copied in chunks by the `ChunkedCopy` engine, if one is given.
+
+    In delta mode files are skipped (and removed from the source), if an identical file already
+    exists at the target. Files are compared by their size first, then by their hash. The hashes
+    of the target files are cached in a manifest in the target folder (see `TargetManifest`).
+
+    Failed items are not retried, they're collected in the `failed` list instead. This allows
+    the caller to handle them (e.g. ask the user to close a locked file).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        delta: bool = False,
+        copier: ChunkedCopy | None = None,
+    ) -> None:
+        """
+        Inits the mover.
+
+        Args:
+            max_workers (int, optional): The max number of threads used for copying files to \
+                another volume. Defaults to MAX_WORKERS.
+            delta (bool, optional): Whether to skip files that are identical at the target. \
+                Defaults to False.
+            copier (ChunkedCopy | None, optional): The engine for copying large files to \
+                another volume. Defaults to None.
+        """
+        self.max_workers = max_workers
+        self.delta = delta
+        self.copier = copier
+        self.manifest: List[MoveItem] = []
+        self.failed: List[MoveItem] = []
+        self.stats = MoveStats()
+
+        self._devices: Dict[Path, int] = {}
+        self._manifests: Dict[Path, TargetManifest] = {}
+
+    def add_folder(self, source: Path, target: Path) -> None:
+        """
+        Adds every file inside the source folder to the manifest. The folder structure of the
+        source is kept in the target.
+
+        Args:
+            source (Path): The folder from which to move all files.
+            target (Path): The folder into which the files will be moved.
+        """
+        for abs_file in source.rglob("*.*"):
+            if abs_file.is_file():
+                self.add_file(source=abs_file, target=Path(target, abs_file.relative_to(source)), root=target)
+
+    def add_file(self, source: Path, target: Path, root: Path | None = None) -> None:
+        """
+        Adds a single file to the manifest.
+
+        Args:
+            source (Path): The file to move.
+            target (Path): The target path of the file (including the filename).
+            root (Path | None, optional): The target folder, which holds the delta manifest. \
+                Defaults to the parent folder of the target.
+        """
+        self.manifest.append(
+            MoveItem(
+                source=source,
+                target=target,
+                size=os.path.getsize(source),
+                root=root if root is not None else target.parent,
+            )
+        )
+
+    def run(self, progress: Callable[[float], None] | None = None) -> MoveStats:
+        """
+        Moves all files of the manifest.
+
+        Args:
+            progress (Callable[[float], None] | None, optional): Called with the progress \
+                (0-1) after each moved file. Always called from the thread that runs the mover. \
+                Defaults to None.
+
+        Returns:
+            MoveStats: The statistics of the move operation.
+        """
+        start_time = time.perf_counter()
+        self.stats = MoveStats()
+        self.failed = []
+        total = len(self.manifest)
+
+        self._make_folders()
+
+        def _done(item: MoveItem) -> None:
+            self.stats.files += 1
+            self.stats.bytes += item.size
+            if item.exists:
+                self.stats.replaced += 1
+            else:
+                self.stats.new += 1
+            if self.delta and item.hash is not None:
+                self._manifest(item).update(item.target, item.hash)
+            if progress is not None:
+                progress((self.stats.files + self.stats.failed + self.stats.skipped) / total)
+
+        def _failed(item: MoveItem, error: Exception) -> None:
+            log.warning(f"Failed moving file {str(item.source)!r} to {str(item.target)!r}: {error}")
+            self.stats.failed += 1
+            self.failed.append(item)
+            if progress is not None:
+                progress((self.stats.files + self.stats.failed + self.stats.skipped) / total)
+
+        to_move = self._skip_unchanged(progress=progress, total=total) if self.delta else self.manifest
+
+        to_copy: List[MoveItem] = []
+        for item in to_move:
+            if not self._same_volume(item):
+                to_copy.append(item)
+                continue
+            try:
+                os.replace(item.source, item.target)
+                self.stats.renamed += 1
+                _done(item)
+            except OSError:
+                # Not the same volume after all (e.g. a network share with the same device id),
+                # or the target is locked. The copy handles both cases.
+                to_copy.append(item)
+
+        if to_copy:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending: Dict[Future, MoveItem] = {
+                    executor.submit(self._copy, item): item for item in to_copy
+                }
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        item = pending.pop(future)
+                        if (error := future.exception()) is not None:
+                            _failed(item, error)  # type: ignore
+                        else:
+                            self.stats.copied += 1
+                            if self.copier is not None and self.copier.applies(item.size):
+                                self.stats.chunked += 1
+                            _done(item)
+
+        for manifest in self._manifests.values():
+            manifest.save()
+
+        self.stats.seconds = time.perf_counter() - start_time
+        log.info(
+            f"Moved {self.stats.files} of {len(to_move)} file(s) ({self.stats.bytes / 1e6:.2f} MB) in "
+            f"{self.stats.seconds:.2f}s ({self.stats.throughput / 1e6:.2f} MB/s): "
+            f"{self.stats.renamed} renamed, {self.stats.copied} copied ({self.stats.chunked} chunked), "
+            f"{self.stats.failed} failed, {self.stats.skipped} skipped (unchanged), "
+            f"{self.stats.folders} folder(s) created."
+        )
+        if self.delta:
+            log.info(f"Delta sync: {self.stats.summary}")
+        return self.stats
+
+    def _skip_unchanged(self, progress: Callable[[float], None] | None, total: int) -> List[MoveItem]:
+        """
+        Removes all files from the source, that are identical at the target. Files that can't be
+        compared (e.g. an unreadable target) must be moved, errors are left to the move.
+
+        Returns:
+            List[MoveItem]: The items that must be moved.
+        """
+
+        def _compare(item: MoveItem) -> bool:
+            # Returns True if the item is identical at the target. The hash of the source is
+            # always required, it's written to the manifest after the move.
+            try:
+                item.hash = file_hash(item.source)
+                target_stat = os.stat(item.target)
+            except FileNotFoundError:
+                return False
+            except OSError as e:
+                # The move itself handles the error (e.g. a locked source).
+                log.warning(f"Failed comparing {str(item.source)!r} with its target: {e}")
+                item.hash = None
+                return False
+            item.exists = True
+            if target_stat.st_size != item.size:
+                return False
+            try:
+                return self._manifest(item).target_hash(item.target, target_stat) == item.hash
+            except OSError as e:
+                log.warning(f"Failed reading the target {str(item.target)!r}, replacing it: {e}")
+                return False
+
+        # The manifests must exist before the threads access them.
+        for item in self.manifest:
+            self._manifest(item)
+
+        to_move: List[MoveItem] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for item, unchanged in zip(self.manifest, executor.map(_compare, self.manifest)):
+                if not unchanged:
+                    to_move.append(item)
+                    continue
+                try:
+                    os.remove(item.source)
+                except OSError as e:
+                    # The file is identical at the target, there's nothing to retry.
+                    log.warning(f"Failed removing the unchanged file {str(item.source)!r}: {e}")
+                self.stats.skipped += 1
+                self.stats.saved_bytes += item.size
+                if progress is not None:
+                    progress(self.stats.skipped / total)
+        return to_move
+
+    def _copy(self, item: MoveItem) -> None:
+        """Moves the item to another volume. Runs in a thread of the pool."""
+        if self.copier is not None and self.copier.applies(item.size):
+            self.copier.copy(item.source, item.target)
+            os.remove(item.source)
+        else:
+            shutil.move(item.source, item.target)
+
+    def _manifest(self, item: MoveItem) -> TargetManifest:
+        """Returns the (cached) manifest of the target folder of the item."""
+        root = item.root or item.target.parent
+        if root not in self._manifests:
+            self._manifests[root] = TargetManifest(root)
+        return self._manifests[root]
+
+    def _make_folders(self) -> None:
+        """Creates every missing target folder of the manifest once."""
+        for folder in sorted({item.target.parent for item in self.manifest}):
+            if not os.path.isdir(folder):
+                os.makedirs(folder, exist_ok=True)
+                self.stats.folders += 1
+
+    def _same_volume(self, item: MoveItem) -> bool:
+        """Returns wether the source and the target folder of the item are on the same volume."""
+        return self._device(item.source.parent) == self._device(item.target.parent)
+
+    def _device(self, folder: Path) -> int:
+        """Returns the (cached) device id of the folder."""
+        if folder not in self._devices:
+            self._devices[folder] = os.stat(folder).st_dev
+        return self._devices[folder]
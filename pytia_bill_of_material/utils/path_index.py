@@ -0,0 +1,228 @@
+"""
+    Path index submodule. Persists the paths of the product tree between runs.
+
+    Important: Don't import pycatia here. The index only relies on the product protocol, so it
+    can be tested against a fake tree.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Set
+
+from const import CAD_SUFFIXES
+from const import PATH_INDEX
+from models.paths import Paths
+from protocols.product_protocol import ProductProtocol
+from pytia.log import log
+from utils.tree import index_product_tree
+
+
+class PathIndex:
+    """
+    The persistent path index of a root document.
+
+    Stores the path, the size, the modification time and the children of every item of the
+    product tree. The index is stored as json file in the appdata folder, one file per root
+    document.
+    """
+
+    VERSION = 1
+
+    def __init__(self, root_path: Path, folder: Path = PATH_INDEX) -> None:
+        """
+        Inits the index. Reads the index file of the root document, if it exists.
+
+        Args:
+            root_path (Path): The path of the root document.
+            folder (Path, optional): The folder of the index files. Defaults to PATH_INDEX.
+        """
+        self.root_path = root_path
+        key = hashlib.blake2b(str(root_path).lower().encode("utf8"), digest_size=8).hexdigest()
+        self.path = Path(folder, f"{root_path.stem}.{key}.json")
+        self.records: Dict[str, dict] = {}
+
+        if self.path.is_file():
+            try:
+                with open(self.path, "r", encoding="utf8") as f:
+                    content = json.load(f)
+                if content.get("version") == self.VERSION and content.get("root") == str(root_path):
+                    self.records = content["items"]
+            except Exception as e:  # pylint: disable=broad-except
+                log.warning(f"Ignored corrupted path index {str(self.path)!r}: {e}")
+
+    def changed(self) -> Set[str]:
+        """Returns the part numbers of all items whose file has changed since the last run."""
+        changed: Set[str] = set()
+        for partnumber, record in self.records.items():
+            try:
+                stat = os.stat(record["path"])
+            except OSError:
+                changed.add(partnumber)
+                continue
+            if stat.st_mtime_ns != record["mtime_ns"] or stat.st_size != record["size"]:
+                changed.add(partnumber)
+        return changed
+
+    def dirty(self, changed: Set[str]) -> Set[str]:
+        """
+        Returns the part numbers of all products that must be traversed again: Products whose
+        file has changed, or with a child whose file has changed (its part number may have
+        changed).
+        """
+        return {
+            partnumber
+            for partnumber, record in self.records.items()
+            if record["children"] and (partnumber in changed or changed.intersection(record["children"]))
+        }
+
+    def paths(self, root_partnumber: str) -> Paths:
+        """Returns the paths of all items, that can be reached from the root."""
+        paths = Paths()
+        stack = [root_partnumber]
+        while stack:
+            partnumber = stack.pop()
+            if partnumber in paths.items or partnumber not in self.records:
+                continue
+            paths.items[partnumber] = Path(self.records[partnumber]["path"])
+            paths.children[partnumber] = list(self.records[partnumber]["children"])
+            stack.extend(reversed(paths.children[partnumber]))
+        return paths
+
+    def update(self, paths: Paths) -> None:
+        """Updates the records of all items of the given paths."""
+        for partnumber, path in paths.items.items():
+            try:
+                stat = os.stat(path)
+                mtime_ns, size = stat.st_mtime_ns, stat.st_size
+            except OSError:
+                # Unsaved or missing files are always traversed again.
+                mtime_ns, size = -1, -1
+            self.records[partnumber] = {
+                "path": str(path),
+                "mtime_ns": mtime_ns,
+                "size": size,
+                "children": paths.children.get(partnumber, []),
+            }
+
+    def save(self, root_partnumber: str) -> None:
+        """Writes the index file. Items that can't be reached from the root are removed."""
+        reachable = self.paths(root_partnumber).items
+        self.records = {k: v for k, v in self.records.items() if k in reachable}
+        try:
+            os.makedirs(self.path.parent, exist_ok=True)
+            with open(self.path, "w", encoding="utf8") as f:
+                json.dump({"version": self.VERSION, "root": str(self.root_path), "items": self.records}, f)
+        except OSError as e:
+            log.warning(f"Failed writing path index {str(self.path)!r}: {e}")
+
+
+def index_product_tree_cached(
+    root: ProductProtocol,
+    index: PathIndex,
+    resolve: Callable[[Path], ProductProtocol | None],
+    unsaved: bool = False,
+) -> Paths:
+    """
+    Indexes the paths of all items of the product tree. Only the products whose files have \
+    changed since the last run are traversed again, all other items are taken from the index.
+
+    Args:
+        root (ProductProtocol): The root product of the tree.
+        index (PathIndex): The persistent index of the root document.
+        resolve (Callable[[Path], ProductProtocol | None]): Returns the reference product of a \
+            document path, or None if the document isn't available. Used to traverse changed \
+            sub-products directly, without traversing the tree above them.
+        unsaved (bool, optional): Whether any open document has unsaved changes (e.g. an \
+            inserted component or a changed part number). Those changes aren't reflected by \
+            the files, the whole tree is traversed. Defaults to False.
+
+    Returns:
+        Paths: The paths of all partnumbers.
+    """
+    start_time = time.perf_counter()
+    root_partnumber = root.part_number
+
+    if root_partnumber not in index.records:
+        log.info("No path index found for this document, indexing the whole tree.")
+        return _index_all(root, index, root_partnumber)
+    if unsaved:
+        log.info("Not using the path index: There are unsaved documents, indexing the whole tree.")
+        return _index_all(root, index, root_partnumber)
+
+    changed = index.changed()
+    dirty = index.dirty(changed)
+    if root_partnumber in changed:
+        dirty.add(root_partnumber)
+
+    clean = set(index.records) - changed - dirty
+    for partnumber in sorted(dirty):
+        if partnumber in clean:
+            # Already traversed as part of another dirty product.
+            continue
+        product = root if partnumber == root_partnumber else resolve(Path(index.records[partnumber]["path"]))
+        if product is None:
+            log.info(f"Document of {partnumber!r} isn't available, indexing the whole tree.")
+            return _index_all(root, index, root_partnumber)
+
+        paths, _ = index_product_tree(product, known=clean)
+        index.update(paths)
+        clean.update(paths.items)
+
+    index.save(root_partnumber)
+    paths = index.paths(root_partnumber)
+    log.info(
+        f"Indexed {len(paths.items)} item(s) from the path index in {time.perf_counter() - start_time:.2f}s "
+        f"({len(changed)} changed file(s), {len(dirty)} product(s) traversed again)."
+    )
+    return paths
+
+
+def _index_all(root: ProductProtocol, index: PathIndex, root_partnumber: str) -> Paths:
+    """Traverses the whole tree and rebuilds the index."""
+    paths, _ = index_product_tree(root)
+    index.records = {}
+    index.update(paths)
+    index.save(root_partnumber)
+    return paths
+
+
+def index_folders(folders: List[Path]) -> Paths:
+    """
+    Indexes the paths of all CATIA parts and products in the folders (recursively). Used when \
+    there's no CATIA tree to traverse, e.g. for external exports in the command line interface.
+
+    The part number of a file is taken from its file name (the same name convention the report \
+    verifies). If a file name exists more than once, the first file found is used.
+
+    Args:
+        folders (List[Path]): The folders to index.
+
+    Returns:
+        Paths: The paths of all partnumbers. The children aren't known and remain empty.
+    """
+    start_time = time.perf_counter()
+    paths = Paths()
+    duplicates = 0
+    for folder in folders:
+        for dirpath, _, filenames in os.walk(folder):
+            for filename in filenames:
+                stem, suffix = os.path.splitext(filename)
+                if suffix.lower() not in CAD_SUFFIXES:
+                    continue
+                if stem in paths.items:
+                    duplicates += 1
+                    log.debug(f"Ignored duplicate file {filename!r} in {dirpath!r}.")
+                    continue
+                paths.items[stem] = Path(dirpath, filename)
+
+    log.info(
+        f"Indexed {len(paths.items)} file(s) in {len(folders)} folder(s) in "
+        f"{time.perf_counter() - start_time:.2f}s ({duplicates} duplicate(s) ignored)."
+    )
+    return paths
@@ -0,0 +1,97 @@
+"""
+    Tree submodule. Traverses the CATIA product tree.
+
+    Important: Don't import pycatia here. The traversal only relies on the product protocol,
+    so it can be tested against a fake tree.
+"""
+
+from pathlib import Path
+from typing import Iterator
+from typing import List
+from typing import Set
+from typing import Tuple
+
+from models.paths import Paths
+from models.paths import TreeStats
+from protocols.product_protocol import ProductProtocol
+from pytia.log import log
+from utils.log_queue import LazyMessage
+
+
+def index_product_tree(root: ProductProtocol, known: Set[str] | None = None) -> Tuple[Paths, TreeStats]:
+    """
+    Indexes the paths of all items of the product tree.
+
+    The tree is traversed iteratively. Each reference product is read only once: If the same
+    part number occurs again (e.g. a sub-assembly that is used multiple times), the instance
+    is counted, but its subtree isn't traversed again. The unique part numbers of the children
+    of every indexed item are stored in `Paths.children`.
+
+    Args:
+        root (ProductProtocol): The root product of the tree.
+        known (Set[str] | None, optional): Part numbers that are already indexed elsewhere \
+            (e.g. in the persistent path index). They are treated like reused items: Their \
+            subtree isn't traversed and they aren't added to the paths. Defaults to None.
+
+    Returns:
+        Tuple[Paths, TreeStats]: The paths of all partnumbers and the traversal statistics.
+    """
+    paths = Paths()
+    stats = TreeStats()
+    known = known or set()
+
+    root_partnumber = root.part_number
+    paths.items[root_partnumber] = Path(root.full_name)
+    paths.children[root_partnumber] = []
+    stats.references += 1
+
+    # The stack holds the part number and the children iterator of each product on the current
+    # path, which gives the same (depth-first) order as a recursive traversal.
+    stack: List[Tuple[str, Iterator[ProductProtocol]]] = [(root_partnumber, _children(root))]
+    while stack:
+        parent_partnumber, children = stack[-1]
+        try:
+            current_product = next(children, None)
+        except Exception as e:  # pylint: disable=broad-except
+            log.warning(f"Skipped the remaining children of an item: {e}")
+            current_product = None
+        if current_product is None:
+            stack.pop()
+            continue
+
+        stats.nodes += 1
+        try:
+            # If there are items in the tree that aren't parts or products the
+            # reference product cannot be fetched. Those are skipped.
+            partnumber = current_product.part_number
+            if partnumber not in paths.children[parent_partnumber]:
+                paths.children[parent_partnumber].append(partnumber)
+            if partnumber in paths.items or partnumber in known:
+                stats.reused += 1
+                continue
+
+            paths.items[partnumber] = Path(current_product.full_name)
+            paths.children[partnumber] = []
+            stats.references += 1
+            # The item name is a COM call, it's only read if debug logging is enabled.
+            item, path = current_product, paths.items[partnumber]
+            log.debug(LazyMessage(lambda: f"Indexed item {item.name!r} to {str(path)!r}."))  # pylint: disable=W0640
+        except Exception as e:  # pylint: disable=broad-except
+            stats.failed += 1
+            log.warning(f"Skipped adding item {current_product.name!r} to paths: {e}")
+            continue
+
+        stack.append((partnumber, _children(current_product)))
+
+    log.info(
+        f"Indexed {stats.references} unique item(s) of {stats.nodes} node(s) in the tree "
+        f"({stats.reused} reused, {stats.failed} skipped)."
+    )
+    return paths, stats
+
+
+def _children(product: ProductProtocol) -> Iterator[ProductProtocol]:
+    """Yields the child instances of the product."""
+    products = product.products
+    for i in range(1, products.count + 1):
+        yield products.item(i)
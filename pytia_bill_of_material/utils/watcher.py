@@ -0,0 +1,277 @@
+"""
+    Watcher submodule. Watches a folder for new or changed files.
+
+    The change notifications of Windows (ReadDirectoryChangesW) are used if they are available,
+    otherwise (or if the folder doesn't support them, e.g. some network shares) the folder is
+    polled.
+"""
+
+import fnmatch
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Tuple
+
+from protocols.watcher_protocol import WatcherProtocol
+from pytia.log import log
+
+NOTIFY_BUFFER = 64 * 1024
+# See the FILE_ACTION_* constants of ReadDirectoryChangesW.
+NOTIFY_ACTIONS = (1, 3, 5)  # Added, modified, renamed (new name)
+
+
+def matches(name: str, patterns: List[str]) -> bool:
+    """Returns wether the file name matches any of the patterns (case insensitive)."""
+    return any(fnmatch.fnmatch(name.lower(), p.lower()) for p in patterns)
+
+
+class PollingWatcher:
+    """Watches the folder by comparing the size and the modification time of its files."""
+
+    def __init__(self, folder: Path, patterns: List[str], interval: float = 1.0) -> None:
+        """
+        Inits the watcher. The first call of `changes` returns all existing files.
+
+        Args:
+            folder (Path): The folder to watch (not recursive).
+            patterns (List[str]): The file name patterns to watch, e.g. `*.xls`.
+            interval (float, optional): The polling interval in seconds. Defaults to 1.0.
+        """
+        self.folder = folder
+        self.patterns = patterns
+        self.interval = interval
+        self._snapshot: Dict[Path, Tuple[int, int]] = {}
+        self._next_scan = 0.0
+
+    def scan(self) -> Dict[Path, Tuple[int, int]]:
+        """Returns the size and the modification time of all matching files."""
+        files: Dict[Path, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if not matches(entry.name, self.patterns):
+                        continue
+                    try:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            files[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError as e:
+            log.warning(f"Failed scanning folder {str(self.folder)!r}: {e}")
+        return files
+
+    def changes(self, timeout: float) -> Set[Path]:
+        """
+        Returns the files that have been added or changed since the last call. Blocks at most \
+            `timeout` seconds.
+        """
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+
+        self._next_scan = time.monotonic() + self.interval
+        snapshot = self.scan()
+        changed = {path for path, state in snapshot.items() if self._snapshot.get(path) != state}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+
+class NotifyWatcher:
+    """
+    Watches the folder with the change notifications of Windows. The notifications are read \
+        in a background thread. If reading fails, the watcher falls back to polling.
+    """
+
+    def __init__(self, folder: Path, patterns: List[str], interval: float = 1.0) -> None:
+        """
+        Inits the watcher. The first call of `changes` returns all existing files.
+
+        Args:
+            folder (Path): The folder to watch (not recursive).
+            patterns (List[str]): The file name patterns to watch, e.g. `*.xls`.
+            interval (float, optional): The polling interval of the fallback. Defaults to 1.0.
+
+        Raises:
+            Exception: Raised when the folder can't be opened for notifications.
+        """
+        import win32con  # pylint: disable=C0415
+        import win32file  # pylint: disable=C0415
+
+        self.folder = folder
+        self.patterns = patterns
+        self._win32file = win32file
+        self._handle = win32file.CreateFile(
+            str(folder),
+            0x0001,  # FILE_LIST_DIRECTORY
+            win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+            None,
+            win32con.OPEN_EXISTING,
+            win32con.FILE_FLAG_BACKUP_SEMANTICS,
+            None,
+        )
+        self._filter = (
+            win32con.FILE_NOTIFY_CHANGE_FILE_NAME
+            | win32con.FILE_NOTIFY_CHANGE_SIZE
+            | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        # The polling watcher is used for full scans: At startup, after a buffer overflow of the
+        # notifications and as fallback.
+        self._polling = PollingWatcher(folder, patterns, interval=interval)
+        self._fallback = False
+        self._closed = False
+        self._queue: queue.Queue[Path | None] = queue.Queue()
+        self._queue.put(None)
+        threading.Thread(target=self._read, name="folder-watcher", daemon=True).start()
+
+    def _read(self) -> None:
+        """Reads the notifications. `None` in the queue requests a full scan."""
+        while not self._closed:
+            try:
+                results = self._win32file.ReadDirectoryChangesW(
+                    self._handle, NOTIFY_BUFFER, False, self._filter, None, None
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                if not self._closed:
+                    log.warning(f"Failed reading change notifications, falling back to polling: {e}")
+                    self._fallback = True
+                    self._queue.put(None)
+                return
+
+            if not results:
+                # The buffer has overflowed, the changes are lost.
+                self._queue.put(None)
+                continue
+            for action, name in results:
+                if action in NOTIFY_ACTIONS and matches(name, self.patterns):
+                    self._queue.put(Path(self.folder, name))
+
+    def changes(self, timeout: float) -> Set[Path]:
+        """
+        Returns the files that have been added or changed since the last call. Blocks at most \
+            `timeout` seconds.
+        """
+        if self._fallback and self._queue.empty():
+            return self._polling.changes(timeout)
+
+        try:
+            items = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return set()
+        while not self._queue.empty():
+            items.append(self._queue.get_nowait())
+
+        changed = {item for item in items if item is not None}
+        if None in items:
+            changed.update(self._polling.scan())
+        return changed
+
+    def close(self) -> None:
+        """Closes the folder handle."""
+        self._closed = True
+        try:
+            self._handle.Close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+
+def create_watcher(
+    folder: Path,
+    patterns: List[str],
+    interval: float = 1.0,
+    polling: bool = False,
+) -> WatcherProtocol:
+    """
+    Returns the watcher for the folder: Uses change notifications if available, polling otherwise.
+
+    Args:
+        folder (Path): The folder to watch (not recursive).
+        patterns (List[str]): The file name patterns to watch, e.g. `*.xls`.
+        interval (float, optional): The polling interval in seconds. Defaults to 1.0.
+        polling (bool, optional): Always uses polling. Defaults to False.
+
+    Returns:
+        WatcherProtocol: The watcher.
+    """
+    if not polling:
+        try:
+            watcher = NotifyWatcher(folder, patterns, interval=interval)
+            log.info(f"Watching {str(folder)!r} with change notifications.")
+            return watcher
+        except Exception as e:  # pylint: disable=broad-except
+            log.warning(f"Change notifications aren't available for {str(folder)!r}, using polling: {e}")
+
+    log.info(f"Watching {str(folder)!r} with polling (every {interval:.1f}s).")
+    return PollingWatcher(folder, patterns, interval=interval)
+
+
+class Debouncer:
+    """
+    Holds back files until they are completely written: Their size and modification time \
+        haven't changed for `settle` seconds, and they can be opened for writing (the writing \
+        application doesn't lock them anymore).
+    """
+
+    def __init__(self, settle: float = 2.0) -> None:
+        """
+        Inits the debouncer.
+
+        Args:
+            settle (float, optional): The time in seconds a file must not change. Defaults to 2.0.
+        """
+        self.settle = settle
+        # Path -> (time of detection, (size, mtime), time of the last change)
+        self._pending: Dict[Path, Tuple[float, Tuple[int, int], float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, paths: Set[Path], now: float) -> None:
+        """Adds new or changed files. Changes of pending files restart their settle time."""
+        for path in paths:
+            detected = self._pending[path][0] if path in self._pending else now
+            self._pending[path] = (detected, (-1, -1), now)
+
+    def ready(self, now: float) -> List[Tuple[Path, float]]:
+        """
+        Returns the files that are completely written, with their time of detection. Those \
+            are removed from the debouncer. Deleted files are dropped.
+        """
+        ready: List[Tuple[Path, float]] = []
+        for path, (detected, state, changed) in list(self._pending.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+
+            current = (stat.st_size, stat.st_mtime_ns)
+            if current != state:
+                self._pending[path] = (detected, current, now)
+                continue
+            if now - changed < self.settle or not self._is_unlocked(path):
+                continue
+
+            del self._pending[path]
+            ready.append((path, detected))
+        return ready
+
+    @staticmethod
+    def _is_unlocked(path: Path) -> bool:
+        """Returns wether the file can be opened for writing. Doesn't change the file."""
+        try:
+            with open(path, "ab"):
+                return True
+        except OSError:
+            return False
@@ -0,0 +1,302 @@
+"""
+    Batch Task: Processes an external bill of material export without CATIA and without the UI.
+"""
+
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import List
+from typing import Literal
+
+from const import APP_VERSION
+from const import ExitCode
+from const import Status
+from models.batch import BatchFailedItem
+from models.batch import BatchOptions
+from models.batch import BatchResult
+from openpyxl import load_workbook
+from protocols.task_protocol import TaskProtocol
+from pytia.exceptions import PytiaLanguageError
+from pytia.log import log
+from pytia_ui_tools.handlers.workspace_handler import Workspace
+from resources import resource
+from utils.path_index import index_folders
+
+from .make_report import MakeReportTask
+from .process_bom import ProcessBomTask
+from .save_bom import SaveBomTask
+
+# The options of the batch run, set for each worker process (see `init_worker`).
+_options: BatchOptions | None = None
+
+
+class BatchTask(TaskProtocol):
+    """
+    Processes, verifies and saves the bill of material from an external export file (the same \
+        steps as the UI, except for the CATIA export and the item export).
+
+    The paths of the items aren't read from the CATIA tree, they are given with the options \
+        (see `BatchOptions.paths`), or the search folders of the options are indexed for each \
+        export. Filters are enabled unless they are skipped in the options.
+
+    Args:
+        TaskProtocol (_type_): The task runner protocol.
+    """
+
+    __slots__ = ("_source", "_xlsx", "_options", "_result")
+
+    def __init__(self, source: Path, xlsx: Path, options: BatchOptions) -> None:
+        """
+        Inits the task.
+
+        Args:
+            source (Path): The external export file given by the user (xls or xlsx).
+            xlsx (Path): The export file in the xlsx format (the source itself, or its conversion).
+            options (BatchOptions): The options of the batch run.
+        """
+        self._source = source
+        self._xlsx = xlsx
+        self._options = options
+        self._result = BatchResult(input=str(source), status=Status.SKIPPED.value)
+
+    @property
+    def result(self) -> BatchResult:
+        return self._result
+
+    def run(self) -> None:
+        """Runs the task."""
+        log.info(f"Processing external bill of material {self._source.name!r}.")
+        start_time = time.perf_counter()
+
+        language = self._get_language() if self._options.language == "auto" else self._options.language
+        self._result.language = language
+        resource.reset_language()
+        resource.apply_language(language)
+        for filter_element in resource.filters:
+            filter_element.enabled = filter_element.name not in self._options.skip_filters
+
+        # The watch service indexes the search folders for each export: Files may have been added.
+        paths = self._options.paths
+        if paths is None:
+            paths = index_folders(self._options.search_folders)
+
+        process_task = ProcessBomTask(
+            xlsx=self._xlsx,
+            project_number=self._options.project,
+            paths=paths,
+            ignore_prefix_txt=self._options.ignore_prefix_txt,
+            ignore_source_unknown=self._options.ignore_source_unknown,
+        )
+        process_task.run()
+        bom = process_task.bom
+        if bom.summary is None:
+            raise ValueError(f"The export {self._source.name!r} has no summary ('Recapitulation').")
+
+        workspace = Workspace(
+            path=bom.summary.path,
+            filename=resource.settings.files.workspace,
+            allow_outside_workspace=resource.settings.restrictions.allow_outside_workspace,
+        )
+        workspace.read_yaml()
+
+        report_task = MakeReportTask(bom=bom, workspace=workspace)
+        report_task.run()
+
+        self._result.status = report_task.status.value
+        self._result.assemblies = len(bom.assemblies)
+        self._result.items = len(bom.summary.items)
+        self._result.failed_items = [
+            BatchFailedItem(
+                partnumber=item.partnumber,
+                parent=item.parent_partnumber,
+                path=str(item.path) if item.path else None,
+                details={k: v.value for k, v in item.details.items() if v == Status.FAILED},
+            )
+            for item in report_task.report.items
+            if item.status == Status.FAILED
+        ]
+
+        # Like the UI, the bill of material is only saved if the verification has passed.
+        if self._options.save and report_task.status == Status.OK:
+            folder = self._options.output or self._source.parent
+            saved = SaveBomTask.save_bom(
+                bom=bom,
+                folder=folder,
+                filename=self.output_filename(self._source, folder),
+            )
+            self._result.output = [str(p) for p in saved]
+
+        self._result.duration_s = round(time.perf_counter() - start_time, 3)
+        log.info(
+            f"Processed {self._source.name!r} in {self._result.duration_s:.2f}s: "
+            f"{self._result.status.upper()} ({len(self._result.failed_items)} failed item(s))."
+        )
+
+    @staticmethod
+    def output_filename(source: Path, folder: Path) -> str:
+        """
+        Returns the file name (without extension) of the processed bill of material: The name \
+            of the export. If the bill of material isn't saved as separate files (see \
+            `bom.json`) and the file would overwrite the export itself (a xlsx export without \
+            an output folder), the summary name is appended: `<export> (<Summary>)`.
+
+        Args:
+            source (Path): The export given by the user.
+            folder (Path): The folder into which the bill of material is saved.
+
+        Returns:
+            str: The file name without extension.
+        """
+        filename = source.stem
+        if not resource.bom.files.separate and os.path.normcase(
+            Path(folder, f"{filename}.xlsx").resolve()
+        ) == os.path.normcase(source.resolve()):
+            log.info(f"Not overwriting the export {source.name!r}, saving as summary file.")
+            filename = f"{filename} ({resource.bom.files.summary})"
+        return filename
+
+    def _get_language(self) -> Literal["en", "de"]:
+        """
+        Returns the language of the export. The keywords of the first cell ('Bill of Material' or \
+            'Recapitulation') depend on the CATIA UI language.
+
+        Raises:
+            PytiaLanguageError: Raised when the language of the export is not supported.
+
+        Returns:
+            Literal["en", "de"]: The language of the export.
+        """
+        workbook = load_workbook(filename=str(self._xlsx), read_only=True, data_only=True)
+        try:
+            value = str(workbook.worksheets[0].cell(1, 1).value)
+        finally:
+            workbook.close()
+
+        for language, keywords in (("en", resource.keywords.en), ("de", resource.keywords.de)):
+            if value.startswith((keywords.bom, keywords.summary)):
+                log.info(f"Export language is {language!r}.")
+                return language  # type: ignore
+        raise PytiaLanguageError(
+            f"The language of the export {self._source.name!r} is not supported. "
+            "Please export the bill of material either in 'English' or 'German'."
+        )
+
+
+def init_worker(options: BatchOptions, worker: bool = True) -> None:
+    """
+    Initializes a process that runs `process_file`: Sets the options of the batch run.
+
+    Args:
+        options (BatchOptions): The options of the batch run.
+        worker (bool, optional): Whether the process is a worker process of a pool. Worker \
+            processes log to stderr and don't save the appdata. Defaults to True.
+    """
+    global _options  # pylint: disable=W0603
+    _options = options
+    if worker:
+        setup_logging(options.log_level)
+        resource.discard_appdata()
+
+
+def setup_logging(level: int) -> None:
+    """Logs to stderr, stdout is reserved for the json report."""
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-8s %(processName)s: %(message)s"))
+    for existing in list(log.logger.handlers):
+        log.logger.removeHandler(existing)
+    log.logger.addHandler(handler)
+    log.logger.setLevel(level)
+
+
+def process_file(source: Path, xlsx: Path) -> BatchResult:
+    """
+    Processes a single export with the options of the process (see `init_worker`). \
+        Never raises: Errors are stored in the result.
+
+    Args:
+        source (Path): The export given by the user.
+        xlsx (Path): The export in the xlsx format.
+
+    Returns:
+        BatchResult: The result of the export.
+    """
+    start_time = time.perf_counter()
+    try:
+        if _options is None:
+            raise RuntimeError("The process hasn't been initialized, see 'init_worker'.")
+        task = BatchTask(source=source, xlsx=xlsx, options=_options)
+        task.run()
+    except Exception as e:  # pylint: disable=broad-except
+        log.error(f"Failed processing {str(source)!r}: {e}")
+        result = error_result(source, e)
+        result.duration_s = round(time.perf_counter() - start_time, 3)
+        return result
+
+    result = task.result
+    if result.status == Status.FAILED.value:
+        result.exit_code = ExitCode.FAILED.value
+    return result
+
+
+def get_xlsx(export: Path, converted: Path) -> Path:
+    """
+    Returns the export in the xlsx format. Converts xls files with Excel, this can't be done \
+        in parallel.
+
+    Args:
+        export (Path): The export given by the user.
+        converted (Path): The path of the converted file, if the export must be converted.
+
+    Raises:
+        FileNotFoundError: Raised when the export doesn't exist.
+        ValueError: Raised when the export is neither a xls nor a xlsx file.
+
+    Returns:
+        Path: The export in the xlsx format.
+    """
+    if not export.is_file():
+        raise FileNotFoundError(f"Cannot open export at {str(export)!r}: Not found.")
+    if export.suffix.lower() == ".xlsx":
+        return export
+    if export.suffix.lower() == ".xls":
+        from utils.excel import convert_xls_to_xlsx  # pylint: disable=C0415
+
+        return convert_xls_to_xlsx(xls_path=export, xlsx_path=converted)
+    raise ValueError(f"Export {export.name!r} is neither a xls nor a xlsx file.")
+
+
+def error_result(source: Path, error: BaseException) -> BatchResult:
+    """Returns the result of an export that couldn't be processed."""
+    return BatchResult(
+        input=str(source),
+        status="error",
+        exit_code=ExitCode.ERROR.value,
+        error=f"{type(error).__name__}: {error}",
+    )
+
+
+def batch_report(results: List[BatchResult], started: str, duration_s: float) -> dict:
+    """
+    Returns the json report of the results. The status and the exit code are the worst of all \
+        results.
+
+    Args:
+        results (List[BatchResult]): The results of the exports.
+        started (str): The start time (iso format).
+        duration_s (float): The duration of the batch run.
+
+    Returns:
+        dict: The report.
+    """
+    exit_code = max((ExitCode(r.exit_code) for r in results), default=ExitCode.OK)
+    return {
+        "app_version": APP_VERSION,
+        "started": started,
+        "duration_s": round(duration_s, 3),
+        "status": exit_code.name.lower(),
+        "exit_code": exit_code.value,
+        "files": [asdict(r) for r in results],
+    }
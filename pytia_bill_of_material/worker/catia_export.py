@@ -3,18 +3,20 @@
     to a xlsx file.
 """
 
-import os
+import shutil
+from dataclasses import asdict
 from pathlib import Path
 
-from const import EXCEL_EXE
 from helper.lazy_loaders import LazyDocumentHelper
+from helper.resource import ResourceCommons
+from models.paths import Paths
 from protocols.task_protocol import TaskProtocol
-from pytia.exceptions import PytiaConvertError
 from pytia.log import log
 from pytia.utilities.bill_of_material import export_bom
 from pytia_ui_tools.utils.files import file_utility
-from utils.excel import get_excel
-from utils.system import application_is_running
+from resources import resource
+from utils.bom_cache import BomCache
+from utils.excel import convert_xls_to_xlsx
 
 
 class CatiaExportTask(TaskProtocol):
@@ -26,6 +28,9 @@ class CatiaExportTask(TaskProtocol):
 
     All exported data will be deleted at application exit.
 
+    If no file of the product tree has changed since a previous export (and all documents are
+    saved), the converted bill of material is taken from the cache (see `BomCache`).
+
     Args:
         TaskProtocol (_type_): The task runner protocol.
 
@@ -41,16 +46,26 @@ class CatiaExportTask(TaskProtocol):
         doc_helper: LazyDocumentHelper,
         export_root_path: Path,
         external_xls_path: Path | None,
+        paths: Paths | None = None,
+        use_cache: bool = True,
     ) -> None:
         """
         Inits the class.
 
         Args:
             doc_helper (LazyDocumentHelper): The document helper object.
+            export_root_path (Path): The temporary export folder.
+            external_xls_path (Path | None): The external bill of material file.
+            paths (Paths | None, optional): The paths of all items of the product tree. \
+                Required for the cache. Defaults to None.
+            use_cache (bool, optional): Whether to use the cached export of an unchanged product \
+                tree. Defaults to True.
         """
         self.doc_helper = doc_helper
         self.export_root_path = export_root_path
         self.external_xls_path = external_xls_path
+        self.paths = paths
+        self.use_cache = use_cache
 
     @property
     def xls(self) -> Path:
@@ -68,55 +83,49 @@ class CatiaExportTask(TaskProtocol):
         # so we don't do it here again. Maybe change that?
         if self.external_xls_path:
             self._xls = self.external_xls_path
-        else:
-            self._xls = Path(
-                export_bom(
-                    product=self.doc_helper.document.product,
-                    filename=file_utility.get_random_filename(filetype="xls"),
-                    folder=self.export_root_path,
-                )
+            self._xlsx = convert_xls_to_xlsx(xls_path=self._xls)
+            file_utility.add_delete(path=self._xlsx, ask_retry=True)
+            return
+
+        cache = BomCache(Path(self.doc_helper.path))
+        fingerprint = self._fingerprint()
+        if fingerprint and self.use_cache and (cached := cache.get(fingerprint)):
+            log.info("No document has changed since the last export, using the cached bill of material.")
+            self._xls = cached
+            self._xlsx = Path(self.export_root_path, file_utility.get_random_filename(filetype="xlsx"))
+            shutil.copyfile(cached, self._xlsx)
+            file_utility.add_delete(path=self._xlsx, ask_retry=True)
+            return
+
+        self._xls = Path(
+            export_bom(
+                product=self.doc_helper.document.product,
+                filename=file_utility.get_random_filename(filetype="xls"),
+                folder=self.export_root_path,
             )
-            file_utility.add_delete(path=self._xls, ask_retry=True)
+        )
+        file_utility.add_delete(path=self._xls, ask_retry=True)
 
-        self._xlsx = self._convert_xls_to_xlsx(xls_path=self._xls)
+        self._xlsx = convert_xls_to_xlsx(xls_path=self._xls)
         file_utility.add_delete(path=self._xlsx, ask_retry=True)
+        if fingerprint:
+            cache.put(fingerprint, self._xlsx)
 
-    @staticmethod
-    def _convert_xls_to_xlsx(xls_path: Path) -> Path:
+    def _fingerprint(self) -> str | None:
         """
-        Converts the xls file format to the xlsx format. This is done by using the installed Excel
-        application.
-
-        Args:
-            xls_path (Path): The path to the file to convert.
-
-        Raises:
-            FileNotFoundError: Raised when the input path does not exist.
-            PytiaConvertError: Raised when the file cannot be converted (EXCEL save method fails).
-
-        Returns:
-            Path: The path to the converted xlsx file.
+        Returns the fingerprint of the product tree for the cache. Returns None if the cache
+        cannot be used: Unsaved changes in any open document aren't reflected by the files.
         """
-        log.info("Converting bill of material format from 'xls' to 'xlsx'.")
-        xlsx_path = Path(str(xls_path) + "x")
-
-        if not os.path.isfile(xls_path):
-            raise FileNotFoundError(f"Cannot open xls file at {xls_path}: Not found.")
-
-        if os.path.exists(xlsx_path):
-            os.remove(xlsx_path)
-
-        keep_running = application_is_running(EXCEL_EXE)
-
-        excel_dispatch = get_excel()
-        workbook = excel_dispatch.Workbooks.Open(str(xls_path))
-        try:
-            workbook.SaveAs(str(xlsx_path), FileFormat=51)  # 51: Format of xlsx extension
-            log.info(f"Converted bill of material to {str(xlsx_path)!r}.")
-            return xlsx_path
-        except Exception as e:
-            raise PytiaConvertError(f"Failed to convert xls to xlsx: {e}") from e
-        finally:
-            workbook.Close() if keep_running else excel_dispatch.Application.Quit()
-            # Delete the object, otherwise the excel process remains in the task manager.
-            del excel_dispatch
+        if self.paths is None:
+            return None
+
+        if self.doc_helper.has_unsaved_documents():
+            log.info("Not using the bill of material cache: There are unsaved documents.")
+            return None
+
+        return BomCache.fingerprint(
+            paths=self.paths,
+            header_items=ResourceCommons.get_property_names_from_config(resource.bom.header_items.summary),
+            language=resource.language,
+            keywords=asdict(resource.applied_keywords),
+        )
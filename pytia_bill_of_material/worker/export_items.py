@@ -2,7 +2,9 @@
     Exports all items selected by the user. Dockets, STP, STL, ...
 """
 
+import logging
 import os
+from contextlib import ExitStack
 from pathlib import Path
 from shutil import make_archive
 from shutil import rmtree
@@ -16,6 +18,7 @@ from const import DOCUMENTATION
 from const import DRAWINGS
 from const import JPGS
 from const import LOGON
+from const import LogEvent
 from const import STLS
 from const import STPS
 from const import TEMP_EXPORT
@@ -35,6 +38,8 @@ from pytia_ui_tools.utils.qr import QR
 from resources import resource
 from templates import templates
 from utils import export
+from utils.log_queue import LazyMessage
+from utils.log_summary import LogSummary
 
 from .runner import Runner
 
@@ -96,6 +101,20 @@ class ExportItemsTask(TaskProtocol):
 
         self.workspace = workspace
 
+        self.jpg_session: export.JpgCaptureSession
+        self.summary: LogSummary
+        self.docket_renderer = (
+            export.DocketRenderer(template=templates.docket_path, config=docket_config)
+            if templates.docket_path is not None
+            else None
+        )
+        self.documentation_renderer = (
+            export.DocketRenderer(template=templates.documentation_path, config=documentation_config)
+            if templates.documentation_path is not None
+            else None
+        )
+        self.jpg_views = [(view[0], view[1], view[2]) for view in resource.settings.export.jpg_views]
+
     def run(self) -> None:
         """
         Runs the task.
@@ -114,34 +133,47 @@ class ExportItemsTask(TaskProtocol):
                 self.variables.export_jpg.get(),
             ]
         ):
-            self.lazy_loader.close_all_documents()
-            complete_items: Dict[PartnumberString, BOMAssemblyItem] = {}
-
-            # The following 'solution' is required to export all assemblies,
-            # even those that don't show in the summary of the CATIA BOM.
-            # It's not possible to only use all items of the bom.assemblies
-            # object, because this would result in false quantities.
-            # Therefor it's a must to compare those list object with great
-            # care.
-            for summary_item in self.bom.summary.items:
-                complete_items[summary_item.partnumber] = summary_item
-
-                for assembly in self.bom.assemblies:
-                    for assembly_item in assembly.items:
-                        if not assembly_item.partnumber in complete_items:
-                            complete_items[assembly_item.partnumber] = assembly_item
-
-            for partnumber, item in complete_items.items():
-                if not resource.applied_keywords.source in item.properties:
-                    raise Exception(f"Keyword {resource.applied_keywords.source!r} not in bill of material.")
-                if item.properties[resource.applied_keywords.source] == resource.applied_keywords.made:
-                    self.runner.add(
-                        func=self._export_item,
-                        name=f"Export item {partnumber!r}",
-                        bom_item=item,
-                    )
-
-            self.runner.run_tasks()
+            # The jpg viewer state is restored and the docket templates are loaded once for
+            # the whole run. The initial viewer state is read from the user's window, before
+            # it's closed. The export of each item is counted, not logged (depends on the
+            # settings).
+            with ExitStack() as stack:
+                self.jpg_session = export.JpgCaptureSession(bg=(1, 1, 1))
+                self.jpg_session.start()
+                stack.callback(self.jpg_session.close)
+                self.lazy_loader.close_all_documents()
+                complete_items: Dict[PartnumberString, BOMAssemblyItem] = {}
+
+                # The following 'solution' is required to export all assemblies,
+                # even those that don't show in the summary of the CATIA BOM.
+                # It's not possible to only use all items of the bom.assemblies
+                # object, because this would result in false quantities.
+                # Therefor it's a must to compare those list object with great
+                # care.
+                for summary_item in self.bom.summary.items:
+                    complete_items[summary_item.partnumber] = summary_item
+
+                    for assembly in self.bom.assemblies:
+                        for assembly_item in assembly.items:
+                            if not assembly_item.partnumber in complete_items:
+                                complete_items[assembly_item.partnumber] = assembly_item
+
+                for partnumber, item in complete_items.items():
+                    if not resource.applied_keywords.source in item.properties:
+                        raise Exception(f"Keyword {resource.applied_keywords.source!r} not in bill of material.")
+                    if item.properties[resource.applied_keywords.source] == resource.applied_keywords.made:
+                        self.runner.add(
+                            func=self._export_item,
+                            name=f"Export item {partnumber!r}",
+                            bom_item=item,
+                        )
+
+                self.summary = stack.enter_context(LogSummary("export_items"))
+                self.summary.begin("Item export")
+                for renderer in (self.docket_renderer, self.documentation_renderer):
+                    if renderer is not None:
+                        stack.callback(renderer.close)
+                self.runner.run_tasks()
             log.info("Finished item export.")
         else:
             log.info("Skipping item export: None selected.")
@@ -194,10 +226,14 @@ class ExportItemsTask(TaskProtocol):
             PytiaWrongDocumentTypeError: Raised when the BOM item is neither a part nor a product.
         """
         if bom_item.path is None:
-            log.warning(f"Skipped export of item {bom_item.partnumber!r}: Path of item not found.")
+            self.summary.count(
+                LogEvent.WARNING,
+                LazyMessage(lambda: f"Skipped export of item {bom_item.partnumber!r}: Path of item not found."),
+                level=logging.WARNING,
+            )
             return
 
-        log.info(f"Exporting data of item {bom_item.partnumber!r}.")
+        self.summary.count(LogEvent.ITEM, LazyMessage(lambda: f"Exporting data of item {bom_item.partnumber!r}."))
 
         bundle = self.variables.bundle.get()
 
@@ -212,7 +248,13 @@ class ExportItemsTask(TaskProtocol):
         if self.variables.bundle_by_prop_value.get() in bom_item.properties:
             bundle_prop = bom_item.properties[self.variables.bundle_by_prop_value.get()]
         else:
-            log.warning("Cannot bundle by property " f"{self.variables.bundle_by_prop_txt.get()!r}: Doesn't exist.")
+            self.summary.count(
+                LogEvent.WARNING,
+                LazyMessage(
+                    lambda: f"Cannot bundle by property {self.variables.bundle_by_prop_txt.get()!r}: Doesn't exist."
+                ),
+                level=logging.WARNING,
+            )
             bundle_prop = ""
 
         if self.variables.bundle_by_prop.get() and len(bundle_prop) > 0:
@@ -242,6 +284,7 @@ class ExportItemsTask(TaskProtocol):
                         folder=docu_path,
                         document=part_document,
                         config=self.documentation_config,
+                        renderer=self.documentation_renderer,
                         project=bom_item.properties[resource.bom.required_header_items.project],
                         product=bom_item.properties[resource.bom.required_header_items.product],
                         partnumber=bom_item.properties[resource.bom.required_header_items.partnumber],
@@ -256,6 +299,7 @@ class ExportItemsTask(TaskProtocol):
                         folder=docket_path,
                         document=part_document,
                         config=self.docket_config,
+                        renderer=self.docket_renderer,
                         project=bom_item.properties[resource.bom.required_header_items.project],
                         product=bom_item.properties[resource.bom.required_header_items.product],
                         partnumber=bom_item.properties[resource.bom.required_header_items.partnumber],
@@ -283,12 +327,10 @@ class ExportItemsTask(TaskProtocol):
                         document=part_document,
                     )
                 if self.variables.export_jpg.get():
-                    views = [(view[0], view[1], view[2]) for view in resource.settings.export.jpg_views]
-                    export.export_jpg(
+                    self.jpg_session.capture(
                         filename=export_filename,
                         folder=jpg_path,
-                        views=views,
-                        bg=(1, 1, 1),
+                        views=self.jpg_views,
                     )
 
         elif ".CATProduct" in str(bom_item.path):
@@ -302,6 +344,7 @@ class ExportItemsTask(TaskProtocol):
                         folder=docu_path,
                         document=product_document,
                         config=self.documentation_config,
+                        renderer=self.documentation_renderer,
                         project=bom_item.properties[resource.bom.required_header_items.project],
                         product=bom_item.properties[resource.bom.required_header_items.product],
                         partnumber=bom_item.properties[resource.bom.required_header_items.partnumber],
@@ -316,6 +359,7 @@ class ExportItemsTask(TaskProtocol):
                         folder=docket_path,
                         document=product_document,
                         config=self.docket_config,
+                        renderer=self.docket_renderer,
                         project=bom_item.properties[resource.bom.required_header_items.project],
                         quantity=bom_item.properties[resource.bom.required_header_items.quantity],
                         logon=LOGON,
@@ -335,12 +379,10 @@ class ExportItemsTask(TaskProtocol):
                         document=product_document,
                     )
                 if self.variables.export_jpg.get():
-                    views = [(view[0], view[1], view[2]) for view in resource.settings.export.jpg_views]
-                    export.export_jpg(
+                    self.jpg_session.capture(
                         filename=export_filename,
                         folder=jpg_path,
-                        views=views,
-                        bg=(1, 1, 1),
+                        views=self.jpg_views,
                     )
 
         else:
@@ -0,0 +1,215 @@
+"""
+    Submodule for the export queue: Exporting the data of several products in one session.
+"""
+
+import time
+from pathlib import Path
+from tkinter import DISABLED
+from tkinter import Tk
+from tkinter import messagebox as tkmsg
+from typing import List
+
+from app.main.frames import Frames
+from app.main.layout import Layout
+from app.main.ui_setter import UISetter
+from app.main.vars import Variables
+from const import Status
+from helper.lazy_loaders import LazyDocumentHelper
+from helper.names import get_bom_export_name
+from models.export_queue import QueueItem
+from models.export_queue import QueueSummary
+from pytia.exceptions import PytiaPropertyNotFoundError
+from pytia.log import log
+from pytia_ui_tools.handlers.workspace_handler import Workspace
+from pytia_ui_tools.utils.files import file_utility
+from resources import resource
+from utils.excel import ExcelSession
+
+from .main_task import MainTask
+
+
+class ExportQueueTask:
+    """
+    Exports the given products one after another (see `MainTask`), with the settings of the \
+        main window. Only the product number and the name of the bill of material file are \
+        taken from each product.
+
+    Everything that has been loaded for the first export is reused for all products of the \
+        queue: The resources, templates, the connections to CATIA and Excel, and the path and \
+        bill of material caches. A combined summary is shown when the queue has finished.
+    """
+
+    def __init__(
+        self,
+        main_ui: Tk,
+        layout: Layout,
+        ui_setter: UISetter,
+        doc_helper: LazyDocumentHelper,
+        variables: Variables,
+        frames: Frames,
+        workspace: Workspace,
+        paths: List[Path],
+    ) -> None:
+        """
+        Inits the export queue.
+
+        Args:
+            main_ui (Tk): The main window.
+            layout (Layout): The layout of the main window.
+            ui_setter (UISetter): The ui setter for the main window.
+            doc_helper (LazyDocumentHelper): The doc helper object.
+            variables (Variables): The main windows variables.
+            frames (Frames): The main windows frames.
+            workspace (Workspace): The workspace instance. All products must be in this workspace.
+            paths (List[Path]): The paths of the products to export.
+        """
+        self.main_ui = main_ui
+        self.layout = layout
+        self.ui_setter = ui_setter
+        self.doc_helper = doc_helper
+        self.variables = variables
+        self.frames = frames
+        self.workspace = workspace
+        self.paths = paths
+
+        self.summary = QueueSummary()
+        self._origin = doc_helper.path
+        self._cancelled = False
+
+    def run(self) -> None:
+        """Runs the queue."""
+        log.info(f"Running export queue with {len(self.paths)} product(s).")
+        self.ui_setter.working()
+        start_time = time.perf_counter()
+
+        product = self.variables.product.get()
+        bom_export_path = self.variables.bom_export_path.get()
+        bom_folder = Path(bom_export_path).parent
+        # The external bill of material belongs to the current product only.
+        external_bom_path = self.variables.external_bom_path.get()
+        self.variables.external_bom_path.set("")
+
+        try:
+            with ExcelSession():
+                for index, path in enumerate(self.paths, start=1):
+                    item = QueueItem(path=path)
+                    self.summary.items.append(item)
+                    if self._cancelled:
+                        item.cancelled = True
+                        continue
+
+                    log.info(f"Exporting product {index} of {len(self.paths)}: {path.name!r}.")
+                    item_start_time = time.perf_counter()
+                    try:
+                        self._export(item=item, bom_folder=bom_folder)
+                    except Exception as e:  # pylint: disable=broad-except
+                        log.error(f"Failed exporting {path.name!r}: {e}")
+                        item.error = str(e)
+                    item.seconds = time.perf_counter() - item_start_time
+                    log.info(f"Finished exporting {path.name!r} in {item.seconds:.2f}s: {item.result}.")
+        finally:
+            # The main window must be usable again, even if the queue itself has failed.
+            self.summary.seconds = time.perf_counter() - start_time
+            self.variables.product.set(product)
+            self.variables.bom_export_path.set(bom_export_path)
+            self.variables.external_bom_path.set(external_bom_path)
+            self.variables.refresh_bom.set(False)
+            try:
+                self.doc_helper.load(self._origin)
+            finally:
+                self.ui_setter.normal()
+
+        self._show_summary()
+
+    def _export(self, item: QueueItem, bom_folder: Path) -> None:
+        """
+        Exports a single product of the queue.
+
+        Args:
+            item (QueueItem): The queue item of the product, stores the result.
+            bom_folder (Path): The folder of the bill of material file.
+
+        Raises:
+            ValueError: Raised when the product isn't in the workspace of the main window.
+            PytiaPropertyNotFoundError: Raised when the product has no product number.
+        """
+        opened = item.path.name not in self.doc_helper.get_all_open_documents()
+        self.doc_helper.load(item.path)
+
+        workspace = Workspace(
+            path=self.doc_helper.path,
+            filename=resource.settings.files.workspace,
+            allow_outside_workspace=resource.settings.restrictions.allow_outside_workspace,
+        )
+        workspace.read_yaml()
+        if workspace.workspace_folder != self.workspace.workspace_folder:
+            raise ValueError("The product is not in the workspace of the current document.")
+
+        if (product := self.doc_helper.get_property(name=resource.props.product)) is None:
+            raise PytiaPropertyNotFoundError(
+                f"Cannot find required property {resource.props.product!r} in the main product."
+            )
+        self.variables.product.set(product)
+        self.variables.bom_export_path.set(
+            str(
+                Path(
+                    bom_folder,
+                    get_bom_export_name(
+                        workspace=self.workspace,
+                        project=self.variables.project.get(),
+                        product=product,
+                    ),
+                )
+            )
+        )
+        # The traces of the path variables enable the export, the queue is still running.
+        self.layout.button_export.configure(state=DISABLED)
+        self.layout.tools_menu.entryconfig(Layout.MENU_EXPORT_QUEUE, state=DISABLED)
+
+        task = MainTask(
+            main_ui=self.main_ui,
+            layout=self.layout,
+            ui_setter=self.ui_setter,
+            doc_helper=self.doc_helper,
+            variables=self.variables,
+            frames=self.frames,
+            workspace=self.workspace,
+            queued=True,
+        )
+        task.run()
+
+        item.status = task.status
+        item.cancelled = task.cancelled
+        item.all_moved = file_utility.all_moved
+        item.move_stats = task.move_stats
+        item.report = self.variables.report if task.status == Status.FAILED else None
+        self._cancelled = task.cancelled
+
+        # Documents opened by the queue are closed again, the current document is kept open.
+        if opened and item.path != self._origin:
+            try:
+                self.doc_helper.framework.catia.documents.item(item.path.name).close()
+                log.info(f"Closed document {item.path.name!r}.")
+            except Exception:  # pylint: disable=broad-except
+                log.warning(f"Failed closing document {item.path.name!r}: Maybe it has been already closed.")
+
+    def _show_summary(self) -> None:
+        """Shows the combined summary of all exports. Offers the report of the first failed export."""
+        message = self.summary.text
+        if self.variables.delta_sync.get():
+            message += f"\n\n{self.summary.move_stats.summary}"
+        log.info(message.replace("\n\n", "\n"))
+
+        if failed := self.summary.failed:
+            self.variables.report = failed[0].report  # type: ignore
+            self.variables.show_report.set(
+                tkmsg.askyesno(
+                    title=resource.settings.title,
+                    message=f"{message}\n\nDo you want to open the report of {failed[0].path.stem!r}?",
+                    icon="warning",
+                )
+            )
+        elif len(self.summary.ok) == len(self.summary.items) and all(i.all_moved for i in self.summary.items):
+            tkmsg.showinfo(title=resource.settings.title, message=message)
+        else:
+            tkmsg.showwarning(title=resource.settings.title, message=message)
@@ -12,9 +12,12 @@ from app.main.layout import Layout
 from app.main.ui_setter import UISetter
 from app.main.vars import Variables
 from const import TEMP_EXPORT
+from const import StageResource
 from const import Status
+from const import TaskThread
 from helper.lazy_loaders import LazyDocumentHelper
 from models.bom import BOM
+from models.move import MoveStats
 from models.paths import Paths
 from pytia.log import log
 from pytia.utilities.docket import DocketConfig
@@ -29,6 +32,7 @@ from .move_files import MoveFilesTask
 from .prepare import PrepareTask
 from .process_bom import ProcessBomTask
 from .runner import Runner
+from .scheduler import Scheduler
 from .save_bom import SaveBomTask
 
 
@@ -47,6 +51,7 @@ class MainTask:
         variables: Variables,
         frames: Frames,
         workspace: Workspace,
+        queued: bool = False,
     ):
         """
         Inits the main task class.
@@ -56,6 +61,9 @@ class MainTask:
         - Export runner for handling all file exports.
         - Move runner for releasing all exported files.
 
+        After the bill of material has been processed, saving, exporting and moving run as stages
+        of a scheduler (see `Scheduler`).
+
         Args:
             main_ui (Tk): The main window.
             layout (Layout): The layout of the main window.
@@ -63,6 +71,10 @@ class MainTask:
             doc_helper (LazyDocumentHelper): The doc helper object.
             variables (Variables): The main windows variables.
             frames (Frames): The main windows frames.
+            workspace (Workspace): The workspace instance.
+            queued (bool, optional): Whether the task runs as part of an export queue (see \
+                `ExportQueueTask`). Queued tasks don't show their result and leave the UI in \
+                the working state. Defaults to False.
         """
         self.main_ui = main_ui
         self.layout = layout
@@ -71,8 +83,10 @@ class MainTask:
         self.variables = variables
         self.frames = frames
         self.workspace = workspace
+        self.queued = queued
 
-        self.export_folder = Path(TEMP_EXPORT, datetime.now().strftime("%Y_%m_%d_%H_%M_%S"))
+        # Microseconds: Queued exports may start within the same second.
+        self.export_folder = Path(TEMP_EXPORT, datetime.now().strftime("%Y_%m_%d_%H_%M_%S_%f"))
         self.project = variables.project.get()
         self.status = Status.SKIPPED
         self.xlsx_path: Path
@@ -80,43 +94,77 @@ class MainTask:
         self.docket_cfg: DocketConfig
         self.documentation_cfg: DocketConfig
         self.bom: BOM
+        self.move_stats = MoveStats()
+        self._cancelled = False
+        self._scheduler: Scheduler | None = None
 
         self.runner_main = Runner(
             root=self.main_ui,
             callback_variable=self.variables.progress,
+            eta_variable=self.variables.eta,
         )
         self.runner_item_export = Runner(
             root=self.main_ui,
             callback_variable=self.variables.progress,
+            eta_variable=self.variables.eta,
         )
         self.runner_move_files = Runner(
             root=self.main_ui,
             callback_variable=self.variables.progress,
+            eta_variable=self.variables.eta,
         )
 
         self.runner_main.add(func=self._prepare, name="Prepare Export")
         self.runner_main.add(func=self._catia_export, name="Catia Export")
-        self.runner_main.add(func=self._process_bom, name="Process Bill of Material")
+        self.runner_main.add(
+            func=self._process_bom,
+            name="Process Bill of Material",
+            thread=TaskThread.WORKER,
+            ignore_prefix_txt=(
+                variables.ignore_prefix_txt.get()
+                if len(variables.ignore_prefix_txt.get()) > 0 and variables.ignore_prefix.get()
+                else None
+            ),
+            ignore_source_unknown=variables.ignore_source_unknown.get(),
+        )
         self.runner_main.add(func=self._create_report, name="Create Report")
 
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
     def run(self) -> None:
         """Runs the task."""
-        self.runner_main.run_tasks()
+        # Escape cancels the export, the binding of the main window (close) is restored afterwards.
+        escape_binding = self.main_ui.bind("<Escape>")
+        self.main_ui.bind("<Escape>", self._cancel)
+        try:
+            self.runner_main.run_tasks()
+            if not self._cancelled and self.status == Status.OK:
+                self._run_stages()
+        finally:
+            self.main_ui.unbind("<Escape>")
+            if escape_binding:
+                self.main_ui.bind("<Escape>", escape_binding)
 
-        if self.status == Status.OK:
-            self._save_bom()
-            self._export_items()
-            self._move_files()
+        if self._cancelled:
+            log.info("Export cancelled by the user.")
+        # The export queue shows the combined result of all exports.
+        elif not self.queued:
+            self._show_result()
 
-            if self.doc_helper.name not in self.doc_helper.get_all_open_documents():
-                log.info("Re-opening main document...")
-                self.doc_helper.framework.catia.documents.open(self.doc_helper.path)
+        if not self.queued:
+            self.ui_setter.normal()
 
+    def _show_result(self) -> None:
+        """Shows the result of the export to the user."""
+        if self.status == Status.OK:
+            delta_summary = f"\n\n{self.move_stats.summary}" if self.variables.delta_sync.get() else ""
             if file_utility.all_moved:
                 log.info("Export completed successfully.")
                 tkmsg.showinfo(
                     title=resource.settings.title,
-                    message="Successfully exported the bill of material.",
+                    message=f"Successfully exported the bill of material.{delta_summary}",
                 )
             else:
                 log.info("Export completed with skipped files.")
@@ -124,7 +172,7 @@ class MainTask:
                     title=resource.settings.title,
                     message=(
                         "Finished the export, but not all files have been moved to their target "
-                        "folder.\n\nMaybe you have skipped some files?"
+                        f"folder.\n\nMaybe you have skipped some files?{delta_summary}"
                     ),
                 )
 
@@ -138,11 +186,14 @@ class MainTask:
                 )
             )
 
-        # FIXME: There's a bug in the lazy loader: Du to the performance optimization (closing the
-        # main product while exporting) the document of the lazy loader isn't available anymore.
-        # So, if the user wants to run the export again, the process will fail.
-        # Maybe-solution: Re-instance the lazy loader?
-        self.ui_setter.normal()
+    def _cancel(self, *_) -> None:
+        """Cancels the export. Only tasks and stages that haven't started yet are skipped."""
+        self._cancelled = True
+        self.runner_main.cancel()
+        self.runner_item_export.cancel()
+        self.runner_move_files.cancel()
+        if self._scheduler is not None:
+            self._scheduler.cancel()
 
     def _prepare(self, *_) -> None:
         task = PrepareTask(
@@ -173,22 +224,24 @@ class MainTask:
             doc_helper=self.doc_helper,
             export_root_path=self.export_folder,
             external_xls_path=external_xls_path,
+            paths=self.doc_paths,
+            use_cache=not self.variables.refresh_bom.get(),
         )
         task.run()
+        # The refresh applies to the next export only (to all exports of a queue).
+        if not self.queued:
+            self.variables.refresh_bom.set(False)
 
         self.xlsx_path = task.xlsx
 
-    def _process_bom(self, *_) -> None:
+    def _process_bom(self, ignore_prefix_txt: str | None, ignore_source_unknown: bool) -> None:
+        # Runs on a worker thread: Don't access any tkinter variable here.
         task = ProcessBomTask(
             xlsx=self.xlsx_path,
             project_number=self.project,
             paths=self.doc_paths,
-            ignore_prefix_txt=(
-                self.variables.ignore_prefix_txt.get()
-                if len(self.variables.ignore_prefix_txt.get()) > 0 and self.variables.ignore_prefix.get()
-                else None
-            ),
-            ignore_source_unknown=self.variables.ignore_source_unknown.get(),
+            ignore_prefix_txt=ignore_prefix_txt,
+            ignore_source_unknown=ignore_source_unknown,
         )
         task.run()
 
@@ -201,13 +254,65 @@ class MainTask:
         self.status = task.status
         self.variables.report = task.report
 
-    def _save_bom(self, *_) -> None:
-        task = SaveBomTask(
+    def _run_stages(self) -> None:
+        """
+        Runs the stages after the bill of material has been processed. The bill of material
+        doesn't depend on the item export: It's saved and moved while CATIA exports the items.
+        """
+        save_bom = SaveBomTask(
             bom=self.bom,
             export_root_path=self.export_folder,
             filename=Path(self.variables.bom_export_path.get()).name,
         )
-        task.run()
+        move_bom = MoveFilesTask(
+            runner=self.runner_move_files,
+            export_root_path=self.export_folder,
+            vars=self.variables,
+            items=False,
+            retry=False,
+        )
+        move_items = MoveFilesTask(
+            runner=self.runner_move_files,
+            export_root_path=self.export_folder,
+            vars=self.variables,
+            bom=False,
+            retry=False,
+        )
+
+        self._scheduler = scheduler = Scheduler(root=self.main_ui)
+        scheduler.add("save_bom", save_bom.run, StageResource.EXCEL)
+        scheduler.add("export_items", self._export_items, StageResource.CATIA)
+        scheduler.add("move_bom", move_bom.move, StageResource.DISK, depends=["save_bom"])
+        scheduler.add(
+            "move_items",
+            move_items.run,
+            StageResource.DISK,
+            depends=["export_items"],
+            thread=TaskThread.MAIN,
+        )
+        # The item export closes all documents, the document is re-opened even if cancelled.
+        scheduler.add(
+            "reopen_document",
+            self._reopen_document,
+            StageResource.CATIA,
+            depends=["export_items"],
+            cancellable=False,
+        )
+        scheduler.add(
+            "retry_failed_moves",
+            lambda: MoveFilesTask.retry_failed([move_bom, move_items]),
+            StageResource.DISK,
+            depends=["move_bom", "move_items"],
+            thread=TaskThread.MAIN,
+        )
+        scheduler.run()
+
+        self.move_stats = move_bom.stats + move_items.stats
+
+    def _reopen_document(self) -> None:
+        # The item export closes all documents: The document is opened again and re-loaded,
+        # the reference of the closed document isn't valid anymore (the next export would fail).
+        self.doc_helper.load(self.doc_helper.path)
 
     def _export_items(self, *_) -> None:
         task = ExportItemsTask(
@@ -221,11 +326,3 @@ class MainTask:
             workspace=self.workspace,
         )
         task.run()
-
-    def _move_files(self, *_) -> None:
-        task = MoveFilesTask(
-            runner=self.runner_move_files,
-            export_root_path=self.export_folder,
-            vars=self.variables,
-        )
-        task.run()
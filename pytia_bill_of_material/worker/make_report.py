@@ -2,9 +2,11 @@
     Generates a report from the BOM object.
 """
 
+import logging
 import re
 
 from const import BuiltInFilter
+from const import LogEvent
 from const import Status
 from models.bom import BOM
 from models.report import Report
@@ -13,6 +15,8 @@ from protocols.task_protocol import TaskProtocol
 from pytia.log import log
 from pytia_ui_tools.handlers.workspace_handler import Workspace
 from resources import resource
+from utils.log_queue import LazyMessage
+from utils.log_summary import LogSummary
 
 
 class MakeReportTask(TaskProtocol):
@@ -74,103 +78,115 @@ class MakeReportTask(TaskProtocol):
         log.info("Verifying bill of material.")
 
         report = Report()
+        # Logs one line per assembly, instead of one line per item (depends on the settings).
+        with LogSummary("make_report") as summary:
+            for assembly in bom.assemblies:
+                summary.begin(f"Verified element {assembly.partnumber!r}")
+
+                for assembly_item in assembly.items:
+                    summary.count(
+                        LogEvent.ITEM, LazyMessage(lambda: f"  {assembly_item.partnumber}")  # pylint: disable=W0640
+                    )
+                    report_item = ReportItem(
+                        partnumber=assembly_item.partnumber,
+                        path=assembly_item.path,
+                        parent_partnumber=assembly.partnumber,
+                        parent_path=assembly.path,
+                    )
+
+                    if not assembly_item.path:
+                        report_item.details[BuiltInFilter.NOT_FOUND.value] = Status.FAILED
+                        report_item.status = Status.FAILED
+                        report.status = Status.FAILED
+
+                    if assembly_item.path and assembly_item.partnumber != assembly_item.path.stem:
+                        report_item.details[BuiltInFilter.NAME_CONVENTION.value] = Status.FAILED
+                        report_item.status = Status.FAILED
+                        report.status = Status.FAILED
+
+                    for filter_element in resource.filters:
+                        enabled = filter_element.enabled
+                        if filter_element.property_name in assembly_item.properties:
+                            conditions_satisfied = []
+                            conditions_satisfied.append(enabled)
+
+                            if isinstance((cond_item := filter_element.condition), bool):
+                                conditions_satisfied.append(cond_item)
+
+                            elif isinstance(cond_item, dict):
+                                for cond_key in cond_item:
+                                    if not cond_key in assembly_item.properties:
+                                        raise KeyError(
+                                            f"Condition key {cond_key!r} is not available in the BOM properties."
+                                        )
+
+                                    if assembly_item.properties[cond_key] == cond_item[cond_key]:
+                                        conditions_satisfied.append(True)
+                                    else:
+                                        conditions_satisfied.append(False)
 
-        for assembly in bom.assemblies:
-            log.info(f"Verifying element {assembly.partnumber!r}:")
-
-            for assembly_item in assembly.items:
-                log.info(f"  {assembly_item.partnumber}")
-                report_item = ReportItem(
-                    partnumber=assembly_item.partnumber,
-                    path=assembly_item.path,
-                    parent_partnumber=assembly.partnumber,
-                    parent_path=assembly.path,
-                )
-
-                if not assembly_item.path:
-                    report_item.details[BuiltInFilter.NOT_FOUND.value] = Status.FAILED
-                    report_item.status = Status.FAILED
-                    report.status = Status.FAILED
-
-                if assembly_item.path and assembly_item.partnumber != assembly_item.path.stem:
-                    report_item.details[BuiltInFilter.NAME_CONVENTION.value] = Status.FAILED
-                    report_item.status = Status.FAILED
-                    report.status = Status.FAILED
-
-                for filter_element in resource.filters:
-                    if not filter_element._enabled:
-                        raise ValueError(
-                            f"Filter element {filter_element.property_name} is not "
-                            "setup correctly: '_enabled' is None."
-                        )
-
-                    if filter_element.property_name in assembly_item.properties:
-                        conditions_satisfied = []
-                        conditions_satisfied.append(filter_element._enabled.get())
-
-                        if isinstance((cond_item := filter_element.condition), bool):
-                            conditions_satisfied.append(cond_item)
-
-                        elif isinstance(cond_item, dict):
-                            for cond_key in cond_item:
-                                if not cond_key in assembly_item.properties:
-                                    raise KeyError(
-                                        f"Condition key {cond_key!r} is not available in the BOM properties."
-                                    )
-
-                                if assembly_item.properties[cond_key] == cond_item[cond_key]:
-                                    conditions_satisfied.append(True)
-                                else:
-                                    conditions_satisfied.append(False)
-
-                        else:
-                            raise TypeError(
-                                f"Type of conditions ({type(cond_item)}) not valid, must be 'bool' or 'dict'."
-                            )
-
-                        if all(conditions_satisfied):
-                            if assembly_item.properties[filter_element.property_name] is not None:
-                                if filter_element.criteria.startswith("%WS:"):
-                                    workspace_element = filter_element.criteria.split("%WS:")[-1]
-                                    workspace_dict = workspace.elements.__dict__
-                                    if (
-                                        workspace.available
-                                        and workspace_element in workspace_dict
-                                        and assembly_item.properties[filter_element.property_name]
-                                        == workspace_dict[workspace_element]
+                            else:
+                                raise TypeError(
+                                    f"Type of conditions ({type(cond_item)}) not valid, must be 'bool' or 'dict'."
+                                )
+
+                            if all(conditions_satisfied):
+                                if assembly_item.properties[filter_element.property_name] is not None:
+                                    if filter_element.criteria.startswith("%WS:"):
+                                        workspace_element = filter_element.criteria.split("%WS:")[-1]
+                                        workspace_dict = workspace.elements.__dict__
+                                        if (
+                                            workspace.available
+                                            and workspace_element in workspace_dict
+                                            and assembly_item.properties[filter_element.property_name]
+                                            == workspace_dict[workspace_element]
+                                        ):
+                                            report_item.details[filter_element.name] = Status.OK
+                                        else:
+
+                                            report_item.details[filter_element.name] = Status.FAILED
+                                            report_item.status = Status.FAILED
+                                            report.status = Status.FAILED
+
+                                    elif re.match(
+                                        filter_element.criteria,
+                                        str(assembly_item.properties[filter_element.property_name]),
                                     ):
                                         report_item.details[filter_element.name] = Status.OK
-                                        log.debug(f"    - {filter_element.name}: OK.")
-                                    else:
 
+                                    else:
                                         report_item.details[filter_element.name] = Status.FAILED
                                         report_item.status = Status.FAILED
                                         report.status = Status.FAILED
-                                        log.debug(f"    - {filter_element.name}: FAILED.")
-
-                                elif re.match(
-                                    filter_element.criteria,
-                                    str(assembly_item.properties[filter_element.property_name]),
-                                ):
-                                    report_item.details[filter_element.name] = Status.OK
-                                    log.debug(f"    - {filter_element.name}: OK.")
 
                                 else:
                                     report_item.details[filter_element.name] = Status.FAILED
                                     report_item.status = Status.FAILED
                                     report.status = Status.FAILED
-                                    log.debug(f"    - {filter_element.name}: FAILED.")
-
                             else:
-                                report_item.details[filter_element.name] = Status.FAILED
-                                report_item.status = Status.FAILED
-                                report.status = Status.FAILED
-                                log.debug(f"    - {filter_element.name}: FAILED.")
-                        else:
-                            report_item.details[filter_element.name] = Status.SKIPPED
-                            log.debug(f"    - {filter_element.name}: SKIPPED.")
+                                report_item.details[filter_element.name] = Status.SKIPPED
 
-                    else:
-                        raise ValueError(f"Item {filter_element.property_name!r} not in BOM.")
-                report.items.append(report_item)
+                        else:
+                            raise ValueError(f"Item {filter_element.property_name!r} not in BOM.")
+                        summary.detail(
+                            LazyMessage(
+                                lambda: f"    - {filter_element.name}: "  # pylint: disable=W0640
+                                f"{report_item.details[filter_element.name].value.upper()}."  # pylint: disable=W0640
+                            )
+                        )
+                    report.items.append(report_item)
+                    if report_item.status == Status.FAILED:
+                        summary.count(
+                            LogEvent.FAILED,
+                            LazyMessage(
+                                lambda: f"Item {report_item.partnumber!r} failed: "  # pylint: disable=W0640
+                                + ", ".join(
+                                    name
+                                    for name, status in report_item.details.items()  # pylint: disable=W0640
+                                    if status == Status.FAILED
+                                )
+                                + "."
+                            ),
+                            level=logging.WARNING,
+                        )
         return report
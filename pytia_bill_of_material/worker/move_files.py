@@ -2,8 +2,10 @@
     Moves all files to their destination.
 """
 
-import os
 from pathlib import Path
+from typing import Callable
+from typing import List
+from typing import Tuple
 
 from app.main.vars import Variables
 from const import BOM
@@ -14,9 +16,14 @@ from const import DRAWINGS
 from const import JPGS
 from const import STLS
 from const import STPS
+from const import TaskThread
+from models.move import MoveStats
 from protocols.task_protocol import TaskProtocol
 from pytia.log import log
 from pytia_ui_tools.utils.files import file_utility
+from resources import resource
+from utils.chunked_copy import ChunkedCopy
+from utils.mover import FileMover
 
 from .runner import Runner
 
@@ -25,81 +32,135 @@ class MoveFilesTask(TaskProtocol):
     """
     Moves all files to their destination after the export.
 
+    The files of the bill of material and the files of the item export can be moved by separate
+    tasks, because the bill of material doesn't depend on the item export.
+
     Args:
         TaskProtocol (_type_): The task runner protocol.
     """
 
-    __slots__ = "_runner"
+    __slots__ = ("runner", "export_root_path", "vars", "items", "retry", "folders", "mover")
 
-    def __init__(self, runner: Runner, export_root_path: Path, vars: Variables) -> None:
+    def __init__(
+        self,
+        runner: Runner,
+        export_root_path: Path,
+        vars: Variables,
+        bom: bool = True,
+        items: bool = True,
+        retry: bool = True,
+    ) -> None:
         """
-        Inits the class.
+        Inits the class. The target folders are read from the variables here, so that `move` \
+        can run on any thread.
 
         Args:
             runner (Runner): The runner instance for handling UI elements.
+            export_root_path (Path): The temporary export folder.
+            vars (Variables): The main windows variables.
+            bom (bool, optional): Whether to move the bill of material. Defaults to True.
+            items (bool, optional): Whether to move the exported items. Defaults to True.
+            retry (bool, optional): Whether to let the user retry failed files after the move. \
+                Defaults to True.
         """
         self.runner = runner
         self.export_root_path = export_root_path
         self.vars = vars
+        self.items = items
+        self.retry = retry
+        self.folders = self._get_folders(bom=bom, items=items)
+        self.mover = FileMover(
+            delta=self.vars.delta_sync.get(),
+            copier=ChunkedCopy(
+                chunk_size=int(resource.settings.copy.chunk_size_mb * 1024 * 1024),
+                min_size=int(resource.settings.copy.min_size_mb * 1024 * 1024),
+                retries=resource.settings.copy.retries,
+                backoff=resource.settings.copy.backoff,
+                backoff_factor=resource.settings.copy.backoff_factor,
+                max_backoff=resource.settings.copy.max_backoff,
+            ),
+        )
 
     def run(self) -> None:
         """Runs the task."""
         log.info("Moving files.")
 
-        self._add_move(
-            source=Path(self.export_root_path, BOM),
-            target=Path(self.vars.bom_export_path.get()).parent,
-        )
-        self._add_move(
-            source=Path(self.export_root_path, DOCUMENTATION),
-            target=Path(self.vars.documentation_export_path.get()),
-        )
+        self.runner.add(func=self._move, name="Moving files", thread=TaskThread.WORKER)
+        if self.retry:
+            self.runner.add(func=self.retry_failed, name="Moving failed files", tasks=[self])
+        if self.items:
+            for item in file_utility.delete_items:
+                self.runner.add(
+                    func=file_utility.delete_item,
+                    name=f"Deleting file {str(item.path)!r}",
+                    item=item,
+                )
+        self.runner.run_tasks()
 
-        if self.vars.bundle.get():
-            self._add_move(
-                source=Path(self.export_root_path, BUNDLE),
-                target=Path(self.vars.bundle_export_path.get()),
-            )
-        else:
-            self._add_move(
-                source=Path(self.export_root_path, DOCKETS),
-                target=Path(self.vars.docket_export_path.get()),
-            )
-            self._add_move(
-                source=Path(self.export_root_path, DRAWINGS),
-                target=Path(self.vars.drawing_export_path.get()),
-            )
-            self._add_move(
-                source=Path(self.export_root_path, STLS),
-                target=Path(self.vars.stl_export_path.get()),
-            )
-            self._add_move(
-                source=Path(self.export_root_path, STPS),
-                target=Path(self.vars.stp_export_path.get()),
-            )
-            self._add_move(
-                source=Path(self.export_root_path, JPGS),
-                target=Path(self.vars.jpg_export_path.get()),
+    @property
+    def stats(self) -> MoveStats:
+        return self.mover.stats
+
+    def move(self, progress: Callable[[float], None] | None = None) -> MoveStats:
+        """
+        Moves all files. Doesn't access the UI, therefore it can run on any thread.
+
+        Args:
+            progress (Callable[[float], None] | None, optional): The progress callback of the \
+                mover. Defaults to None.
+
+        Returns:
+            MoveStats: The statistics of the move operation.
+        """
+        for source, target in self.folders:
+            self.mover.add_folder(source=source, target=target)
+        return self.mover.run(progress=progress)
+
+    @staticmethod
+    def retry_failed(tasks: List["MoveFilesTask"]) -> None:
+        """
+        Moves all failed files of the given tasks again by the file utility. The file utility
+        asks the user to retry or skip files, that cannot be moved (e.g. a locked pdf in the
+        target folder). Must run on the main thread.
+
+        Args:
+            tasks (List[MoveFilesTask]): The tasks of which to move the failed files.
+        """
+        for task in tasks:
+            for item in task.mover.failed:
+                file_utility.add_move(source=item.source, target=item.target)
+        for move_item in file_utility.move_items:
+            file_utility.move_item(move_item)
+
+    def _move(self) -> None:
+        """Moves all files. Runs on a worker thread."""
+        self.move(progress=self.runner.set_task_progress)
+
+    def _get_folders(self, bom: bool, items: bool) -> List[Tuple[Path, Path]]:
+        """Returns the source and target folder of every folder to move."""
+        folders: List[Tuple[Path, Path]] = []
+        if bom:
+            folders.append(
+                (Path(self.export_root_path, BOM), Path(self.vars.bom_export_path.get()).parent),
             )
+        if not items:
+            return folders
 
-        for item in file_utility.move_items:
-            self.runner.add(
-                func=file_utility.move_item,
-                name=f"Moving file {item.target.name!r}",
-                item=item,
+        folders.append(
+            (Path(self.export_root_path, DOCUMENTATION), Path(self.vars.documentation_export_path.get())),
+        )
+        if self.vars.bundle.get():
+            folders.append(
+                (Path(self.export_root_path, BUNDLE), Path(self.vars.bundle_export_path.get())),
             )
-        for item in file_utility.delete_items:
-            self.runner.add(
-                func=file_utility.delete_item,
-                name=f"Deleting file {str(item.path)!r}",
-                item=item,
+        else:
+            folders.extend(
+                [
+                    (Path(self.export_root_path, DOCKETS), Path(self.vars.docket_export_path.get())),
+                    (Path(self.export_root_path, DRAWINGS), Path(self.vars.drawing_export_path.get())),
+                    (Path(self.export_root_path, STLS), Path(self.vars.stl_export_path.get())),
+                    (Path(self.export_root_path, STPS), Path(self.vars.stp_export_path.get())),
+                    (Path(self.export_root_path, JPGS), Path(self.vars.jpg_export_path.get())),
+                ]
             )
-        self.runner.run_tasks()
-
-    def _add_move(self, source: Path, target: Path) -> None:
-        """Moves every file inside the source dir to the target dir."""
-        for abs_file in source.rglob("*.*"):
-            rel_file = abs_file.relative_to(source)
-            target_file = Path(target, rel_file)
-            os.makedirs(target_file.parent, exist_ok=True)  # TODO: Integrate this into file_utility
-            file_utility.add_move(source=abs_file, target=target_file)
+        return folders
@@ -21,6 +21,7 @@ from models.paths import Paths
 from protocols.task_protocol import TaskProtocol
 from pycatia.in_interfaces.document import Document
 from pycatia.product_structure_interfaces.product import Product
+from pycatia.product_structure_interfaces.product_document import ProductDocument
 from pytia.exceptions import PytiaDifferentDocumentError
 from pytia.framework import framework
 from pytia.log import log
@@ -29,6 +30,8 @@ from pytia.utilities.bill_of_material import set_secondary_format
 from pytia.utilities.docket import DocketConfig
 from pytia.wrapper.documents.product_documents import PyProductDocument
 from resources import resource
+from utils.path_index import PathIndex
+from utils.path_index import index_product_tree_cached
 
 
 class PrepareTask(TaskProtocol):
@@ -89,7 +92,10 @@ class PrepareTask(TaskProtocol):
             os.makedirs(Path(self.export_root_path, JPGS))
 
         self.set_catia_bom_format()
-        self._paths: Paths = self._retrieve_paths(self.doc_helper.document)
+        self._paths: Paths = self._retrieve_paths(
+            self.doc_helper.document,
+            unsaved=self.doc_helper.has_unsaved_documents(),
+        )
         self._docket_config = DocketConfig.from_dict(resource.docket)
         self._docu_config = DocketConfig.from_dict(resource.documentation)
 
@@ -112,38 +118,37 @@ class PrepareTask(TaskProtocol):
         set_secondary_format(prop_names)
 
     @staticmethod
-    def _retrieve_paths(product: PyProductDocument) -> Paths:
+    def _retrieve_paths(product: PyProductDocument, unsaved: bool = False) -> Paths:
         """
         Retrieves the paths of all items of the given CATIA product as Paths model. The content of \
             the returned Paths object looks like this: 
             `{ 'Part1': 'C:\\Users\\..\\Part1.CATPart', 'Part2': 'C:\\Users\\..\\Part2.CATPart' }`
 
+        The paths are stored in a persistent index (see `PathIndex`). Only products whose \
+            files have changed since the last run are traversed again.
+
         Args:
             product (PyProductDocument): The pytia document wrapper object from which to retrieve \
                 the paths.
+            unsaved (bool, optional): Whether any open document has unsaved changes. The index \
+                isn't used then, the whole tree is traversed. Defaults to False.
 
         Returns:
             Paths: The Paths model, that contains a dict of all partnumbers as keys and paths of \
                 that partnumbers as values.
         """
         log.info(f"Reading all paths of {product.product.part_number!r}.")
-        paths = Paths()
-        paths.items[product.product.part_number] = Path(product.product.full_name)
-
-        def iterate_tree(parent_product: Product) -> None:
-            for i in range(1, parent_product.products.count + 1):
-                current_product = parent_product.products.item(i)
-                try:
-                    # If there are items in the tree that aren't parts or products the
-                    # iteration will fail, because the reference product cannot be fetched.
-                    # Maybe this should be done in a better way, without a try-except clause.
-                    current_partnumber = Product(current_product.com_object).part_number
-                    current_path = Path(Product(current_product.com_object).full_name)
-                    paths.items[current_partnumber] = current_path
-                    log.info(f"Indexed item {current_product.name!r} to {str(current_path)!r}.")
-                    iterate_tree(current_product)
-                except Exception as e:
-                    log.warning(f"Skipped adding item {current_product.name!r} to paths: {e}")
-
-        iterate_tree(product.product)
-        return paths
+        return index_product_tree_cached(
+            root=product.product,
+            index=PathIndex(Path(product.product.full_name)),
+            resolve=PrepareTask._resolve_product,
+            unsaved=unsaved,
+        )
+
+    @staticmethod
+    def _resolve_product(path: Path) -> Product | None:
+        """Returns the reference product of an open product document, or None."""
+        try:
+            return ProductDocument(framework.catia.documents.item(path.name).com_object).product
+        except Exception:  # pylint: disable=broad-except
+            return None
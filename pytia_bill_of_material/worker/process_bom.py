@@ -2,12 +2,14 @@
     Processes the xlsx file and generates the BOM object from it.
 """
 
+import logging
 import re
 from pathlib import Path
 from typing import Any
 from typing import Dict
 
 from const import KEEP
+from const import LogEvent
 from const import X000D
 from helper.resource import ResourceCommons
 from models.bom import BOM
@@ -22,6 +24,8 @@ from protocols.task_protocol import TaskProtocol
 from pytia.log import log
 from resources import resource
 from utils.excel import row_is_empty
+from utils.log_queue import LazyMessage
+from utils.log_summary import LogSummary
 
 CONN_ERR_MSG = (
     "Failed to process the worksheet from the CATIA export. "
@@ -157,167 +161,189 @@ class ProcessBomTask(TaskProtocol):
         # material.
         header_items = ResourceCommons.get_property_names_from_config(resource.bom.header_items.summary)
 
-        for ri in range(1, max_row + 2):
-            log.debug(f"Working on row {ri} of {worksheet.max_row}.")
-
-            # Since we iterate over the whole catia export excel file, and this export
-            # contains all bills of material (all boms from all sub-assemblies and the
-            # bom-summary from the whole thing), we need to identify where we are in the
-            # current row. This is done with the _bom_or_summary variable and the _name
-            # variable.
-            # The _bom_or_summary variable defines wether the current row is
-            # a bom from a sub-assembly or from the summary.
-            # The _name variable defines the name (partnumber) of the parent product.
-            _bom_or_summary = str(worksheet.cell(ri, 1).value).split(": ")[0]
-            _name = str(worksheet.cell(ri, 1).value).split(": ")[-1]
-
-            # An empty row means that the either the bom hasn't begun or it has ended.
-            # So we need to check if the assembly object isn't none (and if we are not
-            # at the summary section) to determine if we can add the current assembly
-            # data to the list of assemblies.
-            # The assembly object needs to be set to none after adding its content to
-            # the list, so this condition isn't reached by accident.
-            # In short: This if condition is for adding a sub-assembly to the list of
-            # assemblies.
-            if row_is_empty(worksheet, ri) and assembly is not None and not is_summary:
-                bom.assemblies.append(assembly)
-                log.debug(f"Added assembly of {assembly.partnumber!r} to the list of assemblies.")
-                assembly = None
-
-            # Same as above, but we check here if the assembly object is the summary.
-            # The summary data-block comes always last in the catia export excel file,
-            # at this we can just check if we're at the end of the excel file (in case
-            # you wondered why we iterate over worksheet.max_row + 2, this is why).
-            elif ri > max_row and assembly is not None and is_summary:
-                bom.summary = assembly
-                log.debug(f"Added assembly of {assembly.partnumber!r} to the summary.")
-
-            # To check if a new bom needs to be processed we need to check if the
-            # keyword "Bill of Material" is in the current row.
-            # If that is the case we create a new assembly object and check the header
-            # of said new assembly. Those headers should always be those from the
-            # bom.json file (but checking is better than hoping).
-            elif resource.applied_keywords.bom in _bom_or_summary:
-                assembly = BOMAssembly(partnumber=_name, path=self._paths.items[_name])
-                header_positions = self._get_header_positions(
-                    worksheet=worksheet, row=ri + 1, header_items=header_items
-                )
-                # The data row for sub-assembly-boms is always two rows after the
-                # "Bill of Material" keyword.
-                data_row = ri + 2
-                log.info(f"Processing BOM of element {_name!r}.")
-
-            # To check if a new summary needs to be processed we need to check if the
-            # keyword "Recapitulation" is in the current row.
-            # If that is the case we create a new assembly object.
-            # Note: The summary is always the last data-block of the excel file, so we
-            # don't need to bother setting it back to false somewhere else.
-            elif resource.applied_keywords.summary in _bom_or_summary:
-                is_summary = True
-                assembly = BOMAssembly(partnumber=_name, path=self._paths.items[_name])
-                header_positions = self._get_header_positions(
-                    worksheet=worksheet, row=ri + 4, header_items=header_items
-                )
-                # The data row for summary-boms is always five rows after the
-                # "Bill of Material" keyword.
-                data_row = ri + 5
-                log.info(f"Processing BOM summary.")
-
-            # Only when the assembly object isn't none (valid keyword "Bill of
-            # Material" or "Recapitulation" and valid header positions) and the current
-            # row number matches the beginning of the data row from the excel file we
-            # can start treating the current row as data row.
-            # All if-conditions before were only for validating the beginning or the end
-            # of a bom-data-range.
-            if assembly is not None and ri >= data_row and not row_is_empty(worksheet, ri):
-                # The row data dict will contain the data from the current row (wow).
-                # It's keys are the header items names (from the bom.json) and it's
-                # values are the actual data.
-                row_data: dict = {}
-
-                # To make sure we gather the right data from the right header we
-                # use the header position dict to access the column of the excel file.
-                # We don't iterate over all excel columns.
-                for position in header_positions:
-                    cell_value = worksheet.cell(ri, header_positions[position]).value
-
-                    # This is a result of legacy catia macros. This isn't needed if all
-                    # parts and products are setup with the pytia-property-manager.
-                    if isinstance(cell_value, str) and X000D in cell_value:
-                        cell_value = cell_value.replace("_x000D_\n", "\n")
-
-                    # catia exports empty cells as chr(13). This results in a space
-                    # string " " instead of a truly empty cell. This is fixed by
-                    # checking for only-whitespace characters and replacing them with
-                    # None.
-                    if isinstance(cell_value, str) and re.match(r"^\s+$", cell_value):
-                        cell_value = None
-
-                    cell_value = self._overwrite_project_number(
-                        header_position=position,
-                        cell_value=cell_value,
-                        overwrite_number=overwrite_project,
-                    )
-
-                    cell_value = self._translate_username(header_position=position, cell_value=cell_value)
-
-                    cell_value = self._apply_fixed_text(header_position=position, cell_value=cell_value)
-
-                    # cell_value = self._apply_placeholder_header(
-                    #     header_position=position, cell_value=cell_value
-                    # )
-
-                    self._add_to_row_data(row_data, header_position=position, cell_value=cell_value)
-
-                # The partnumber must be available in the header. We use the partnumber
-                # to identify a part or product in the assembly.
-                if not resource.applied_keywords.partnumber in row_data:
-                    raise KeyError(
-                        f"Cannot find keyword {resource.applied_keywords.partnumber!r} in exported "
-                        "Excel file. Are your language settings correct? Or is the $partnumber "
-                        "keyword not set in the bom.json's header_items?"
-                    )
-
-                # The partnumber must not be empty (this should be impossible).
-                if row_data[resource.applied_keywords.partnumber] is None:
-                    raise ValueError("The value for the partnumber is empty.")
-
-                # Warn the user when a part or product is missing. This happens mostly
-                # when there are items in the catia tree, that aren't stored in a file.
-                # (Cameras, Simulations, etc.)
-                if row_data[resource.applied_keywords.partnumber] not in self._paths.items:
-                    item_path = None
-                    log.warning("No path found for item " f"{row_data[resource.applied_keywords.partnumber]!r}.")
-                else:
-                    item_path = self._paths.items[row_data[resource.applied_keywords.partnumber]]
-
-                # Finally we check if the assembly item isn't tagged to be ignored.
-                # If not, it's added to the dataclass.
-                if (
-                    self._ignore_source_unknown
-                    and row_data[resource.applied_keywords.source] == resource.applied_keywords.unknown
-                ) or (
-                    self._ignore_prefix_txt is not None
-                    and any(
-                        [
-                            str(row_data[resource.applied_keywords.partnumber]).startswith(s)
-                            for s in self._ignore_prefix_txt.split(";")
-                        ]
+        # Logs one line per assembly, instead of one line per row (depends on the settings).
+        with LogSummary("process_bom") as summary:
+            for ri in range(1, max_row + 2):
+                log.debug(LazyMessage(lambda: f"Working on row {ri} of {max_row}."))  # pylint: disable=W0640
+
+                # Since we iterate over the whole catia export excel file, and this export
+                # contains all bills of material (all boms from all sub-assemblies and the
+                # bom-summary from the whole thing), we need to identify where we are in the
+                # current row. This is done with the _bom_or_summary variable and the _name
+                # variable.
+                # The _bom_or_summary variable defines wether the current row is
+                # a bom from a sub-assembly or from the summary.
+                # The _name variable defines the name (partnumber) of the parent product.
+                _bom_or_summary = str(worksheet.cell(ri, 1).value).split(": ")[0]
+                _name = str(worksheet.cell(ri, 1).value).split(": ")[-1]
+
+                # An empty row means that the either the bom hasn't begun or it has ended.
+                # So we need to check if the assembly object isn't none (and if we are not
+                # at the summary section) to determine if we can add the current assembly
+                # data to the list of assemblies.
+                # The assembly object needs to be set to none after adding its content to
+                # the list, so this condition isn't reached by accident.
+                # In short: This if condition is for adding a sub-assembly to the list of
+                # assemblies.
+                if row_is_empty(worksheet, ri) and assembly is not None and not is_summary:
+                    bom.assemblies.append(assembly)
+                    log.debug(
+                        LazyMessage(lambda: f"Added assembly of {assembly.partnumber!r} to the list of assemblies.")
                     )
-                ):
-                    log.info(" - Ignoring item " f"{row_data[resource.applied_keywords.partnumber]!r}.")
-                else:
-                    assembly_item = BOMAssemblyItem(
-                        partnumber=row_data[resource.applied_keywords.partnumber],
-                        source=row_data[resource.applied_keywords.source],
-                        properties=row_data,
-                        path=item_path,
+                    assembly = None
+
+                # Same as above, but we check here if the assembly object is the summary.
+                # The summary data-block comes always last in the catia export excel file,
+                # at this we can just check if we're at the end of the excel file (in case
+                # you wondered why we iterate over worksheet.max_row + 2, this is why).
+                elif ri > max_row and assembly is not None and is_summary:
+                    bom.summary = assembly
+                    log.debug(LazyMessage(lambda: f"Added assembly of {assembly.partnumber!r} to the summary."))
+
+                # To check if a new bom needs to be processed we need to check if the
+                # keyword "Bill of Material" is in the current row.
+                # If that is the case we create a new assembly object and check the header
+                # of said new assembly. Those headers should always be those from the
+                # bom.json file (but checking is better than hoping).
+                elif resource.applied_keywords.bom in _bom_or_summary:
+                    assembly = BOMAssembly(partnumber=_name, path=self._paths.items[_name])
+                    header_positions = self._get_header_positions(
+                        worksheet=worksheet, row=ri + 1, header_items=header_items
                     )
-                    assembly.items.append(assembly_item)
-                    log.info(
-                        f" - Added item {row_data[resource.applied_keywords.partnumber]!r} to element "
-                        f"{assembly.partnumber!r}{' (summary).' if is_summary else '.'}"
+                    # The data row for sub-assembly-boms is always two rows after the
+                    # "Bill of Material" keyword.
+                    data_row = ri + 2
+                    summary.begin(f"BOM of element {_name!r}")
+
+                # To check if a new summary needs to be processed we need to check if the
+                # keyword "Recapitulation" is in the current row.
+                # If that is the case we create a new assembly object.
+                # Note: The summary is always the last data-block of the excel file, so we
+                # don't need to bother setting it back to false somewhere else.
+                elif resource.applied_keywords.summary in _bom_or_summary:
+                    is_summary = True
+                    assembly = BOMAssembly(partnumber=_name, path=self._paths.items[_name])
+                    header_positions = self._get_header_positions(
+                        worksheet=worksheet, row=ri + 4, header_items=header_items
                     )
+                    # The data row for summary-boms is always five rows after the
+                    # "Bill of Material" keyword.
+                    data_row = ri + 5
+                    summary.begin("BOM summary")
+
+                # Only when the assembly object isn't none (valid keyword "Bill of
+                # Material" or "Recapitulation" and valid header positions) and the current
+                # row number matches the beginning of the data row from the excel file we
+                # can start treating the current row as data row.
+                # All if-conditions before were only for validating the beginning or the end
+                # of a bom-data-range.
+                if assembly is not None and ri >= data_row and not row_is_empty(worksheet, ri):
+                    # The row data dict will contain the data from the current row (wow).
+                    # It's keys are the header items names (from the bom.json) and it's
+                    # values are the actual data.
+                    row_data: dict = {}
+
+                    # To make sure we gather the right data from the right header we
+                    # use the header position dict to access the column of the excel file.
+                    # We don't iterate over all excel columns.
+                    for position in header_positions:
+                        cell_value = worksheet.cell(ri, header_positions[position]).value
+
+                        # This is a result of legacy catia macros. This isn't needed if all
+                        # parts and products are setup with the pytia-property-manager.
+                        if isinstance(cell_value, str) and X000D in cell_value:
+                            cell_value = cell_value.replace("_x000D_\n", "\n")
+
+                        # catia exports empty cells as chr(13). This results in a space
+                        # string " " instead of a truly empty cell. This is fixed by
+                        # checking for only-whitespace characters and replacing them with
+                        # None.
+                        if isinstance(cell_value, str) and re.match(r"^\s+$", cell_value):
+                            cell_value = None
+
+                        cell_value = self._overwrite_project_number(
+                            header_position=position,
+                            cell_value=cell_value,
+                            overwrite_number=overwrite_project,
+                        )
+
+                        cell_value = self._translate_username(header_position=position, cell_value=cell_value)
+
+                        cell_value = self._apply_fixed_text(header_position=position, cell_value=cell_value)
+
+                        # cell_value = self._apply_placeholder_header(
+                        #     header_position=position, cell_value=cell_value
+                        # )
+
+                        self._add_to_row_data(row_data, header_position=position, cell_value=cell_value)
+
+                    # The partnumber must be available in the header. We use the partnumber
+                    # to identify a part or product in the assembly.
+                    if not resource.applied_keywords.partnumber in row_data:
+                        raise KeyError(
+                            f"Cannot find keyword {resource.applied_keywords.partnumber!r} in exported "
+                            "Excel file. Are your language settings correct? Or is the $partnumber "
+                            "keyword not set in the bom.json's header_items?"
+                        )
+
+                    # The partnumber must not be empty (this should be impossible).
+                    if row_data[resource.applied_keywords.partnumber] is None:
+                        raise ValueError("The value for the partnumber is empty.")
+
+                    # Warn the user when a part or product is missing. This happens mostly
+                    # when there are items in the catia tree, that aren't stored in a file.
+                    # (Cameras, Simulations, etc.)
+                    if row_data[resource.applied_keywords.partnumber] not in self._paths.items:
+                        item_path = None
+                        summary.count(
+                            LogEvent.WARNING,
+                            LazyMessage(
+                                lambda: "No path found for item "  # pylint: disable=W0640
+                                f"{row_data[resource.applied_keywords.partnumber]!r}."  # pylint: disable=W0640
+                            ),
+                            level=logging.WARNING,
+                        )
+                    else:
+                        item_path = self._paths.items[row_data[resource.applied_keywords.partnumber]]
+
+                    # Finally we check if the assembly item isn't tagged to be ignored.
+                    # If not, it's added to the dataclass.
+                    if (
+                        self._ignore_source_unknown
+                        and row_data[resource.applied_keywords.source] == resource.applied_keywords.unknown
+                    ) or (
+                        self._ignore_prefix_txt is not None
+                        and any(
+                            [
+                                str(row_data[resource.applied_keywords.partnumber]).startswith(s)
+                                for s in self._ignore_prefix_txt.split(";")
+                            ]
+                        )
+                    ):
+                        summary.count(
+                            LogEvent.IGNORED,
+                            LazyMessage(
+                                lambda: " - Ignoring item "  # pylint: disable=W0640
+                                f"{row_data[resource.applied_keywords.partnumber]!r}."  # pylint: disable=W0640
+                            ),
+                        )
+                    else:
+                        assembly_item = BOMAssemblyItem(
+                            partnumber=row_data[resource.applied_keywords.partnumber],
+                            source=row_data[resource.applied_keywords.source],
+                            properties=row_data,
+                            path=item_path,
+                        )
+                        assembly.items.append(assembly_item)
+                        # pylint: disable=W0640
+                        summary.count(
+                            LogEvent.ITEM,
+                            LazyMessage(
+                                lambda: f" - Added item {assembly_item.partnumber!r} to element "
+                                f"{assembly.partnumber!r}{' (summary).' if is_summary else '.'}"
+                            ),
+                        )
+                        # pylint: enable=W0640
         return bom
 
     @staticmethod
@@ -2,54 +2,261 @@
     Runner for the main task.
 """
 
+import queue
+import threading
+import time
+from tkinter import BooleanVar
 from tkinter import DoubleVar
+from tkinter import StringVar
 from tkinter import Tk
+from typing import Any
 from typing import Callable
 from typing import List
+from typing import Tuple
 
+from const import TaskThread
 from models.runner import RunnerModel
 from pytia.log import log
+from resources import resource
+
+POLL_INTERVAL = 50
+DURATION_SMOOTHING = 0.3
+
+_PROGRESS = "progress"
+_ERROR = "error"
+_DONE = "done"
 
 
 class Runner:
     """
     This class is responsible for running tasks and updating the UI.
+
+    Tasks run on the Tk main thread by default. Tasks that don't touch CATIA or the UI can run
+    on a worker thread (`TaskThread.WORKER`), tasks that create their own COM objects (e.g.
+    Excel) on a COM-initialized single threaded apartment (`TaskThread.STA`). While such a task
+    runs, the UI stays responsive: Progress and errors are sent back to the Tk thread through a
+    queue, which is polled with `after()`.
+
+    Note: COM objects can't be shared between threads. Tasks that use the CATIA documents of the
+    main thread must always run on the main thread.
+
+    Every task is timed. The durations are stored per task type (the qualified name of the task
+    function) as moving average in the appdata. The progress of each task is weighted by its
+    expected duration, the remaining time is estimated from the expected durations of the
+    remaining tasks.
     """
 
     def __init__(
         self,
         root: Tk,
         callback_variable: DoubleVar,
+        eta_variable: StringVar | None = None,
     ) -> None:
+        """
+        Inits the runner.
+
+        Args:
+            root (Tk): The main window.
+            callback_variable (DoubleVar): The variable of the progress bar (0-100).
+            eta_variable (StringVar | None, optional): The variable for the estimated remaining \
+                time. Defaults to None.
+        """
         self.root = root
         self.progress_callback = callback_variable
+        self.eta_callback = eta_variable
 
         self.runners: List[RunnerModel] = []
+        self._task_start: float = 0
+        self._task_share: float = 0
+
+        self._expected: List[float] = []
+        self._task_index = 0
+        self._task_started_at: float = 0
+        self._done_expected: float = 0
+        self._done_actual: float = 0
+
+        self._queue: queue.Queue[Tuple[str, Any]] = queue.Queue()
+        self._cancel = threading.Event()
 
-    def add(self, func: Callable, name: str, **kwargs) -> None:
+    @property
+    def cancelled(self) -> bool:
+        """Returns wether the runner has been cancelled."""
+        return self._cancel.is_set()
+
+    def add(self, func: Callable, name: str, thread: TaskThread = TaskThread.MAIN, **kwargs) -> None:
         """
         Add a task function. Functions must be task-protocol-functions.
 
         Args:
             func (Callable): The task to be queued.
             name (str): The name of the task.
+            thread (TaskThread, optional): The thread on which the task runs. Defaults to \
+                TaskThread.MAIN.
 
         Kwargs:
             Will be passed to the task function.
         """
-        self.runners.append(RunnerModel(func=func, name=name, kwargs=kwargs))
+        self.runners.append(RunnerModel(func=func, name=name, kwargs=kwargs, thread=thread))
+
+    def cancel(self) -> None:
+        """
+        Cancels the runner. The running task is finished, all remaining tasks are skipped.
+        Can be called from any thread.
+        """
+        if not self._cancel.is_set():
+            log.warning("Cancelling remaining tasks.")
+        self._cancel.set()
 
     def run_tasks(self) -> None:
-        """Runs all queued tasks."""
+        """Runs all queued tasks. A previous cancel doesn't apply to this run."""
+        self._cancel.clear()
+        self._expected = self._expected_durations()
+        total = sum(self._expected)
+        self._done_expected = 0
+        self._done_actual = 0
+        self._task_index = 0
+        self._task_started_at = time.perf_counter()
+
         self._update_progress(1)
-        for fn in self.runners:
+        for index, fn in enumerate(self.runners):
+            self._task_index = index
+            if self.cancelled:
+                log.info(f"Skipped task {fn.name!r}: Runner has been cancelled.")
+                continue
             log.info(f"Running task {fn.name!r}.")
-            fn.func(**fn.kwargs)
-            self._update_progress(self.progress_callback.get() + int(100 / len(self.runners)))
+            self._task_start = 1 + 99 * self._done_expected / total
+            self._task_share = 99 * self._expected[index] / total
+
+            self._task_started_at = time.perf_counter()
+            self.run_task(fn.func, fn.thread, **fn.kwargs)
+            duration = time.perf_counter() - self._task_started_at
+            self._record_duration(fn, duration)
+            self._done_expected += self._expected[index]
+            self._done_actual += duration
+
+            self._update_progress(self._task_start + self._task_share)
             self.root.update_idletasks()
         self._update_progress(100)
+        if self.eta_callback is not None:
+            self.eta_callback.set("")
+
+    def run_task(self, func: Callable, thread: TaskThread = TaskThread.MAIN, **kwargs) -> None:
+        """
+        Runs a single function on the given thread and waits for it to finish. The Tk event
+        loop keeps running while waiting. Exceptions of the function are re-raised on the
+        calling thread.
+
+        Args:
+            func (Callable): The function to run.
+            thread (TaskThread, optional): The thread on which the function runs. Defaults to \
+                TaskThread.MAIN.
+
+        Kwargs:
+            Will be passed to the function.
+        """
+        if thread == TaskThread.MAIN:
+            func(**kwargs)
+            return
+
+        def _target() -> None:
+            if thread == TaskThread.STA:
+                import pythoncom  # pylint: disable=C0415
+
+                pythoncom.CoInitialize()
+            try:
+                func(**kwargs)
+            except BaseException as e:  # pylint: disable=broad-except
+                self._queue.put((_ERROR, e))
+            finally:
+                if thread == TaskThread.STA:
+                    pythoncom.CoUninitialize()
+                self._queue.put((_DONE, None))
+
+        done = BooleanVar(master=self.root, value=False)
+        errors: List[BaseException] = []
+        worker = threading.Thread(target=_target, name=f"runner-{thread.value}", daemon=True)
+        worker.start()
+        # The first poll must be scheduled: wait_variable only returns on a write that happens
+        # after the wait has started.
+        self.root.after(POLL_INTERVAL, lambda: self._poll(done, errors))
+        self.root.wait_variable(done)
+        worker.join()
+
+        if errors:
+            raise errors[0]
+
+    def set_task_progress(self, fraction: float) -> None:
+        """
+        Updates the progress bar from within a running task. Can be called from any thread.
+
+        Args:
+            fraction (float): The progress of the current task (0-1).
+        """
+        value = self._task_start + self._task_share * min(max(fraction, 0), 1)
+        if threading.current_thread() is not threading.main_thread():
+            self._queue.put((_PROGRESS, value))
+        elif int(value) != int(self.progress_callback.get()):
+            self._update_progress(value)
+
+    def _poll(self, done: BooleanVar, errors: List[BaseException]) -> None:
+        """Handles all messages of the worker thread. Re-schedules itself until the task is done."""
+        while True:
+            try:
+                kind, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == _PROGRESS:
+                if int(value) != int(self.progress_callback.get()):
+                    self._update_progress(value)
+            elif kind == _ERROR:
+                errors.append(value)
+            elif kind == _DONE:
+                done.set(True)
+                return
+        self.root.after(POLL_INTERVAL, lambda: self._poll(done, errors))
 
     def _update_progress(self, value: int | float) -> None:
         """Update the progress bar."""
         self.progress_callback.set(value)
+        self._update_eta()
         self.root.update_idletasks()
+
+    @staticmethod
+    def _kind(fn: RunnerModel) -> str:
+        """Returns the task type of a task, used as key for the stored durations."""
+        return getattr(fn.func, "__qualname__", fn.name)
+
+    def _expected_durations(self) -> List[float]:
+        """
+        Returns the expected duration of each task. Tasks without a stored duration are
+        expected to take as long as the average task with a stored duration.
+        """
+        durations = resource.appdata.task_durations
+        known = [durations[self._kind(fn)] for fn in self.runners if self._kind(fn) in durations]
+        default = sum(known) / len(known) if known else 1.0
+        return [max(durations.get(self._kind(fn), default), 1e-3) for fn in self.runners]
+
+    def _record_duration(self, fn: RunnerModel, duration: float) -> None:
+        """Updates the moving average of the task type's duration in the appdata."""
+        durations = resource.appdata.task_durations
+        kind = self._kind(fn)
+        if kind in durations:
+            durations[kind] += DURATION_SMOOTHING * (duration - durations[kind])
+        else:
+            durations[kind] = duration
+
+    def _update_eta(self) -> None:
+        """Updates the estimated remaining time."""
+        if self.eta_callback is None or not self._expected:
+            return
+
+        current = self._expected[self._task_index]
+        remaining = sum(self._expected[self._task_index + 1 :]) + max(
+            current - (time.perf_counter() - self._task_started_at), 0
+        )
+        # The expected durations are corrected by the actual durations of this run.
+        if self._done_expected > 0:
+            remaining *= self._done_actual / self._done_expected
+
+        minutes, seconds = divmod(int(remaining), 60)
+        self.eta_callback.set(f"Remaining: ~{minutes}:{seconds:02d} min")
@@ -37,14 +37,14 @@ class SaveBomTask(TaskProtocol):
     def run(self) -> None:
         """Runs the task."""
         log.info("Saving finished bill of material.")
-        self._save_bom(
+        self.save_bom(
             bom=self.bom,
             folder=Path(self.export_root_path, BOM_FOLDER),
             filename=self.filename,
         )
 
     @classmethod
-    def _save_bom(cls, bom: BOM, folder: Path, filename: str) -> None:
+    def save_bom(cls, bom: BOM, folder: Path, filename: str) -> List[Path]:
         """
         Saves the bill of material from the BOM object as xlsx file. 
         This saves only the content of the BOM object, regardless of wether the Report 
@@ -55,6 +55,9 @@ class SaveBomTask(TaskProtocol):
             folder (Path): The path into which to save the bill of material.
             filename (str): The name of the file to save. '.xlsx' will be added if not \
                 in name. Separate files will be created if set in bom.json.
+
+        Returns:
+            List[Path]: The paths of all saved files.
         """
 
         wb_summary = Workbook()
@@ -114,6 +117,7 @@ class SaveBomTask(TaskProtocol):
         wb_summary.active = wb_summary["Summary"]
 
         # File operations
+        saved: List[Path] = []
         if ".xlsx" in filename:
             filename = filename.split(".xlsx")[0]
 
@@ -124,14 +128,18 @@ class SaveBomTask(TaskProtocol):
 
             if wb_made and resource.bom.header_items.made:
                 wb_made.save(str(path_made))
+                saved.append(path_made)
 
             if wb_bought and resource.bom.header_items.bought:
                 wb_bought.save(str(path_bought))
+                saved.append(path_bought)
         else:
             path_sum = Path(folder, filename + ".xlsx")
 
         wb_summary.save(str(path_sum))
+        saved.insert(0, path_sum)
         log.info(f"Saved processed BOM to {str(folder)!r}.")
+        return saved
 
     @staticmethod
     def _write_worksheet(
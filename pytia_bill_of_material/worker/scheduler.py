@@ -0,0 +1,244 @@
+"""
+    Stage scheduler for the main task.
+"""
+
+import queue
+import threading
+from tkinter import BooleanVar
+from tkinter import Tk
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Set
+
+from const import StageResource
+from const import TaskThread
+from models.runner import StageModel
+from pytia.log import log
+
+POLL_INTERVAL = 50
+
+
+class Scheduler:
+    """
+    Runs stages as a dependency graph.
+
+    A stage starts as soon as all stages it depends on are finished and its resource class isn't
+    in use by another stage. This allows independent stages to run at the same time, if they
+    don't compete for the same resource (e.g. saving the bill of material while CATIA exports
+    the items).
+
+    CATIA stages always run on the Tk main thread, because the COM objects of the documents
+    can't be shared between threads. All other stages run on a worker thread (or a COM-initialized
+    STA thread), unless stated otherwise. While the main thread waits for worker stages, the Tk
+    event loop keeps running.
+
+    If a stage fails, no further stages are started. The running stages are awaited and the
+    first exception is re-raised. If the scheduler is cancelled, only stages that can't be
+    cancelled are started (e.g. re-opening the document), all others are skipped.
+
+    Worker stages are started by the thread of the stage they depend on, as soon as it finishes.
+    Thus a long running CATIA stage on the main thread doesn't hold back the worker stages.
+    """
+
+    def __init__(self, root: Tk) -> None:
+        """
+        Inits the scheduler.
+
+        Args:
+            root (Tk): The main window.
+        """
+        self.root = root
+        self.stages: Dict[str, StageModel] = {}
+
+        self._queue: queue.Queue[str] = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending: List[StageModel] = []
+        self._running: Dict[str, StageModel] = {}
+        self._finished: Set[str] = set()
+        self._busy: Set[StageResource] = set()
+        self._errors: List[BaseException] = []
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Returns wether the scheduler has been cancelled."""
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """
+        Cancels the scheduler. Running stages are finished, stages that haven't started yet are
+        skipped (unless they can't be cancelled). Can be called from any thread.
+        """
+        if not self._cancel.is_set():
+            log.warning("Cancelling remaining stages.")
+        self._cancel.set()
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], None],
+        resource: StageResource,
+        depends: Iterable[str] = (),
+        thread: TaskThread = TaskThread.WORKER,
+        cancellable: bool = True,
+    ) -> None:
+        """
+        Adds a stage. Stages can only depend on stages that have been added before, so the
+        graph can't contain cycles.
+
+        Args:
+            name (str): The unique name of the stage.
+            func (Callable[[], None]): The stage function.
+            resource (StageResource): The resource class the stage uses.
+            depends (Iterable[str], optional): The names of the stages that must be finished \
+                before this stage starts. Defaults to ().
+            thread (TaskThread, optional): The thread on which the stage runs. CATIA stages \
+                always run on the main thread. Defaults to TaskThread.WORKER.
+            cancellable (bool, optional): Whether the stage is skipped if the scheduler has \
+                been cancelled. Defaults to True.
+
+        Raises:
+            ValueError: The name is already in use or a dependency doesn't exist.
+        """
+        if name in self.stages:
+            raise ValueError(f"Stage {name!r} already exists.")
+        if unknown := [d for d in depends if d not in self.stages]:
+            raise ValueError(f"Stage {name!r} depends on unknown stage(s): {', '.join(unknown)}.")
+        if resource == StageResource.CATIA:
+            thread = TaskThread.MAIN
+
+        self.stages[name] = StageModel(
+            name=name, func=func, resource=resource, depends=list(depends), thread=thread, cancellable=cancellable
+        )
+
+    def run(self) -> None:
+        """Runs all stages."""
+        self._pending = list(self.stages.values())
+        self._running = {}
+        self._finished = set()
+        self._busy = set()
+        self._errors = []
+
+        while True:
+            with self._lock:
+                main_stage = self._start_ready()
+                if main_stage is None and not self._running:
+                    # All stages are finished, or nothing can be started anymore (a stage failed, or
+                    # the scheduler has been cancelled).
+                    break
+
+            if main_stage is not None:
+                log.info(f"Running stage {main_stage.name!r} ({main_stage.resource.value}).")
+                try:
+                    main_stage.func()
+                except Exception as e:  # pylint: disable=broad-except
+                    self._finish(main_stage, e)
+                else:
+                    self._finish(main_stage, None)
+                continue
+
+            self._wait()
+
+        if self._errors:
+            raise self._errors[0]
+        if self.cancelled:
+            for stage in self._pending:
+                log.info(f"Skipped stage {stage.name!r}: Scheduler has been cancelled.")
+        elif self._pending:
+            raise RuntimeError(f"Stages couldn't be run: {', '.join(s.name for s in self._pending)}.")
+
+    def _start_ready(self) -> StageModel | None:
+        """
+        Starts all worker stages that are ready. Must be called with the lock held.
+
+        Returns:
+            StageModel | None: A main thread stage that is ready, reserved for the caller.
+        """
+        if self._errors:
+            return None
+
+        main_stage: StageModel | None = None
+        for stage in list(self._pending):
+            if self.cancelled and stage.cancellable:
+                continue
+            if stage.resource in self._busy or not all(d in self._finished for d in stage.depends):
+                continue
+            if stage.thread == TaskThread.MAIN and (
+                main_stage is not None or threading.current_thread() is not threading.main_thread()
+            ):
+                continue
+
+            self._pending.remove(stage)
+            self._busy.add(stage.resource)
+            self._running[stage.name] = stage
+            if stage.thread == TaskThread.MAIN:
+                main_stage = stage
+            else:
+                self._start(stage)
+        return main_stage
+
+    def _finish(self, stage: StageModel, error: BaseException | None) -> None:
+        """
+        Marks the stage as finished and starts the worker stages, that depend on it. Wakes up the
+        main thread.
+        """
+        with self._lock:
+            self._running.pop(stage.name)
+            self._busy.discard(stage.resource)
+            if error is not None:
+                log.error(f"Stage {stage.name!r} failed: {error}")
+                self._errors.append(error)
+            else:
+                self._finished.add(stage.name)
+            # Worker stages are started right away, even if the main thread is busy.
+            if threading.current_thread() is not threading.main_thread():
+                self._start_ready()
+        self._queue.put(stage.name)
+
+    def _start(self, stage: StageModel) -> None:
+        """Starts the stage on a worker thread."""
+        log.info(f"Running stage {stage.name!r} ({stage.resource.value}) on a worker thread.")
+
+        def _target() -> None:
+            if stage.thread == TaskThread.STA:
+                import pythoncom  # pylint: disable=C0415
+
+                pythoncom.CoInitialize()
+            try:
+                stage.func()
+            except BaseException as e:  # pylint: disable=broad-except
+                self._finish(stage, e)
+            else:
+                self._finish(stage, None)
+            finally:
+                if stage.thread == TaskThread.STA:
+                    pythoncom.CoUninitialize()
+
+        threading.Thread(target=_target, name=f"stage-{stage.name}", daemon=True).start()
+
+    def _drain(self) -> bool:
+        """Empties the queue. Returns True if a stage has finished since the last call."""
+        drained = False
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return drained
+            drained = True
+
+    def _wait(self) -> None:
+        """Waits until at least one worker stage has finished. Keeps the Tk event loop running."""
+        done = BooleanVar(master=self.root, value=False)
+
+        def _poll() -> None:
+            if self._drain():
+                done.set(True)
+            else:
+                self.root.after(POLL_INTERVAL, _poll)
+
+        # The first poll must be scheduled: wait_variable only returns on a write that happens
+        # after the wait has started.
+        self.root.after(POLL_INTERVAL, _poll)
+        self.root.wait_variable(done)
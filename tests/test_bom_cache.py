@@ -0,0 +1,28 @@
+"""
+    Test the bill of material cache.
+"""
+
+from dataclasses import asdict
+from pathlib import Path
+
+
+def test_bom_cache_fingerprint(tmp_path: Path):
+    from pytia_bill_of_material.models.paths import Paths
+    from pytia_bill_of_material.resources import resource
+    from pytia_bill_of_material.utils.bom_cache import BomCache
+
+    part = Path(tmp_path, "Part1.CATPart")
+    part.write_bytes(b"part")
+    paths = Paths(items={"Part1": part})
+    header_items = ["partnumber", "quantity"]
+
+    def fingerprint(language: str) -> str | None:
+        keywords = asdict(resource.keywords.en if language == "en" else resource.keywords.de)
+        return BomCache.fingerprint(paths=paths, header_items=header_items, language=language, keywords=keywords)
+
+    assert fingerprint("en") == fingerprint("en")
+    # The export of CATIA is language specific, its columns are named by the keywords.
+    assert fingerprint("en") != fingerprint("de")
+
+    part.unlink()
+    assert fingerprint("en") is None
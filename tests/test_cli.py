@@ -0,0 +1,140 @@
+"""
+    Test the command line interface.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+
+def _write_export(path: Path, project: str) -> None:
+    """Writes an english CATIA bill of material export of the product 'Root' with one part."""
+    from openpyxl import Workbook
+    from pytia_bill_of_material.helper.resource import ResourceCommons
+    from pytia_bill_of_material.resources import resource
+
+    resource.reset_language()
+    resource.apply_language("en")
+    header = ResourceCommons.get_property_names_from_config(resource.bom.header_items.summary)
+    keywords = resource.applied_keywords
+    values: Dict[str, str | int] = {
+        "pytia.project": project,
+        keywords.partnumber: "Part1",
+        keywords.revision: "1",
+        keywords.quantity: 1,
+        keywords.source: keywords.made,
+    }
+    row = [values.get(h, "x") for h in header]
+
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append([f"{keywords.bom}: Root"])
+    worksheet.append(header)
+    worksheet.append(row)
+    worksheet.append([])
+    worksheet.append([f"{keywords.summary}: Root"])
+    worksheet.append([])
+    worksheet.append([])
+    worksheet.append([])
+    worksheet.append(header)
+    worksheet.append(row)
+    workbook.save(path)
+    resource.reset_language()
+
+
+def test_process(tmp_path: Path, monkeypatch, capsys):
+    from pytia_bill_of_material.cli import cli
+    from pytia_bill_of_material.cli import deps
+    from pytia_bill_of_material.const import ExitCode
+    from pytia_bill_of_material.resources import resource
+
+    monkeypatch.setattr(deps, "get_missing_packages", staticmethod(lambda: []))
+
+    cad = Path(tmp_path, "cad", "sub")
+    cad.mkdir(parents=True)
+    Path(cad, "Root.CATProduct").write_text("")
+    Path(cad, "Part1.CATPart").write_text("")
+
+    valid = Path(tmp_path, "valid.xlsx")
+    invalid = Path(tmp_path, "invalid.xlsx")
+    missing = Path(tmp_path, "missing.xlsx")
+    _write_export(valid, "P12345")
+    _write_export(invalid, "Project")
+
+    resource.apply_language("en")
+    skip = [arg for f in resource.filters if f.name != "Project Number" for arg in ("--skip-filter", f.name)]
+    resource.reset_language()
+    common = ["-s", str(Path(tmp_path, "cad")), "-o", str(Path(tmp_path, "out")), *skip]
+
+    # One job: Processed in this process
+    assert cli(["process", str(valid), *common, "-j", "1"]) == ExitCode.OK
+    report = json.loads(capsys.readouterr().out)
+    assert report["status"] == "ok"
+    assert report["files"][0]["language"] == "en"
+    assert report["files"][0]["items"] == 1
+    assert [Path(p).name for p in report["files"][0]["output"]][0] == "valid (Summary).xlsx"
+    assert Path(tmp_path, "out", "valid (Summary).xlsx").is_file()
+
+    # Multiple jobs: The worst result is the exit code, the report keeps the order of the inputs
+    report_path = Path(tmp_path, "report.json")
+    exit_code = cli(["process", str(valid), str(invalid), str(missing), *common, "-j", "2", "-r", str(report_path)])
+    assert exit_code == ExitCode.ERROR
+    report = json.loads(report_path.read_text(encoding="utf8"))
+    assert [f["status"] for f in report["files"]] == ["ok", "failed", "error"]
+    assert [f["exit_code"] for f in report["files"]] == [ExitCode.OK, ExitCode.FAILED, ExitCode.ERROR]
+    assert report["files"][1]["failed_items"][0]["details"] == {"Project Number": "failed"}
+    assert "FileNotFoundError" in report["files"][2]["error"]
+    assert not Path(tmp_path, "out", "invalid (Summary).xlsx").exists()
+
+    assert cli(["process", str(invalid), *common, "-j", "1", "--verify-only"]) == ExitCode.FAILED
+    resource.reset_language()
+
+
+def test_output_doesnt_overwrite_export(tmp_path: Path, monkeypatch):
+    from pytia_bill_of_material.worker.batch import BatchTask
+    from pytia_bill_of_material.worker.batch import resource
+
+    export = Path(tmp_path, "export.xlsx")
+    resource.apply_language("en")
+    try:
+        monkeypatch.setattr(resource.bom.files, "separate", False)
+        assert BatchTask.output_filename(export, tmp_path) == f"export ({resource.bom.files.summary})"
+        assert BatchTask.output_filename(Path(tmp_path, "export.xls"), tmp_path) == "export"
+        assert BatchTask.output_filename(export, Path(tmp_path, "out")) == "export"
+
+        monkeypatch.setattr(resource.bom.files, "separate", True)
+        assert BatchTask.output_filename(export, tmp_path) == "export"
+    finally:
+        resource.reset_language()
+
+
+def test_process_excel_session(tmp_path: Path, monkeypatch):
+    import importlib
+
+    from pytia_bill_of_material.cli import cli
+    from pytia_bill_of_material.cli import deps
+
+    # The modules as the app imports them, see `process`.
+    excel = importlib.import_module("utils.excel")
+    batch = importlib.import_module("worker.batch")
+
+    monkeypatch.setattr(deps, "get_missing_packages", staticmethod(lambda: []))
+    started = []
+    monkeypatch.setattr(excel, "application_is_running", lambda _: False)
+    monkeypatch.setattr(excel, "get_excel", lambda: started.append(1) or excel.Dispatch("EXCEL.Application"))
+
+    sessions = []
+
+    def get_xlsx(export: Path, converted: Path) -> Path:
+        sessions.append(excel._session)
+        raise ValueError("Not converted.")
+
+    monkeypatch.setattr(batch, "get_xlsx", get_xlsx)
+
+    exports = [Path(tmp_path, f"{i}.xls") for i in range(3)]
+    cli(["process", *map(str, exports), "-s", str(tmp_path), "-j", "1"])
+
+    # Excel is started once for all conversions, and quit afterwards.
+    assert len(started) == 1
+    assert len(sessions) == 3 and all(session is not None for session in sessions)
+    assert excel._session is None
@@ -42,3 +42,84 @@ def test_imports():
         for line in f.readlines():
             assert "pytia" not in line
             assert "pytia_ui_tools" not in line
+
+
+def test_cached_check(tmp_path, monkeypatch):
+    """Tests if the dependency check is skipped on an unchanged environment."""
+    from pytia_bill_of_material import dependencies
+
+    site_packages = tmp_path / "site-packages"
+    site_packages.mkdir()
+    monkeypatch.setattr(dependencies.sysconfig, "get_path", lambda _: str(site_packages))
+    monkeypatch.setattr(dependencies.resource.appdata, "deps_fingerprint", {})
+
+    calls = []
+    monkeypatch.setattr(dependencies.Dependencies, "get_missing_packages", staticmethod(lambda: calls.append(1) or []))
+
+    deps = dependencies.Dependencies()
+    deps.install_dependencies()
+    deps.install_dependencies()
+    assert len(calls) == 1
+    assert dependencies.resource.appdata.deps_fingerprint == deps.get_fingerprint()
+
+    # Installing a package changes the site-packages folder
+    (site_packages / "package").mkdir()
+    os.utime(site_packages, ns=(0, 0))
+    deps.install_dependencies()
+    assert len(calls) == 2
+
+
+def test_web_resources(tmp_path):
+    """Tests the availability checks and the wheel downloads against a local server."""
+    import functools
+    import threading
+    from http.server import SimpleHTTPRequestHandler
+    from http.server import ThreadingHTTPServer
+
+    from pytia_bill_of_material import dependencies
+
+    served = tmp_path / "served"
+    served.mkdir()
+    for name in ["a-1.0-py3-none-any.whl", "b-1.0-py3-none-any.whl"]:
+        (served / name).write_bytes(name.encode() * 1000)
+
+    connections = []
+    requests = []
+
+    class Handler(SimpleHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            connections.append(self.client_address)
+            super().setup()
+
+        def log_message(self, format, *args):
+            requests.append(self.command)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Handler, directory=str(served)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        addresses = [f"{host}/a-1.0-py3-none-any.whl", f"{host}/b-1.0-py3-none-any.whl", f"{host}/missing.whl"]
+        available = dependencies.Dependencies.web_resources_available(addresses)
+        assert list(available.values()) == [True, True, False]
+        assert len(connections) == 3
+
+        # The connections of a host are limited, the remaining checks share a connection.
+        connections.clear()
+        available = dependencies.Dependencies.web_resources_available(addresses, max_per_host=2)
+        assert list(available.values()) == [True, True, False]
+        assert len(connections) == 2
+
+        cache = tmp_path / "cache"
+        for _ in range(2):
+            downloads = dependencies.Dependencies.download_wheels(
+                {"a": f"{host}/a-1.0-py3-none-any.whl", "b": f"{host}/b-1.0-py3-none-any.whl"}, folder=cache
+            )
+            paths = {name: download.result(timeout=10) for name, download in downloads.items()}
+            assert paths["b"].read_bytes() == (served / "b-1.0-py3-none-any.whl").read_bytes()
+        assert requests.count("GET") == 2
+        assert not list(cache.glob("*.part"))
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,325 @@
+"""
+    Test the export utilities.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+import pytest
+
+
+class FakeViewpoint:
+    def __init__(self) -> None:
+        self.sight_directions: List[tuple] = []
+
+    def put_sight_direction(self, view: tuple) -> None:
+        self.sight_directions.append(view)
+
+
+class FakeViewer3D:
+    def __init__(self, viewpoint: FakeViewpoint) -> None:
+        self.viewpoint_3d = viewpoint
+
+
+class FakeViewer:
+    def __init__(self) -> None:
+        self.full_screen = False
+        self.background_color = (0.2, 0.2, 0.4)
+        self.viewpoint = FakeViewpoint()
+        self.viewer_3d_created = 0
+        self.reframed = 0
+        self.captures: List[str] = []
+
+    def get_background_color(self) -> tuple:
+        return self.background_color
+
+    def put_background_color(self, color: tuple) -> None:
+        self.background_color = color
+
+    def create_viewer_3d(self) -> FakeViewer3D:
+        self.viewer_3d_created += 1
+        return FakeViewer3D(self.viewpoint)
+
+    def update(self) -> None: ...
+
+    def reframe(self) -> None:
+        self.reframed += 1
+
+    def capture_to_file(self, _: int, path: str) -> None:
+        self.captures.append(path)
+
+
+class FakeWindow:
+    def __init__(self, name: str, viewer: FakeViewer | None = None) -> None:
+        self.name = name
+        self.viewer = viewer or FakeViewer()
+        self.layout = "catWindowSpecsAndGeom"
+        self.closed = False
+        self.com_object = object()
+
+    @property
+    def active_viewer(self) -> FakeViewer:
+        if self.closed:
+            raise RuntimeError("The window has been closed")
+        return self.viewer
+
+
+def _set_layout(window: FakeWindow, layout: str) -> None:
+    window.layout = layout
+
+
+def _get_layout(window: FakeWindow) -> str:
+    return window.layout
+
+
+def test_jpg_capture_session_single_window():
+    from pytia_bill_of_material.utils.export import JpgCaptureSession
+
+    window = FakeWindow("Part1.CATPart")
+    views = [(1, 0, 0), (0, 1, 0), (0, 0, 1)]
+
+    with JpgCaptureSession(
+        bg=(1, 1, 1), window_getter=lambda: window, layout_setter=_set_layout, layout_getter=_get_layout
+    ) as session:
+        session.capture(filename="Part1", folder=Path("export"), views=views)
+        assert window.active_viewer.full_screen is True
+        assert window.active_viewer.background_color == (1, 1, 1)
+        assert window.layout == "catWindowGeomOnly"
+
+        session.capture(filename="Part1 copy", folder=Path("export"), views=views)
+
+    viewer = window.active_viewer
+    assert viewer.viewer_3d_created == 1
+    assert viewer.reframed == 2
+    assert len(viewer.captures) == 6
+    assert viewer.captures[0] == str(Path("export", "Part1 (View 1).jpg"))
+    assert viewer.viewpoint.sight_directions == views * 2
+
+    # Initial state is restored at the end of the session
+    assert viewer.full_screen is False
+    assert viewer.background_color == (0.2, 0.2, 0.4)
+    assert window.layout == "catWindowSpecsAndGeom"
+
+
+def test_jpg_capture_session_window_change():
+    from pytia_bill_of_material.utils.export import JpgCaptureSession
+
+    windows = [FakeWindow("Part1.CATPart"), FakeWindow("Part2.CATPart")]
+    windows[1].active_viewer.background_color = (0.5, 0.5, 0.5)
+    current = {"window": windows[0]}
+
+    session = JpgCaptureSession(
+        bg=(1, 1, 1),
+        reframe_each_view=True,
+        window_getter=lambda: current["window"],
+        layout_setter=_set_layout,
+        layout_getter=_get_layout,
+    )
+    session.capture(filename="Part1", folder=Path("export"), views=[(1, 1, 1)])
+    current["window"] = windows[1]
+    session.capture(filename="Part2", folder=Path("export"), views=[(1, 1, 1), (1, 0, 0)])
+    session.close()
+
+    assert windows[1].active_viewer.viewer_3d_created == 1
+    assert windows[1].active_viewer.reframed == 2
+    assert windows[0].active_viewer.captures == [str(Path("export", "Part1.jpg"))]
+    assert session.captured == 3
+
+    # The state of the first window is the one to restore.
+    assert windows[1].active_viewer.background_color == (0.2, 0.2, 0.4)
+    assert windows[1].layout == "catWindowSpecsAndGeom"
+
+
+def test_jpg_capture_session_restores_start_window():
+    from pytia_bill_of_material.utils.export import JpgCaptureSession
+
+    # The full screen mode and the background are shared by all windows of the application.
+    shared = FakeViewer()
+    user_window = FakeWindow("Product.CATProduct", viewer=shared)
+    items = [FakeWindow("Part1.CATPart", viewer=shared), FakeWindow("Part2.CATPart", viewer=shared)]
+    current = {"window": user_window}
+
+    session = JpgCaptureSession(
+        bg=(1, 1, 1),
+        window_getter=lambda: current["window"],
+        layout_setter=_set_layout,
+        layout_getter=_get_layout,
+    )
+    session.start()
+    user_window.closed = True
+
+    for item in items:
+        current["window"] = item
+        session.capture(filename=item.name, folder=Path("export"), views=[(1, 1, 1)])
+        assert shared.full_screen is True
+        assert shared.background_color == (1, 1, 1)
+        item.closed = True
+
+    # The user's window has been re-opened, the item windows are closed
+    user_window.closed = False
+    current["window"] = user_window
+    session.close()
+
+    assert session.captured == 2
+    assert shared.full_screen is False
+    assert shared.background_color == (0.2, 0.2, 0.4)
+    assert user_window.layout == "catWindowSpecsAndGeom"
+
+
+def test_jpg_capture_session_initial_state_from_start_window():
+    from pytia_bill_of_material.utils.export import JpgCaptureSession
+
+    user_window = FakeWindow("Product.CATProduct")
+    item = FakeWindow("Part1.CATPart")
+    item.viewer.background_color = (0.5, 0.5, 0.5)
+    current = {"window": user_window}
+
+    with JpgCaptureSession(
+        bg=(1, 1, 1),
+        window_getter=lambda: current["window"],
+        layout_setter=_set_layout,
+        layout_getter=_get_layout,
+    ) as session:
+        current["window"] = item
+        session.capture(filename="Part1", folder=Path("export"), views=[(1, 1, 1)])
+        current["window"] = user_window
+
+    # The state of the user's window is the initial state, not the one of the first item
+    assert item.viewer.background_color == (0.2, 0.2, 0.4)
+    assert user_window.viewer.full_screen is False
+    assert user_window.viewer.background_color == (0.2, 0.2, 0.4)
+
+
+def test_jpg_capture_session_reopened_window():
+    from pytia_bill_of_material.utils.export import JpgCaptureSession
+
+    # The same document is opened again in a new window with the same name.
+    windows = [FakeWindow("Part1.CATPart"), FakeWindow("Part1.CATPart")]
+    current = {"window": windows[0]}
+
+    session = JpgCaptureSession(
+        window_getter=lambda: current["window"],
+        layout_setter=_set_layout,
+        layout_getter=_get_layout,
+    )
+    session.capture(filename="Part1", folder=Path("export"), views=[(1, 1, 1)])
+    windows[0].closed = True
+    current["window"] = windows[1]
+    session.capture(filename="Part1 again", folder=Path("export"), views=[(1, 1, 1)])
+    session.close()
+
+    assert windows[1].viewer.viewer_3d_created == 1
+    assert windows[1].viewer.captures == [str(Path("export", "Part1 again.jpg"))]
+    assert windows[1].viewer.full_screen is False
+
+
+def test_jpg_capture_session_restores_layout():
+    from pytia_bill_of_material.utils.export import JpgCaptureSession
+
+    user_window = FakeWindow("Product.CATProduct")
+    user_window.layout = "catWindowSpecsOnly"
+    item = FakeWindow("Part1.CATPart")
+    current = {"window": user_window}
+
+    with JpgCaptureSession(
+        window_getter=lambda: current["window"],
+        layout_setter=_set_layout,
+        layout_getter=_get_layout,
+    ) as session:
+        current["window"] = item
+        session.capture(filename="Part1", folder=Path("export"), views=[(1, 1, 1)])
+        assert item.layout == "catWindowGeomOnly"
+        current["window"] = user_window
+
+    assert user_window.layout == "catWindowSpecsOnly"
+
+
+def test_export_docket_renderer_template_mismatch():
+    from pytia_bill_of_material.utils.export import DocketRenderer
+    from pytia_bill_of_material.utils.export import export_docket
+
+    renderer = DocketRenderer(template=Path("documentation.CATDrawing"), config=None)  # type: ignore
+    with pytest.raises(ValueError):
+        export_docket(
+            docket_template=Path("docket.CATDrawing"),
+            filename="Part1",
+            folder=Path("export"),
+            document=None,  # type: ignore
+            config=None,  # type: ignore
+            renderer=renderer,
+        )
+    assert not renderer.is_open
+
+
+def _read_drawing(document: Any, config: Any) -> Tuple[Dict[str, str], Dict[str, tuple]]:
+    """Returns the configured texts and the added views (position and scale) of a drawing."""
+    text_names = {text.name for text in config.texts}
+    view_names = {view.name for view in config.views}
+    texts: Dict[str, str] = {}
+    views: Dict[str, tuple] = {}
+    sheet = document.sheets.active_sheet
+    for i_view in range(1, sheet.views.count + 1):
+        view = sheet.views.item(i_view)
+        if view.name in view_names:
+            views[view.name] = (round(view.x, 3), round(view.y, 3), round(view.scale, 6))
+        for i_text in range(1, view.texts.count + 1):
+            text = view.texts.item(i_text)
+            if text.name in text_names:
+                texts[text.name] = text.text
+    return texts, views
+
+
+def test_docket_renderer_matches_pytia():
+    """Renders the same docket with the renderer and with pytia, both must fill the same values."""
+    if sys.platform != "win32":
+        pytest.skip("CATIA is only available on Windows.")
+
+    from pycatia import catia
+    from pycatia.drafting_interfaces.drawing_document import DrawingDocument
+    from pytia.utilities.docket import DocketConfig
+    from pytia.utilities.docket import create_docket_from_template
+    from pytia.wrapper.documents.part_documents import PyPartDocument
+
+    from pytia_bill_of_material.utils.export import DocketRenderer
+
+    try:
+        caa = catia()
+    except Exception:  # pylint: disable=broad-except
+        pytest.skip("CATIA is not running.")
+
+    templates = Path(__file__).parent.parent / "pytia_bill_of_material" / "templates"
+    resources = Path(__file__).parent.parent / "pytia_bill_of_material" / "resources"
+    template = Path(templates, "docket.sample.CATDrawing")
+    config = DocketConfig.from_dict(json.loads(Path(resources, "docket.sample.json").read_text(encoding="utf8")))
+    kwargs = {"project": "P1", "creator": "Creator", "modifier": "Modifier", "publisher": "Publisher", "quantity": 2}
+
+    part = caa.documents.add("Part")
+    document = PyPartDocument()
+    document.current()
+    document.product.part_number = "Part1"
+    try:
+        create_docket_from_template(
+            template=template, document=document, config=config, hide_unknown_properties=True, **kwargs
+        )
+        drawing = DrawingDocument(caa.active_document.com_object)
+        expected = _read_drawing(drawing, config)
+        drawing.close()
+
+        with DocketRenderer(template=template, config=config) as renderer:
+            document.document.activate()
+            renderer._set_texts(document=document, **kwargs)  # pylint: disable=W0212
+            renderer._add_views(document=document)  # pylint: disable=W0212
+            rendered = _read_drawing(renderer._document, config)  # pylint: disable=W0212
+            renderer.reset()
+
+            # The template is reset for the next item.
+            assert _read_drawing(renderer._document, config)[1] == {}  # pylint: disable=W0212
+    finally:
+        part.close()
+
+    assert rendered == expected
@@ -0,0 +1,215 @@
+"""
+    Test the export queue, the Excel session and the document helper.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeVar:
+    def __init__(self, value=None) -> None:
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value) -> None:
+        self.value = value
+
+
+class FakeWorkbook:
+    def __init__(self, excel: "FakeExcel") -> None:
+        self.excel = excel
+
+    def SaveAs(self, path: str, FileFormat: int) -> None:
+        Path(path).write_bytes(b"xlsx")
+
+    def Close(self) -> None:
+        self.excel.closed += 1
+
+
+class FakeExcel:
+    def __init__(self) -> None:
+        self.closed = 0
+        self.quit = 0
+        self.Workbooks = SimpleNamespace(Open=lambda _: FakeWorkbook(self))
+        self.Application = SimpleNamespace(Quit=self._quit)
+
+    def _quit(self) -> None:
+        self.quit += 1
+
+
+def test_queue_summary():
+    from pytia_bill_of_material.models.export_queue import QueueItem
+    from pytia_bill_of_material.models.export_queue import QueueSummary
+    from pytia_bill_of_material.models.export_queue import Status
+    from pytia_bill_of_material.models.move import MoveStats
+
+    summary = QueueSummary(
+        items=[
+            QueueItem(path=Path("A.CATProduct"), status=Status.OK, move_stats=MoveStats(new=2, skipped=1)),
+            QueueItem(path=Path("B.CATProduct"), status=Status.OK, all_moved=False, move_stats=MoveStats(new=1)),
+            QueueItem(path=Path("C.CATProduct"), status=Status.FAILED),
+            QueueItem(path=Path("D.CATProduct"), error="Not in workspace"),
+            QueueItem(path=Path("E.CATProduct"), cancelled=True),
+        ],
+        seconds=42.0,
+    )
+
+    assert [i.path.stem for i in summary.ok] == ["A", "B"]
+    assert [i.path.stem for i in summary.failed] == ["C"]
+    assert summary.move_stats.new == 3
+    assert summary.move_stats.skipped == 1
+    assert summary.text.splitlines() == [
+        "Exported 2 of 5 product(s) in 42s, 1 with errors in the bill of material.",
+        "",
+        "A: ok",
+        "B: ok, not all files moved",
+        "C: failed",
+        "D: error (Not in workspace)",
+        "E: cancelled",
+    ]
+
+
+@pytest.mark.parametrize("running", [False, True])
+def test_excel_session(tmp_path: Path, monkeypatch, running: bool):
+    from pytia_bill_of_material.utils import excel
+
+    dispatched = []
+    monkeypatch.setattr(excel, "get_excel", lambda: dispatched.append(FakeExcel()) or dispatched[-1])
+    monkeypatch.setattr(excel, "application_is_running", lambda _: running)
+
+    files = [Path(tmp_path, f"{i}.xls") for i in range(3)]
+    for file in files:
+        file.write_bytes(b"xls")
+
+    with excel.ExcelSession():
+        excel.convert_xls_to_xlsx(xls_path=files[0])
+        with excel.ExcelSession():
+            excel.convert_xls_to_xlsx(xls_path=files[1])
+        excel.convert_xls_to_xlsx(xls_path=files[2])
+        assert len(dispatched) == 1
+        assert dispatched[0].quit == 0
+
+    assert all(Path(str(file) + "x").is_file() for file in files)
+    assert dispatched[0].closed == 3
+    assert dispatched[0].quit == (0 if running else 1)
+
+    # Without session Excel is dispatched for each conversion.
+    excel.convert_xls_to_xlsx(xls_path=files[0])
+    assert len(dispatched) == 2
+    assert dispatched[1].quit == (0 if running else 1)
+
+
+class FakeDocuments:
+    def __init__(self, names: list) -> None:
+        self.names = list(names)
+        self.active = names[-1]
+        self.opened = []
+
+    @property
+    def count(self) -> int:
+        return len(self.names)
+
+    def item(self, index):
+        name = self.names[index - 1] if isinstance(index, int) else index
+        return SimpleNamespace(name=name, activate=lambda: setattr(self, "active", name))
+
+    def open(self, path: Path) -> None:
+        self.opened.append(path)
+        self.names.append(path.name)
+        self.active = path.name
+
+
+def test_document_helper_load(tmp_path: Path, monkeypatch):
+    import pytia.wrapper.documents.product_documents as product_documents
+    from pytia_bill_of_material.helper import lazy_loaders
+
+    documents = FakeDocuments(["A.CATProduct", "B.CATProduct"])
+
+    class FakeProductDocument:
+        def __init__(self, strict_naming: bool) -> None:
+            self.product = SimpleNamespace(part_number=None)
+            self.document = None
+
+        def current(self) -> None:
+            self.document = SimpleNamespace(
+                name=documents.active, full_name=str(Path(tmp_path, documents.active))
+            )
+
+    languages = []
+    monkeypatch.setattr(product_documents, "PyProductDocument", FakeProductDocument)
+    monkeypatch.setattr(lazy_loaders, "get_ui_language", lambda _: "en")
+    monkeypatch.setattr(
+        lazy_loaders,
+        "resource",
+        SimpleNamespace(
+            apply_language=languages.append,
+            settings=SimpleNamespace(restrictions=SimpleNamespace(allow_unsaved=False)),
+        ),
+    )
+
+    doc_helper = lazy_loaders.LazyDocumentHelper.__new__(lazy_loaders.LazyDocumentHelper)
+    doc_helper.framework = SimpleNamespace(catia=SimpleNamespace(documents=documents))
+
+    doc_helper.load()
+    assert doc_helper.name == "B.CATProduct"
+    assert doc_helper.document.product.part_number == "B"
+
+    # Open documents are activated, all others are opened.
+    doc_helper.load(Path(tmp_path, "A.CATProduct"))
+    assert doc_helper.name == "A.CATProduct"
+    assert documents.opened == []
+
+    doc_helper.load(Path(tmp_path, "C.CATProduct"))
+    assert doc_helper.name == "C.CATProduct"
+    assert documents.opened == [Path(tmp_path, "C.CATProduct")]
+    assert languages == ["en", "en", "en"]
+
+
+def test_export_queue_restores_main_window(monkeypatch):
+    from pytia_bill_of_material.worker import export_queue
+
+    class FailingSession:
+        def __enter__(self):
+            raise RuntimeError("Excel is not installed")
+
+        def __exit__(self, *_):
+            pass
+
+    calls = []
+    monkeypatch.setattr(export_queue, "ExcelSession", FailingSession)
+    ui_setter = SimpleNamespace(working=lambda: calls.append("working"), normal=lambda: calls.append("normal"))
+    doc_helper = SimpleNamespace(path=Path("Origin.CATProduct"), load=lambda path: calls.append(path))
+    variables = SimpleNamespace(
+        product=FakeVar("Origin"),
+        bom_export_path=FakeVar("C:/bom/Origin.xlsx"),
+        external_bom_path=FakeVar("C:/bom/External.xlsx"),
+        refresh_bom=FakeVar(True),
+    )
+
+    task = export_queue.ExportQueueTask(
+        main_ui=None,  # type: ignore
+        layout=None,  # type: ignore
+        ui_setter=ui_setter,  # type: ignore
+        doc_helper=doc_helper,  # type: ignore
+        variables=variables,  # type: ignore
+        frames=None,  # type: ignore
+        workspace=None,  # type: ignore
+        paths=[Path("A.CATProduct")],
+    )
+    with pytest.raises(RuntimeError):
+        task.run()
+
+    assert calls == ["working", Path("Origin.CATProduct"), "normal"]
+    assert variables.external_bom_path.get() == "C:/bom/External.xlsx"
+    assert variables.refresh_bom.get() is False
+
+    # The main window is usable again, even if the current document cannot be loaded.
+    calls.clear()
+    doc_helper.load = lambda _: calls.append("load") or 1 / 0
+    with pytest.raises(ZeroDivisionError):
+        task.run()
+    assert calls == ["working", "load", "normal"]
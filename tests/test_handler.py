@@ -0,0 +1,46 @@
+"""
+    Test the widget log handler.
+"""
+
+import logging
+import time
+import tkinter as tk
+from types import SimpleNamespace
+
+import pytest
+
+
+def test_widget_log_handler():
+    from pytia_bill_of_material.utils.handler import WidgetLogHandler
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("No display available.")
+
+    try:
+        widget = tk.Text(root)
+        style = SimpleNamespace(colors=SimpleNamespace(info="blue", warning="orange", danger="red"))
+        handler = WidgetLogHandler(root, widget, style=style, max_lines=1000)  # type: ignore
+        handler.setFormatter(logging.Formatter(r"%(asctime)s  %(levelname)s  %(message)s", datefmt=r"%Y-%m-%d"))
+
+        logger = logging.getLogger("test_widget_log_handler")
+        logger.handlers = [handler]
+        logger.propagate = False
+
+        start_time = time.perf_counter()
+        for i in range(20000):
+            logger.warning("Record %d", i)
+        root.update()
+        handler._write_pending()
+        duration = time.perf_counter() - start_time
+
+        lines = widget.get("1.0", "end-1c").splitlines()
+        assert len(lines) == 1000
+        assert lines[-1].endswith("Record 19999")
+        assert widget.tag_ranges("WARNING")
+        assert widget.tag_ranges("DATE")
+        assert not widget.tag_ranges("INFO")
+        assert duration < 10
+    finally:
+        root.destroy()
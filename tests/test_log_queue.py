@@ -0,0 +1,83 @@
+"""
+    Test the queue based logging and benchmark the log overhead of parsing rows.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+ROWS = 50000
+
+
+class Row:
+    """A row whose value is expensive to read, like a cell of a worksheet or a COM property."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+    @property
+    def value(self) -> int:
+        return sum(range(self.index % 100))
+
+
+def _parse(logger: logging.Logger, lazy: bool) -> float:
+    from pytia_bill_of_material.utils.log_queue import LazyMessage
+
+    start_time = time.perf_counter()
+    for ri in range(ROWS):
+        row = Row(ri)
+        if lazy:
+            logger.debug(LazyMessage(lambda: f"Working on row {ri} with value {row.value}."))
+        else:
+            logger.debug(f"Working on row {ri} with value {row.value}.")
+        if ri % 10 == 0:
+            logger.info("Processed row %d.", ri)
+    return time.perf_counter() - start_time
+
+
+def test_queue_logging(tmp_path: Path, record_property, monkeypatch):
+    from pytia_bill_of_material.utils.log_queue import LazyMessage
+    from pytia_bill_of_material.utils.log_queue import start_queue_logging
+
+    formatted = []
+    lazy_str = LazyMessage.__str__
+
+    def _str(self) -> str:
+        formatted.append(self)
+        return lazy_str(self)
+
+    monkeypatch.setattr(LazyMessage, "__str__", _str)
+
+    logfile = Path(tmp_path, "app.log")
+    logger = logging.getLogger("test_queue_logging")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    file_handler = logging.FileHandler(logfile, encoding="utf8")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s  %(levelname)s  %(message)s"))
+    logger.handlers = [file_handler]
+
+    baseline = _parse(logging.getLogger("test_queue_logging_disabled"), lazy=True)
+    direct_eager = _parse(logger, lazy=False)
+    direct_lazy = _parse(logger, lazy=True)
+
+    listener = start_queue_logging(logger)
+    queued_lazy = _parse(logger, lazy=True)
+    logger.info(LazyMessage(lambda: "Parsed all rows."))
+    listener.stop()
+    listener.handlers[0].close()
+
+    for name, value in {
+        "baseline": baseline,
+        "direct_eager": direct_eager,
+        "direct_lazy": direct_lazy,
+        "queued_lazy": queued_lazy,
+    }.items():
+        record_property(f"log_overhead_{name}", value)
+
+    # The messages of filtered records are never formatted, only the emitted one.
+    assert len(formatted) == 1
+    with open(logfile, "r", encoding="utf8") as f:
+        lines = f.readlines()
+    assert len(lines) == 3 * ROWS // 10 + 1
+    assert lines[-1].endswith("Parsed all rows.\n")
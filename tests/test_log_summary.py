@@ -0,0 +1,56 @@
+"""
+    Test the log summary.
+"""
+
+import gzip
+import logging
+from pathlib import Path
+
+
+def test_log_summary(tmp_path: Path, caplog):
+    from pytia_bill_of_material.utils.log_queue import LazyMessage
+    from pytia_bill_of_material.utils.log_summary import LogEvent
+    from pytia_bill_of_material.utils.log_summary import LogSummary
+    from pytia_bill_of_material.utils.log_summary import log
+
+    formatted = []
+
+    def message(i: int) -> LazyMessage:
+        return LazyMessage(lambda: formatted.append(i) or f"Added item {i}.")
+
+    caplog.set_level(logging.DEBUG, logger=log.logger.name)
+    with LogSummary("test", summary=True, trace_folder=tmp_path) as summary:
+        summary.begin("Assembly")
+        for i in range(1000):
+            summary.count(LogEvent.ITEM, message(i))
+        summary.count(LogEvent.IGNORED, "Ignored item.")
+        summary.begin("Summary")
+        summary.count(LogEvent.WARNING, "No path found.", level=logging.WARNING)
+
+    # Warnings are logged right away, not only counted in the summary
+    assert [r.getMessage() for r in caplog.records] == [
+        "Assembly: 1000 item(s), 1 ignored, 0 warning(s), 0 failure(s).",
+        "No path found.",
+        "Summary: 0 item(s), 0 ignored, 1 warning(s), 0 failure(s).",
+    ]
+    assert caplog.records[1].levelno == logging.WARNING
+    assert caplog.records[-1].levelno == logging.WARNING
+
+    with gzip.open(Path(tmp_path, "trace_test.log.gz"), "rt", encoding="utf8") as f:
+        trace = f.read()
+    assert "Added item 999." in trace
+    assert "Summary of 'Summary'" in trace
+
+    # Without trace the messages aren't formatted at all in summary mode
+    formatted.clear()
+    with LogSummary("test", summary=True) as summary:
+        summary.begin("Assembly")
+        summary.count(LogEvent.ITEM, message(0))
+    assert formatted == []
+
+    # Detail mode logs each event
+    caplog.clear()
+    with LogSummary("test", summary=False) as summary:
+        summary.begin("Assembly")
+        summary.count(LogEvent.ITEM, message(0))
+    assert [r.getMessage() for r in caplog.records] == ["Begin 'Assembly'.", "Added item 0."]
@@ -0,0 +1,274 @@
+"""
+    Test the file mover and the chunked copy.
+"""
+
+import sys
+from pathlib import Path
+from typing import BinaryIO
+
+import pytest
+
+CHUNK_SIZE = 1024
+
+
+def _make_file(path: Path, size: int) -> bytes:
+    content = bytes(i % 251 for i in range(size))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return content
+
+
+def _flaky_copy(fail_after: list):
+    """Returns a chunked copy, that fails after writing the given number of chunks."""
+    from pytia_bill_of_material.utils.chunked_copy import ChunkedCopy
+
+    class FlakyCopy(ChunkedCopy):
+        def __init__(self) -> None:
+            super().__init__(chunk_size=CHUNK_SIZE, min_size=0, retries=3, sleep=self._sleep)
+            self.fail_after = list(fail_after)
+            self.written = 0
+            self.waits = []
+
+        def _sleep(self, seconds: float) -> None:
+            self.waits.append(seconds)
+
+        def _write_chunk(self, dst: BinaryIO, chunk: bytes) -> None:
+            if self.fail_after and self.written == self.fail_after[0]:
+                self.fail_after.pop(0)
+                self.written = 0
+                # Simulates a half written chunk, as left behind by a network hiccup.
+                dst.write(chunk[: len(chunk) // 2])
+                raise OSError("The network name is no longer available")
+            super()._write_chunk(dst, chunk)
+            self.written += 1
+
+    return FlakyCopy()
+
+
+def test_chunked_copy_resumes(tmp_path: Path):
+    source = Path(tmp_path, "source", "Product.stp")
+    target = Path(tmp_path, "target", "Product.stp")
+    content = _make_file(source, CHUNK_SIZE * 10 + 17)
+    target.parent.mkdir()
+
+    copier = _flaky_copy(fail_after=[4, 3])
+    stats = copier.copy(source, target)
+
+    assert target.read_bytes() == content
+    assert not Path(target.parent, "Product.stp.partial").exists()
+    assert stats.retries == 2
+    assert stats.resumed == CHUNK_SIZE * 4 + CHUNK_SIZE * 7
+    assert copier.waits == [1.0, 2.0]
+
+
+def test_chunked_copy_discards_corrupted_partial(tmp_path: Path):
+    from pytia_bill_of_material.utils.chunked_copy import ChunkedCopy
+
+    source = Path(tmp_path, "source", "Product.stp")
+    target = Path(tmp_path, "target", "Product.stp")
+    content = _make_file(source, CHUNK_SIZE * 3)
+    Path(tmp_path, "target").mkdir()
+    Path(tmp_path, "target", "Product.stp.partial").write_bytes(b"x" * CHUNK_SIZE * 2)
+
+    stats = ChunkedCopy(chunk_size=CHUNK_SIZE, min_size=0).copy(source, target)
+
+    assert target.read_bytes() == content
+    assert stats.resumed == 0
+
+
+def test_chunked_copy_gives_up(tmp_path: Path):
+    from pytia_bill_of_material.utils.chunked_copy import ChunkedCopy
+
+    source = Path(tmp_path, "source", "Product.stp")
+    target = Path(tmp_path, "target", "Product.stp")
+    content = _make_file(source, CHUNK_SIZE * 10)
+    target.parent.mkdir()
+
+    copier = _flaky_copy(fail_after=[1, 1, 1, 1])
+    with pytest.raises(OSError):
+        copier.copy(source, target)
+
+    assert not target.exists()
+    assert Path(target.parent, "Product.stp.partial").exists()
+    assert copier.waits == [1.0, 2.0, 4.0]
+
+    # The next copy resumes from the temporary file of the failed copy.
+    stats = ChunkedCopy(chunk_size=CHUNK_SIZE, min_size=0).copy(source, target)
+    assert target.read_bytes() == content
+    assert not Path(target.parent, "Product.stp.partial").exists()
+    assert stats.resumed == CHUNK_SIZE * 4
+
+
+
+def test_chunked_copy_discards_outdated_partial(tmp_path: Path):
+    import os
+
+    from pytia_bill_of_material.utils.chunked_copy import ChunkedCopy
+
+    source = Path(tmp_path, "source", "Product.stp")
+    target = Path(tmp_path, "target", "Product.stp")
+    content = _make_file(source, CHUNK_SIZE * 10)
+    target.parent.mkdir()
+
+    copier = _flaky_copy(fail_after=[1, 1, 1, 1])
+    with pytest.raises(OSError):
+        copier.copy(source, target)
+    assert Path(target.parent, "Product.stp.partial").exists()
+
+    # Re-exported with a new header, the tail of the file is unchanged.
+    content = b"x" * CHUNK_SIZE + content[CHUNK_SIZE:]
+    source.write_bytes(content)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    stats = ChunkedCopy(chunk_size=CHUNK_SIZE, min_size=0).copy(source, target)
+    assert target.read_bytes() == content
+    assert stats.resumed == 0
+    assert not Path(target.parent, "Product.stp.partial").exists()
+    assert not Path(target.parent, "Product.stp.partial.json").exists()
+
+def test_file_mover(tmp_path: Path):
+    from pytia_bill_of_material.utils.mover import FileMover
+
+    source = Path(tmp_path, "export")
+    target = Path(tmp_path, "release")
+    small = _make_file(Path(source, "Part.pdf"), 100)
+    large = _make_file(Path(source, "stp", "Product.stp"), CHUNK_SIZE * 5)
+
+    copier = _flaky_copy(fail_after=[2])
+    copier.min_size = CHUNK_SIZE
+    mover = FileMover(copier=copier)
+    mover.add_folder(source=source, target=target)
+    # Force the copy path, the tmp folder is always on the same volume.
+    mover._devices = {source: 1, Path(source, "stp"): 1, target: 2, Path(target, "stp"): 2}
+    stats = mover.run()
+
+    assert Path(target, "Part.pdf").read_bytes() == small
+    assert Path(target, "stp", "Product.stp").read_bytes() == large
+    assert not list(source.rglob("*.*"))
+    assert stats.files == 2
+    assert stats.copied == 2
+    assert stats.chunked == 1
+    assert stats.failed == 0
+
+
+def test_file_mover_same_volume(tmp_path: Path):
+    from pytia_bill_of_material.utils.mover import FileMover
+
+    source = Path(tmp_path, "export")
+    target = Path(tmp_path, "release")
+    pdf = _make_file(Path(source, "Part.pdf"), 100)
+    stp = _make_file(Path(source, "stp", "Product.stp"), 200)
+    Path(target).mkdir()
+    Path(target, "Part.pdf").write_bytes(b"old")
+
+    mover = FileMover()
+    mover.add_folder(source=source, target=target)
+    stats = mover.run()
+
+    assert Path(target, "Part.pdf").read_bytes() == pdf
+    assert Path(target, "stp", "Product.stp").read_bytes() == stp
+    assert not list(source.rglob("*.*"))
+    assert stats.files == 2
+    assert stats.renamed == 2
+    assert stats.copied == 0
+    # The release folder already existed, only the stp folder has been created.
+    assert stats.folders == 1
+
+
+def _delta_mover(source: Path, target: Path):
+    from pytia_bill_of_material.utils.mover import FileMover
+
+    mover = FileMover(delta=True)
+    mover.add_folder(source=source, target=target)
+    return mover
+
+
+def test_file_mover_delta(tmp_path: Path):
+    source = Path(tmp_path, "export")
+    target = Path(tmp_path, "release")
+    _make_file(Path(source, "Unchanged.pdf"), 100)
+    _make_file(Path(target, "Unchanged.pdf"), 100)
+    _make_file(Path(source, "Resized.pdf"), 120)
+    _make_file(Path(target, "Resized.pdf"), 100)
+    Path(source, "Modified.pdf").write_bytes(b"a" * 100)
+    Path(target, "Modified.pdf").write_bytes(b"b" * 100)
+    new = _make_file(Path(source, "stp", "New.stp"), 50)
+
+    stats = _delta_mover(source, target).run()
+
+    assert not list(source.rglob("*.*"))
+    assert Path(target, "Resized.pdf").stat().st_size == 120
+    assert Path(target, "Modified.pdf").read_bytes() == b"a" * 100
+    assert Path(target, "stp", "New.stp").read_bytes() == new
+    assert stats.files == 3
+    assert stats.skipped == 1
+    assert stats.saved_bytes == 100
+    assert stats.replaced == 2
+    assert stats.new == 1
+    assert stats.summary == "1 file(s) copied, 1 skipped, 2 replaced, 0.00 MB saved."
+
+
+def test_file_mover_delta_manifest(tmp_path: Path):
+    from pytia_bill_of_material.const import DELTA_MANIFEST
+    from pytia_bill_of_material.utils import mover as mover_module
+
+    # The copy of the delta module, that is imported by the mover.
+    delta = sys.modules[mover_module.TargetManifest.__module__]
+
+    source = Path(tmp_path, "export")
+    target = Path(tmp_path, "release")
+    content = _make_file(Path(source, "stp", "Product.stp"), CHUNK_SIZE)
+    _delta_mover(source, target).run()
+
+    manifest = Path(target, DELTA_MANIFEST)
+    assert manifest.is_file()
+    assert "stp/Product.stp" in manifest.read_text(encoding="utf8")
+
+    # The second release must take the hash of the target from the manifest.
+    hashed = []
+    file_hash = delta.file_hash
+
+    def _file_hash(path: Path) -> str:
+        hashed.append(path)
+        return file_hash(path)
+
+    Path(source, "stp", "Product.stp").write_bytes(content)
+    mover = _delta_mover(source, target)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(mover_module, "file_hash", _file_hash)
+        mp.setattr(delta, "file_hash", _file_hash)
+        stats = mover.run()
+
+    assert stats.skipped == 1
+    assert stats.files == 0
+    assert hashed == [Path(source, "stp", "Product.stp")]
+
+
+def test_file_mover_delta_unreadable(tmp_path: Path, monkeypatch):
+    from pytia_bill_of_material.utils import mover as mover_module
+
+    delta = sys.modules[mover_module.TargetManifest.__module__]
+    source = Path(tmp_path, "export")
+    target = Path(tmp_path, "release")
+    content = _make_file(Path(source, "Locked.pdf"), 100)
+    _make_file(Path(target, "Locked.pdf"), 100)
+    _make_file(Path(source, "Unreadable.pdf"), 100)
+    _make_file(Path(target, "Unreadable.pdf"), 100)
+    file_hash = delta.file_hash
+
+    def _file_hash(path: Path) -> str:
+        if path in (Path(source, "Locked.pdf"), Path(target, "Unreadable.pdf")):
+            raise PermissionError(f"Permission denied: {str(path)!r}")
+        return file_hash(path)
+
+    monkeypatch.setattr(mover_module, "file_hash", _file_hash)
+    monkeypatch.setattr(delta, "file_hash", _file_hash)
+    stats = _delta_mover(source, target).run()
+
+    # Both files are moved, instead of aborting the whole move.
+    assert Path(target, "Locked.pdf").read_bytes() == content
+    assert not list(source.rglob("*.*"))
+    assert stats.files == 2
+    assert stats.skipped == 0
+    assert stats.failed == 0
@@ -0,0 +1,48 @@
+"""
+    Test the resident mode.
+"""
+
+import threading
+from pathlib import Path
+
+
+def test_hand_over(tmp_path: Path):
+    from pytia_bill_of_material.resident import REPLY_BUSY
+    from pytia_bill_of_material.resident import REPLY_OK
+    from pytia_bill_of_material.resident import ResidentServer
+    from pytia_bill_of_material.resident import hand_over
+
+    file = Path(tmp_path, "app.resident")
+    assert hand_over(file) is None
+
+    server = ResidentServer(idle_timeout=5, max_memory_mb=2**20, file=file)
+    try:
+        # The first window is still open
+        assert hand_over(file) == REPLY_BUSY
+
+        launched = []
+        waiter = threading.Thread(target=lambda: launched.append(server.wait_for_launch()))
+        waiter.start()
+        while not launched and hand_over(file) != REPLY_OK:
+            pass
+        waiter.join(timeout=5)
+        assert launched == [True]
+        assert hand_over(file) == REPLY_BUSY
+    finally:
+        server.close()
+
+    assert not file.exists()
+    assert not server._thread.is_alive()
+    assert hand_over(file) is None
+
+
+def test_idle_timeout_and_memory_cap(tmp_path: Path):
+    from pytia_bill_of_material.resident import ResidentServer
+    from pytia_bill_of_material.resident import hand_over
+
+    file = Path(tmp_path, "app.resident")
+    assert ResidentServer(idle_timeout=0.1, max_memory_mb=2**20, file=file).wait_for_launch() is False
+    assert hand_over(file) is None
+
+    assert ResidentServer(idle_timeout=5, max_memory_mb=0, file=file).wait_for_launch() is False
+    assert not file.exists()
@@ -3,6 +3,7 @@
 """
 
 import os
+import time
 from pathlib import Path
 
 import validators
@@ -14,6 +15,43 @@ def test_resources_class():
     resource = Resources()
 
 
+def test_resources_lazy_loading():
+    from pytia_bill_of_material.resources import Resources
+
+    resource = Resources()
+    assert not any(attr in vars(resource) for attr in resource._loaders)
+    assert resource.users is resource.users
+    assert "_users" in vars(resource)
+
+    resource.preload()
+    deadline = time.perf_counter() + 5
+    while not all(attr in vars(resource) for attr in resource._loaders):
+        assert time.perf_counter() < deadline
+        time.sleep(0.01)
+
+
+def test_resources_loaded_on_access(monkeypatch):
+    from pytia_bill_of_material.resources import Resources
+
+    calls = []
+    read_users = Resources._read_users
+
+    def _read_users(self) -> None:
+        calls.append("_users")
+        read_users(self)
+
+    monkeypatch.setattr(Resources, "_read_users", _read_users)
+
+    # The users.json isn't read at startup, but on first access only.
+    resource = Resources()
+    assert calls == []
+
+    users = resource.users
+    assert calls == ["_users"]
+    assert resource.users is users
+    assert calls == ["_users"]
+
+
 def test_settings():
     from pytia_bill_of_material.resources import resource
 
@@ -39,6 +77,12 @@ def test_settings():
     assert isinstance(resource.settings.files.launcher, str)
     assert isinstance(resource.settings.files.workspace, str)
 
+    assert resource.settings.copy.chunk_size_mb > 0
+    assert resource.settings.copy.retries >= 0
+    assert isinstance(resource.settings.logging.summary, bool)
+    assert resource.settings.resident.idle_timeout_min > 0
+    assert resource.settings.resident.max_memory_mb > 0
+
     if resource.settings.urls.help:
         assert validators.url(resource.settings.urls.help)  # type: ignore
     assert validators.email(resource.settings.mails.admin)  # type: ignore
@@ -68,6 +112,23 @@ def test_users():
         logon_list.append(user.logon)
 
 
+def test_filter_element_enabled():
+    import pytest
+
+    from pytia_bill_of_material.resources import FilterElement
+
+    filter_element = FilterElement(
+        name="Filter", property_name="partnumber", criteria=".*", condition=True, description="Filter"
+    )
+    with pytest.raises(ValueError):
+        filter_element.enabled
+
+    filter_element.enabled = False
+    assert filter_element.enabled is False
+    filter_element.enabled = True
+    assert filter_element.enabled is True
+
+
 def test_template_files():
     from pytia_bill_of_material.const import TEMPLATE_DOCKET
 
@@ -84,3 +145,44 @@ def test_debug_mode():
     from pytia_bill_of_material.resources import resource
 
     assert resource.settings.debug == False
+
+
+def test_resources_snapshot():
+    import json
+    import marshal
+
+    from pytia_bill_of_material.resources import CONFIG_USERS
+    from pytia_bill_of_material.resources import Resources
+    from pytia_bill_of_material.resources import create_snapshot
+    from pytia_bill_of_material.resources import load_snapshot
+
+    files = load_snapshot(create_snapshot())
+    assert files is not None
+
+    with open(Path("./pytia_bill_of_material/resources", CONFIG_USERS), "r", encoding="utf8") as f:
+        assert marshal.loads(files[CONFIG_USERS]) == json.load(f)
+
+    resource = Resources(snapshot=False)
+    resource._snapshot = files
+    resource._read_users()
+    assert resource.users == Resources(snapshot=False).users
+
+    assert load_snapshot(marshal.dumps(((2, 7), "0.0.0", files))) is None
+    assert load_snapshot(b"corrupted") is None
+
+
+def test_resources_snapshot_discards_appdata(monkeypatch):
+    from types import SimpleNamespace
+
+    from pytia_bill_of_material import resources as resources_module
+
+    registered = []
+    monkeypatch.setattr(
+        resources_module,
+        "atexit",
+        SimpleNamespace(register=registered.append, unregister=registered.remove),
+    )
+
+    # The build must not save the appdata of the build machine.
+    resources_module.create_snapshot()
+    assert registered == []
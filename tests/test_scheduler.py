@@ -0,0 +1,133 @@
+"""
+    Test the stage scheduler.
+"""
+
+import threading
+import time
+import tkinter
+
+import pytest
+
+
+class HeadlessRoot(tkinter.Tk):
+    """A Tcl interpreter that acts as headless main window."""
+
+    def __init__(self) -> None:
+        super().__init__(useTk=False)
+
+    def wait_variable(self, name: tkinter.Variable) -> None:  # type: ignore
+        while not name.get():
+            self.dooneevent(0)
+
+
+def _root() -> tkinter.Tk:
+    """
+    Returns a headless main window. Must not be part of a reference cycle: A Tcl interpreter
+    that is garbage collected in a forked process aborts it (see the watch service test).
+    """
+    return HeadlessRoot()
+
+
+def test_scheduler_runs_independent_stages_concurrently():
+    from pytia_bill_of_material.worker.scheduler import Scheduler
+    from pytia_bill_of_material.worker.scheduler import StageResource
+
+    events = []
+    lock = threading.Lock()
+
+    def stage(name: str, duration: float):
+        def _run() -> None:
+            with lock:
+                events.append(("start", name, threading.current_thread() is threading.main_thread()))
+            time.sleep(duration)
+            with lock:
+                events.append(("end", name, threading.current_thread() is threading.main_thread()))
+
+        return _run
+
+    scheduler = Scheduler(root=_root())
+    scheduler.add("save", stage("save", 0.1), StageResource.EXCEL)
+    scheduler.add("export", stage("export", 0.3), StageResource.CATIA)
+    scheduler.add("move_bom", stage("move_bom", 0.05), StageResource.DISK, depends=["save"])
+    scheduler.add("move_items", stage("move_items", 0.05), StageResource.DISK, depends=["export"])
+    scheduler.add("done", stage("done", 0), StageResource.CPU, depends=["move_bom", "move_items"])
+    scheduler.run()
+
+    order = [(kind, name) for kind, name, _ in events]
+    on_main = {name for kind, name, main in events if main}
+
+    # The catia stage runs on the main thread, while the bom is saved and moved.
+    assert on_main == {"export"}
+    assert order.index(("end", "move_bom")) < order.index(("end", "export"))
+    assert order.index(("end", "export")) < order.index(("start", "move_items"))
+    assert order[-1] == ("end", "done")
+
+
+def test_scheduler_serializes_resource():
+    from pytia_bill_of_material.worker.scheduler import Scheduler
+    from pytia_bill_of_material.worker.scheduler import StageResource
+
+    running = []
+    overlaps = []
+
+    def stage():
+        running.append(1)
+        if len(running) > 1:
+            overlaps.append(1)
+        time.sleep(0.05)
+        running.pop()
+
+    scheduler = Scheduler(root=_root())
+    for i in range(3):
+        scheduler.add(f"move_{i}", stage, StageResource.DISK)
+    scheduler.run()
+
+    assert not overlaps
+
+
+def test_scheduler_stops_on_error():
+    from pytia_bill_of_material.worker.scheduler import Scheduler
+    from pytia_bill_of_material.worker.scheduler import StageResource
+
+    ran = []
+
+    def fail() -> None:
+        raise OSError("Disk full")
+
+    scheduler = Scheduler(root=_root())
+    scheduler.add("save", fail, StageResource.EXCEL)
+    scheduler.add("move", lambda: ran.append("move"), StageResource.DISK, depends=["save"])
+
+    with pytest.raises(OSError):
+        scheduler.run()
+    assert not ran
+
+    with pytest.raises(ValueError):
+        scheduler.add("copy", lambda: None, StageResource.DISK, depends=["unknown"])
+
+
+def test_scheduler_cancel():
+    from pytia_bill_of_material.worker.scheduler import Scheduler
+    from pytia_bill_of_material.worker.scheduler import StageResource
+
+    ran = []
+    cancel = []
+    scheduler = Scheduler(root=_root())
+    cancel.append(scheduler.cancel)
+
+    def export() -> None:
+        ran.append("export")
+        cancel[0]()
+
+    scheduler.add("export", export, StageResource.CATIA)
+    scheduler.add("move", lambda: ran.append("move"), StageResource.DISK, depends=["export"])
+    scheduler.add(
+        "reopen", lambda: ran.append("reopen"), StageResource.CATIA, depends=["export"], cancellable=False
+    )
+    scheduler.add("retry", lambda: ran.append("retry"), StageResource.DISK, depends=["move"], cancellable=False)
+    scheduler.run()
+    cancel.clear()
+
+    # The running stage is finished, the document is re-opened. The skipped move is never retried.
+    assert ran == ["export", "reopen"]
+    assert scheduler.cancelled
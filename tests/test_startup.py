@@ -0,0 +1,34 @@
+"""
+    Test the startup of the app.
+"""
+
+import json
+import subprocess
+import sys
+
+# Modules that must not be imported before the main window is shown.
+DEFERRED_MODULES = [
+    "openpyxl",
+    "pytia_ui_tools.utils.qr",
+    "worker.main_task",
+    "worker.prepare",
+]
+
+# Max time in seconds for importing the main window. Generous, to catch regressions only.
+STARTUP_BUDGET = 5.0
+
+
+def test_startup_imports(record_property):
+    script = (
+        "import json, sys, time\n"
+        "sys.path.append('./pytia_bill_of_material')\n"
+        "start_time = time.perf_counter()\n"
+        "import app.main_ui\n"
+        "print(json.dumps({'time': time.perf_counter() - start_time, 'modules': sorted(sys.modules)}))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    startup = json.loads(result.stdout.strip().splitlines()[-1])
+    record_property("startup_import_time", startup["time"])
+
+    assert not [m for m in DEFERRED_MODULES if m in startup["modules"]]
+    assert startup["time"] < STARTUP_BUDGET
@@ -0,0 +1,50 @@
+"""
+    Test the template cache.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+
+def _write_app(path: Path, docket: bytes) -> None:
+    with zipfile.ZipFile(path, "w") as zfile:
+        zfile.writestr("templates/docket.CATDrawing", docket)
+        zfile.writestr("templates/documentation.CATDrawing", b"documentation")
+
+
+def test_template_cache(tmp_path: Path, monkeypatch):
+    from pytia_bill_of_material import templates as templates_module
+
+    settings = SimpleNamespace(
+        debug=False,
+        paths=SimpleNamespace(release=tmp_path),
+        files=SimpleNamespace(app="app.pyz"),
+    )
+    cache = Path(tmp_path, "cache")
+    monkeypatch.setattr(templates_module, "resource", SimpleNamespace(settings=settings))
+    monkeypatch.setattr(templates_module, "TEMP_TEMPLATES", cache)
+
+    stale = Path(cache, "0.0.1")
+    stale.mkdir(parents=True)
+    app = Path(tmp_path, "app.pyz")
+    _write_app(app, b"docket")
+
+    templates = templates_module.Templates()
+    assert templates.docket_path is not None
+    assert templates.docket_path.read_bytes() == b"docket"
+    assert templates.documentation_path is not None
+    assert not stale.exists()
+
+    # Unchanged archive: Nothing is extracted
+    os.utime(templates.docket_path, ns=(0, 0))
+    os.utime(templates.documentation_path, ns=(0, 0))
+    templates_module.Templates()
+    assert templates.docket_path.stat().st_mtime_ns == 0
+
+    # Changed archive: Only the changed template is extracted
+    _write_app(app, b"new docket")
+    templates_module.Templates()
+    assert templates.docket_path.read_bytes() == b"new docket"
+    assert templates.documentation_path.stat().st_mtime_ns == 0
@@ -0,0 +1,167 @@
+"""
+    Test the product tree traversal.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict
+from typing import List
+
+
+class FakeProducts:
+    def __init__(self, children: List["FakeProduct"]) -> None:
+        self.children = children
+        self.calls = 0
+
+    @property
+    def count(self) -> int:
+        self.calls += 1
+        return len(self.children)
+
+    def item(self, index: int) -> "FakeProduct":
+        self.calls += 1
+        return self.children[index - 1]
+
+
+class FakeProduct:
+    """A product instance. Instances of the same reference share the children."""
+
+    reads = 0
+
+    def __init__(
+        self,
+        part_number: str,
+        children: FakeProducts | None = None,
+        broken: bool = False,
+        path: Path | None = None,
+    ) -> None:
+        self.name = f"{part_number}.1"
+        self._part_number = part_number
+        self._broken = broken
+        self._path = path
+        self.products = children or FakeProducts([])
+
+    @property
+    def part_number(self) -> str:
+        FakeProduct.reads += 1
+        if self._broken:
+            raise AttributeError("The reference product cannot be fetched")
+        return self._part_number
+
+    @property
+    def full_name(self) -> str:
+        FakeProduct.reads += 1
+        return str(self._path) if self._path else f"C:\\CAD\\{self._part_number}.CATPart"
+
+
+def test_index_product_tree_memoizes_references():
+    from pytia_bill_of_material.utils.tree import index_product_tree
+
+    parts = FakeProducts([FakeProduct(f"Part{i}") for i in range(200)])
+    sub_assembly = [FakeProduct("SubAssembly", parts) for _ in range(50)]
+    root = FakeProduct("Root", FakeProducts([*sub_assembly, FakeProduct("Part0"), FakeProduct("Sketch", broken=True)]))
+
+    FakeProduct.reads = 0
+    paths, stats = index_product_tree(root)
+
+    assert len(paths.items) == 202
+    assert paths.items["Part199"] == Path("C:\\CAD\\Part199.CATPart")
+    assert stats.references == 202
+    assert stats.nodes == 52 + 200
+    assert stats.reused == 50
+    assert stats.failed == 1
+
+    # The 200 parts of the sub-assembly are read once, not 50 times.
+    assert parts.calls == 1 + 200
+    assert FakeProduct.reads < 2 * 202 + 52
+
+
+def test_index_product_tree_order():
+    from pytia_bill_of_material.utils.tree import index_product_tree
+
+    root = FakeProduct(
+        "Root",
+        FakeProducts(
+            [
+                FakeProduct("A", FakeProducts([FakeProduct("A1"), FakeProduct("A2")])),
+                FakeProduct("B", FakeProducts([FakeProduct("B1")])),
+            ]
+        ),
+    )
+    paths, _ = index_product_tree(root)
+
+    assert list(paths.items) == ["Root", "A", "A1", "A2", "B", "B1"]
+
+
+def test_index_product_tree_cached(tmp_path: Path):
+    from pytia_bill_of_material.utils.path_index import PathIndex
+    from pytia_bill_of_material.utils.path_index import index_product_tree_cached
+
+    files: Dict[str, Path] = {}
+    for name in ["Root", "Sub", "Part1", "Part2", "Part3"]:
+        files[name] = Path(tmp_path, "cad", f"{name}.CATPart")
+        files[name].parent.mkdir(exist_ok=True)
+        files[name].write_text(name)
+
+    part1 = FakeProduct("Part1", path=files["Part1"])
+    sub_children = FakeProducts([part1, FakeProduct("Part2", path=files["Part2"])])
+    sub = FakeProduct("Sub", sub_children, path=files["Sub"])
+    root_children = FakeProducts([sub, FakeProduct("Part3", path=files["Part3"])])
+    root = FakeProduct("Root", root_children, path=files["Root"])
+
+    resolved: List[Path] = []
+
+    def resolve(path: Path) -> FakeProduct | None:
+        resolved.append(path)
+        return {files["Sub"]: sub}.get(path)
+
+    # Cold run: The whole tree is traversed
+    paths = index_product_tree_cached(root, PathIndex(files["Root"], folder=tmp_path), resolve)
+    assert set(paths.items) == {"Root", "Sub", "Part1", "Part2", "Part3"}
+
+    # Warm run: Nothing has changed, nothing is traversed
+    sub_children.calls = root_children.calls = 0
+    paths = index_product_tree_cached(root, PathIndex(files["Root"], folder=tmp_path), resolve)
+    assert set(paths.items) == {"Root", "Sub", "Part1", "Part2", "Part3"}
+    assert sub_children.calls == root_children.calls == 0
+
+    # Part1 has been renamed in its file: Only the sub-assembly is traversed again
+    part1._part_number = "Part1-A"
+    files["Part1"].write_text("Part1 modified")
+    os.utime(files["Part1"], ns=(0, 0))
+    paths = index_product_tree_cached(root, PathIndex(files["Root"], folder=tmp_path), resolve)
+    assert set(paths.items) == {"Root", "Sub", "Part1-A", "Part2", "Part3"}
+    assert resolved == [files["Sub"]]
+    assert root_children.calls == 0
+    assert sub_children.calls > 0
+
+
+def test_index_product_tree_cached_unsaved(tmp_path: Path):
+    from pytia_bill_of_material.utils.path_index import PathIndex
+    from pytia_bill_of_material.utils.path_index import index_product_tree_cached
+
+    files: Dict[str, Path] = {}
+    for name in ["Root", "Part1", "Part2"]:
+        files[name] = Path(tmp_path, "cad", f"{name}.CATPart")
+        files[name].parent.mkdir(exist_ok=True)
+        files[name].write_text(name)
+
+    root_children = FakeProducts([FakeProduct("Part1", path=files["Part1"])])
+    root = FakeProduct("Root", root_children, path=files["Root"])
+
+    paths = index_product_tree_cached(root, PathIndex(files["Root"], folder=tmp_path), lambda _: None)
+    assert set(paths.items) == {"Root", "Part1"}
+
+    # A component has been inserted in the session, but not saved: No file has changed
+    root_children.children.append(FakeProduct("Part2", path=files["Part2"]))
+    paths = index_product_tree_cached(root, PathIndex(files["Root"], folder=tmp_path), lambda _: None)
+    assert set(paths.items) == {"Root", "Part1"}
+
+    paths = index_product_tree_cached(
+        root,
+        PathIndex(files["Root"], folder=tmp_path),
+        lambda _: None,
+        unsaved=True,
+    )
+    assert set(paths.items) == {"Root", "Part1", "Part2"}
+    assert paths.items["Part2"] == files["Part2"]
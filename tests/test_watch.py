@@ -0,0 +1,137 @@
+"""
+    Test the watch service.
+"""
+
+import gc
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from tests.test_cli import _write_export
+
+
+def test_debouncer(tmp_path: Path):
+    from pytia_bill_of_material.utils.watcher import Debouncer
+
+    path = Path(tmp_path, "export.xls")
+    path.write_bytes(b"1")
+    debouncer = Debouncer(settle=1.0)
+    debouncer.add({path}, now=0.0)
+
+    assert debouncer.ready(now=0.0) == []
+    assert debouncer.ready(now=0.5) == []
+
+    # Still being written: The settle time starts again
+    path.write_bytes(b"12")
+    os.utime(path, ns=(0, 1))
+    assert debouncer.ready(now=0.9) == []
+    assert debouncer.ready(now=1.5) == []
+    assert debouncer.ready(now=2.0) == [(path, 0.0)]
+    assert len(debouncer) == 0
+
+    # Deleted files are dropped
+    debouncer.add({Path(tmp_path, "missing.xls")}, now=0.0)
+    assert debouncer.ready(now=5.0) == []
+    assert len(debouncer) == 0
+
+
+def test_polling_watcher(tmp_path: Path):
+    from pytia_bill_of_material.utils.watcher import PollingWatcher
+
+    Path(tmp_path, "a.xls").write_bytes(b"a")
+    Path(tmp_path, "a.xlsx").write_bytes(b"a")
+    watcher = PollingWatcher(tmp_path, ["*.xls"], interval=0.0)
+
+    assert watcher.changes(timeout=0) == {Path(tmp_path, "a.xls")}
+    assert watcher.changes(timeout=0) == set()
+
+    Path(tmp_path, "b.XLS").write_bytes(b"b")
+    Path(tmp_path, "a.xls").write_bytes(b"aa")
+    assert watcher.changes(timeout=0) == {Path(tmp_path, "a.xls"), Path(tmp_path, "b.XLS")}
+
+
+def test_watch_service(tmp_path: Path):
+    from pytia_bill_of_material.models.batch import BatchOptions
+    from pytia_bill_of_material.resources import resource
+    from pytia_bill_of_material.service import WatchMetrics
+    from pytia_bill_of_material.service import WatchService
+
+    cad = Path(tmp_path, "cad")
+    cad.mkdir()
+    Path(cad, "Root.CATProduct").write_text("")
+    drop = Path(tmp_path, "drop")
+    drop.mkdir()
+
+    resource.apply_language("en")
+    skip = [f.name for f in resource.filters if f.name != "Project Number"]
+    resource.reset_language()
+
+    metrics_path = Path(tmp_path, "logs", "metrics.log")
+    service = WatchService(
+        folder=drop,
+        options=BatchOptions(search_folders=[cad], skip_filters=skip),
+        metrics=WatchMetrics(metrics_path),
+        patterns=["*.xlsx"],
+        jobs=1,
+        settle=0.2,
+        interval=0.05,
+        polling=True,
+    )
+    # The worker processes are forked: A Tcl interpreter of a previous test, that is still waiting
+    # for the garbage collection, would be collected in the worker process and abort it.
+    gc.collect()
+    stop = threading.Event()
+    thread = threading.Thread(target=service.run, args=(stop,))
+    thread.start()
+    try:
+        # Added after the service has started: The search folders are indexed for each export.
+        Path(cad, "Part1.CATPart").write_text("")
+        _write_export(Path(drop, "valid.xlsx"), "P12345")
+        _write_export(Path(drop, "invalid.xlsx"), "Project")
+
+        deadline = time.monotonic() + 60
+        reports = [Path(drop, "valid.xlsx.report.json"), Path(drop, "invalid.xlsx.report.json")]
+        while not all(r.is_file() for r in reports) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        # Give the service the chance to (wrongly) pick up its own output files.
+        time.sleep(0.5)
+    finally:
+        stop.set()
+        thread.join(timeout=60)
+
+    assert not thread.is_alive()
+    assert [json.loads(r.read_text(encoding="utf8"))["status"] for r in reports] == ["ok", "failed"]
+    assert Path(drop, "valid (Summary).xlsx").is_file()
+    assert sorted(p.name for p in drop.glob("*.report.json")) == ["invalid.xlsx.report.json", "valid.xlsx.report.json"]
+
+    records = [json.loads(line) for line in metrics_path.read_text(encoding="utf8").splitlines()]
+    assert sorted(r["file"] for r in records if r["record"] == "file") == [
+        str(Path(drop, "invalid.xlsx")),
+        str(Path(drop, "valid.xlsx")),
+    ]
+    assert all(r["latency_s"] >= r["processing_s"] for r in records if r["record"] == "file")
+    assert records[-1]["record"] == "summary"
+    assert records[-1]["files"] == 2
+    assert records[-1]["failed"] == 1
+
+    # Already processed exports and their bill of material files are skipped after a restart
+    assert not service._is_new_export(Path(drop, "valid.xlsx"))
+    assert not service._is_new_export(Path(drop, "valid (Summary).xlsx"))
+
+
+def test_watch_service_written(tmp_path: Path, monkeypatch):
+    from pytia_bill_of_material import service as service_module
+    from pytia_bill_of_material.models.batch import BatchOptions
+
+    options = BatchOptions(output=Path(tmp_path, "out"))
+    service = service_module.WatchService(folder=tmp_path, options=options, metrics=None)  # type: ignore
+    # The results are written next to the exports, the options of the caller are left as they are.
+    assert service.options.output is None
+    assert options.output == Path(tmp_path, "out")
+
+    monkeypatch.setattr(service_module, "WATCH_WRITTEN_SIZE", 3)
+    service._add_written([Path(tmp_path, f"{i}.xlsx") for i in range(3)])
+    service._add_written([Path(tmp_path, "0.xlsx"), Path(tmp_path, "3.xlsx")])
+    assert list(service._written) == [Path(tmp_path, f"{i}.xlsx") for i in (2, 0, 3)]